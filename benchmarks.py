@@ -0,0 +1,441 @@
+"""Micro-benchmarks and an offscreen render profiler for the VomTools orb background.
+
+Usage:
+    python benchmarks.py [particles] [connections] [shell] [metrics] [ranking] [profile]
+    python benchmarks.py profile --frames 600 --mode retained --quality high
+    python benchmarks.py profile --mode raster --raster-thread
+    python benchmarks.py profile --tk        # real Tk canvas, e.g. under xvfb-run
+
+The profiler drives AnimatedOrb through scripted mouse moves and click
+bursts and reports per-frame time percentiles, canvas (Tcl) calls per
+frame and live item counts per tag. By default it renders into a
+RecordingCanvas, so no display is needed.
+
+On a headless Linux box set PYSTRAY_BACKEND=dummy so importing vomtools
+does not try to connect to an X display.
+"""
+import argparse
+import math
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+from vomtools import (
+    PYTHON_WORKER_COMMAND, QUALITY_TIERS, AnimatedOrb, ParticleSystem, ProcMetricsProvider, ProcProcessSource,
+    ProcessTable, ShellHost, SpatialGrid, find_pairs_brute_force, np,
+)
+
+
+def time_per_call(fn, min_time=0.2):
+    """Average seconds per call of fn, repeating until min_time has elapsed"""
+    fn()
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return elapsed / calls
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def bench_particles(counts=(80, 500, 1000, 5000, 20000)):
+    """Cost of one ParticleSystem.step per particle count and backend"""
+    backends = [('array', False)]
+    if np is not None:
+        backends.append(('numpy', True))
+    else:
+        print("NumPy not installed - only the array fallback is measured")
+
+    print(f"{'particles':>10} {'backend':>8} {'ms/step':>10} {'us/particle':>12}")
+    for count in counts:
+        for name, use_numpy in backends:
+            system = ParticleSystem(count, 900, 650, use_numpy=use_numpy)
+            frame = [0]
+
+            def step():
+                frame[0] += 1
+                system.step(450, 325, 300 + frame[0] % 300, 300, 900, 650)
+
+            seconds = time_per_call(step)
+            print(f"{count:>10} {name:>8} {seconds * 1000:>10.3f} {seconds * 1e6 / count:>12.3f}")
+
+
+def bench_connections(counts=(80, 500, 5000), radius=80, limit=150):
+    """Brute-force pair search vs. the spatial grid (rebuild included) for connection lines"""
+    print(f"{'particles':>10} {'method':>12} {'ms/frame':>10} {'lines':>8}")
+    for count in counts:
+        xs = [random.uniform(0, 900) for _ in range(count)]
+        ys = [random.uniform(0, 650) for _ in range(count)]
+        grid = SpatialGrid(radius)
+
+        def grid_pairs(limit=None):
+            grid.rebuild(xs, ys)
+            return grid.pairs(xs, ys, radius, limit)
+
+        methods = [
+            ('brute', lambda: find_pairs_brute_force(xs, ys, radius)),
+            ('grid', grid_pairs),
+            ('grid capped', lambda: grid_pairs(limit)),
+        ]
+        for name, fn in methods:
+            seconds = time_per_call(fn)
+            print(f"{count:>10} {name:>12} {seconds * 1000:>10.3f} {len(fn()):>8}")
+
+
+def bench_shell(requests=200):
+    """One process per command vs. the persistent ShellHost, using the Python stand-in worker"""
+    script = "print('ok')"
+    host = ShellHost(PYTHON_WORKER_COMMAND, "python")
+    host.start()
+    methods = [
+        ('spawn', lambda: subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)),
+        ('shell host', lambda: host.run(script)),
+    ]
+    print(f"{'method':>12} {'ms/call':>10}")
+    for name, fn in methods:
+        seconds = time_per_call(fn)
+        print(f"{name:>12} {seconds * 1000:>10.3f}")
+
+    # Concurrent callers share the worker and are matched to their responses by id
+    results = {}
+    threads = [
+        threading.Thread(target=lambda i=i: results.__setitem__(i, host.run(f"print({i})").stdout.strip()))
+        for i in range(requests)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    matched = sum(results.get(i) == str(i) for i in range(requests))
+    print(f"{requests} concurrent requests: {elapsed * 1000:.1f} ms, {matched} matched, restarts={host.restarts}")
+    host.close()
+
+
+def bench_metrics():
+    """Cost of a System Monitor sample and of a warm process table lookup from the /proc backend"""
+    if not ProcMetricsProvider.available():
+        print("/proc not available - nothing to measure")
+        return
+    table = ProcessTable(ProcProcessSource())
+    provider = ProcMetricsProvider(table)
+    seconds = time_per_call(provider.sample)
+    print(f"proc sample: {seconds * 1000:.3f} ms for {len(table.records)} processes")
+    seconds = time_per_call(table.snapshot)
+    print(f"warm table snapshot: {seconds * 1000:.3f} ms")
+
+
+def bench_ranking(counts=(1000, 10000, 50000), top=8):
+    """Full ProcessTable refresh and top-N selection vs. a full sort, on synthetic processes"""
+    class SyntheticSource:
+        def __init__(self, count):
+            self.count = count
+
+        def scan(self, known):
+            for pid in range(self.count):
+                yield (pid, 1), "proc", random.uniform(0, 1000), random.randint(1, 1 << 30), pid * 4096, ""
+
+    print(f"{'processes':>10} {'refresh ms':>11} {'heap top ms':>12} {'sort ms':>9}")
+    for count in counts:
+        table = ProcessTable(SyntheticSource(count))
+        table.refresh()
+        refresh = time_per_call(table.refresh, min_time=0.1)
+        records = table.refresh()
+        heap = time_per_call(lambda: table.top(top, 'cpu', records=records))
+        full = time_per_call(lambda: sorted(records, key=lambda r: r['CPUPercent'], reverse=True)[:top])
+        print(f"{count:>10} {refresh * 1000:>11.2f} {heap * 1000:>12.3f} {full * 1000:>9.3f}")
+
+
+# ─── OFFSCREEN RENDER PROFILER ─────────────────────────────────────────────
+class RecordingCanvas:
+    """Stand-in for tk.Canvas that records every call and tracks live items.
+
+    Only the subset of the canvas API that AnimatedOrb uses is implemented.
+    Timers are never fired; the profiler steps frames itself. Scripts sent
+    by CanvasBatch count as one call, their commands are tallied apart.
+    """
+
+    def __init__(self, width=900, height=650):
+        self.width = width
+        self.height = height
+        self.calls = Counter()
+        self.commands = Counter()
+        self.items = {}
+        self._next_id = 1
+        self.tk = self
+
+    def __str__(self):
+        return ".orb"
+
+    def _record(self, name):
+        self.calls[name] += 1
+
+    def _create(self, kind, coords, options):
+        self._record(f"create_{kind}")
+        tags = options.get('tags', ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        item = self._next_id
+        self._next_id += 1
+        self.items[item] = {'kind': kind, 'tags': tuple(tags), 'state': options.get('state', 'normal')}
+        return item
+
+    def create_oval(self, *coords, **options):
+        return self._create('oval', coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create('line', coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create('rectangle', coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create('image', coords, options)
+
+    def coords(self, item, *coords):
+        self._record('coords')
+
+    def itemconfigure(self, item, **options):
+        self._record('itemconfigure')
+        if 'state' in options and item in self.items:
+            self.items[item]['state'] = options['state']
+
+    itemconfig = itemconfigure
+
+    def delete(self, tag_or_id):
+        self._record('delete')
+        if tag_or_id == 'all':
+            self.items.clear()
+            return
+        doomed = [
+            item for item, info in self.items.items()
+            if item == tag_or_id or tag_or_id in info['tags']
+        ]
+        for item in doomed:
+            del self.items[item]
+
+    def eval(self, script):
+        self._record('eval')
+        for command in script.splitlines():
+            words = command.split()
+            self.commands[words[1]] += 1
+            if words[1] == 'itemconfigure' and '-state' in words:
+                item = int(words[2])
+                if item in self.items:
+                    self.items[item]['state'] = words[words.index('-state') + 1]
+
+    def tag_lower(self, *args):
+        self._record('tag_lower')
+
+    def tag_raise(self, *args):
+        self._record('tag_raise')
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def after(self, ms, callback=None, *args):
+        return None
+
+    def after_cancel(self, after_id):
+        pass
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def items_by_tag(self):
+        """{tag: (live, visible)} for every tag currently on the canvas"""
+        counts = {}
+        for info in self.items.values():
+            for tag in info['tags']:
+                live, visible = counts.get(tag, (0, 0))
+                counts[tag] = (live + 1, visible + (info['state'] != 'hidden'))
+        return counts
+
+
+class CountingCanvas:
+    """Wraps a real tk.Canvas and counts the calls made through it"""
+
+    COUNTED = {
+        'create_oval', 'create_line', 'create_rectangle', 'create_image',
+        'coords', 'itemconfigure', 'itemconfig', 'delete', 'tag_lower', 'tag_raise',
+    }
+
+    def __init__(self, canvas):
+        self._canvas = canvas
+        self.calls = Counter()
+        self.commands = Counter()
+
+    def __str__(self):
+        return str(self._canvas)
+
+    @property
+    def tk(self):
+        # CanvasBatch sends its scripts through canvas.tk.eval
+        return self
+
+    def eval(self, script):
+        self.calls['eval'] += 1
+        for command in script.splitlines():
+            self.commands[command.split()[1]] += 1
+        return self._canvas.tk.eval(script)
+
+    def __getattr__(self, name):
+        attr = getattr(self._canvas, name)
+        if name not in self.COUNTED:
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls[name] += 1
+            return attr(*args, **kwargs)
+        return counted
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+    def items_by_tag(self):
+        counts = {}
+        for item in self._canvas.find_all():
+            hidden = self._canvas.itemcget(item, 'state') == 'hidden'
+            for tag in self._canvas.gettags(item):
+                live, visible = counts.get(tag, (0, 0))
+                counts[tag] = (live + 1, visible + (not hidden))
+        return counts
+
+
+class ScriptedEvent:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def profile_orb(frames=600, mode='sprite', quality='high', use_tk=False, raster_thread=False):
+    """Step AnimatedOrb offscreen with scripted input and report frame cost"""
+    root = None
+    if use_tk:
+        import tkinter as tk
+        root = tk.Tk()
+        real = tk.Canvas(root, width=900, height=650, bg='#0c0c0c', highlightthickness=0)
+        real.pack()
+        root.update()
+        canvas = CountingCanvas(real)
+    else:
+        canvas = RecordingCanvas()
+
+    orb = AnimatedOrb(canvas, {}, render_mode=mode, quality=quality, raster_thread=raster_thread)
+    orb.stop()  # frames are stepped by hand below
+    if not use_tk:
+        # No Tk interpreter to own PhotoImages - keep the rasterized PIL images instead
+        if orb.render_mode == 'sprite':
+            orb.renderer.cache.photo_factory = lambda image: image
+        elif orb.render_mode == 'raster':
+            orb.renderer.photo_factory = lambda image: image
+
+    frame_times = []
+    draw_times = []
+    calls_per_frame = []
+    peak_items = {}
+    cpu_started = time.process_time()
+    for frame in range(frames):
+        # Mouse sweeps a Lissajous curve; a click every second and a burst of
+        # rapid clicks half way through stress the effect paths
+        t = frame / 60
+        event = ScriptedEvent(450 + 350 * math.sin(t * 0.9), 325 + 250 * math.sin(t * 1.3))
+        orb.on_mouse_move(event)
+        if frame % 60 == 30 or (frames // 2 <= frame < frames // 2 + 10):
+            orb.on_click(event)
+
+        before = canvas.total_calls()
+        started = time.perf_counter()
+        orb._animate_frame()
+        frame_times.append(time.perf_counter() - started)
+        calls_per_frame.append(canvas.total_calls() - before)
+
+        if root is not None:
+            started = time.perf_counter()
+            root.update()
+            draw_times.append(time.perf_counter() - started)
+
+        if raster_thread:
+            # The worker thread rasterizes in the idle time Tk would leave between frames
+            time.sleep(max(0.0, orb.frame_ms / 1000 - frame_times[-1]))
+
+        if frame % 30 == 0 or frame == frames - 1:
+            for tag, (live, _) in canvas.items_by_tag().items():
+                peak_items[tag] = max(peak_items.get(tag, 0), live)
+
+    cpu = time.process_time() - cpu_started
+
+    times = sorted(frame_times)
+    threaded = " threaded" if orb.render_mode == 'raster' and raster_thread else ""
+    print(f"mode={orb.render_mode}{threaded} quality={QUALITY_TIERS[orb.tier]['name']} frames={frames} "
+          f"canvas={'tk' if use_tk else 'recording'}")
+    print(f"frame ms   p50={percentile(times, 50) * 1000:.3f} "
+          f"p95={percentile(times, 95) * 1000:.3f} p99={percentile(times, 99) * 1000:.3f} "
+          f"max={times[-1] * 1000:.3f}")
+    print(f"cpu ms/frame {cpu * 1000 / frames:.3f} (all threads)")
+    if draw_times:
+        draws = sorted(draw_times)
+        print(f"tk draw ms p50={percentile(draws, 50) * 1000:.3f} "
+              f"p95={percentile(draws, 95) * 1000:.3f} p99={percentile(draws, 99) * 1000:.3f}")
+    calls = sorted(calls_per_frame)
+    print(f"calls/frame mean={sum(calls) / len(calls):.1f} p50={percentile(calls, 50)} "
+          f"p99={percentile(calls, 99)} max={calls[-1]}")
+    print("calls by method: " + ", ".join(f"{name}={count}" for name, count in canvas.calls.most_common()))
+    if canvas.commands:
+        batched = sum(canvas.commands.values())
+        print(f"batched commands/frame {batched / frames:.1f}: "
+              + ", ".join(f"{name}={count}" for name, count in canvas.commands.most_common()))
+    print(f"{'tag':<20} {'live':>6} {'visible':>8} {'peak':>6}")
+    for tag, (live, visible) in sorted(canvas.items_by_tag().items()):
+        print(f"{tag:<20} {live:>6} {visible:>8} {peak_items.get(tag, live):>6}")
+    if orb.render_mode == 'raster':
+        print(f"raster frames presented={orb.renderer.frames} dropped={orb.renderer.dropped}")
+
+    orb.renderer.destroy()
+    if root is not None:
+        root.destroy()
+
+
+BENCHMARKS = {
+    'particles': bench_particles,
+    'connections': bench_connections,
+    'shell': bench_shell,
+    'metrics': bench_metrics,
+    'ranking': bench_ranking,
+    'profile': profile_orb,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*', metavar='benchmark', help=f"any of {', '.join(BENCHMARKS)}")
+    parser.add_argument('--frames', type=int, default=600, help="frames to profile")
+    parser.add_argument('--mode', default='sprite', choices=AnimatedOrb.RENDER_MODES)
+    parser.add_argument('--quality', default='high', help="quality tier or 'auto'")
+    parser.add_argument('--tk', action='store_true', help="profile against a real Tk canvas")
+    parser.add_argument('--raster-thread', action='store_true', help="rasterize on a worker thread in raster mode")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark: {', '.join(unknown)}")
+
+    for name in args.names or list(BENCHMARKS):
+        print(f"== {name} ==")
+        if name == 'profile':
+            profile_orb(args.frames, args.mode, args.quality, args.tk, args.raster_thread)
+        else:
+            BENCHMARKS[name]()
+        print()
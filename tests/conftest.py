@@ -0,0 +1,6 @@
+import os
+import sys
+
+# pystray picks a tray backend on import; the dummy one needs no display
+os.environ.setdefault('PYSTRAY_BACKEND', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
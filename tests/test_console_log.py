@@ -0,0 +1,109 @@
+import tkinter as tk
+
+from vomtools import ConsoleLog
+
+
+class FakeText:
+    """Just enough of tk.Text for ConsoleLog: line-based insert and delete"""
+    
+    def __init__(self):
+        self.text = ""
+        self.inserts = 0
+        self.idle = []
+    
+    def _offset(self, index):
+        if index == tk.END:
+            return len(self.text)
+        line = int(index.split(".")[0])
+        offset = 0
+        for _ in range(line - 1):
+            newline = self.text.find("\n", offset)
+            if newline < 0:
+                return len(self.text)
+            offset = newline + 1
+        return offset
+    
+    def insert(self, index, *chunks):
+        assert index == tk.END
+        self.inserts += 1
+        self.text += "".join(chunks[::2])
+    
+    def delete(self, start, end):
+        a, b = self._offset(start), self._offset(end)
+        self.text = self.text[:a] + self.text[b:]
+    
+    def after_idle(self, callback):
+        self.idle.append(callback)
+    
+    def see(self, index):
+        pass
+    
+    def run_idle(self):
+        idle, self.idle = self.idle, []
+        for callback in idle:
+            callback()
+    
+    def lines(self):
+        return self.text.splitlines()
+
+
+def test_lines_are_batched_into_one_insert():
+    widget = FakeText()
+    log = ConsoleLog(widget)
+    for i in range(50):
+        log.write(f"line {i}")
+    assert widget.inserts == 0
+    widget.run_idle()
+    assert widget.inserts == 1
+    assert len(widget.lines()) == log.lines == 50
+
+
+def test_oldest_lines_are_trimmed_past_max_lines():
+    widget = FakeText()
+    log = ConsoleLog(widget, max_lines=10)
+    for i in range(25):
+        log.write(f"line {i}")
+        if i % 4 == 0:
+            widget.run_idle()
+    widget.run_idle()
+    lines = widget.lines()
+    assert log.lines == len(lines) == 10
+    assert lines[0].endswith("line 15") and lines[-1].endswith("line 24")
+
+
+def test_trimming_counts_multi_line_messages():
+    widget = FakeText()
+    log = ConsoleLog(widget, max_lines=5)
+    log.write("one")
+    log.write("two\nthree\nfour")
+    log.blank()
+    log.write("five\nsix")
+    widget.run_idle()
+    lines = widget.lines()
+    assert log.lines == len(lines) == 5
+    assert lines[-1] == "six"
+
+
+def test_repeats_fold_into_the_shown_line():
+    widget = FakeText()
+    log = ConsoleLog(widget)
+    log.write("same", stamp="12:00:00")
+    widget.run_idle()
+    log.write("same", stamp="12:00:01")
+    log.write("same", stamp="12:00:02")
+    widget.run_idle()
+    lines = widget.lines()
+    assert log.lines == len(lines) == 1
+    assert lines[0].startswith("12:00:02") and lines[0].endswith("×3")
+
+
+def test_clear_resets_the_widget():
+    widget = FakeText()
+    log = ConsoleLog(widget)
+    log.write("gone")
+    widget.run_idle()
+    log.clear()
+    assert widget.text == "" and log.lines == 0
+    log.write("gone")
+    widget.run_idle()
+    assert widget.lines()[0].endswith("gone")
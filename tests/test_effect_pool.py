@@ -0,0 +1,42 @@
+from vomtools import EffectPool
+
+
+def test_spawn_fills_free_slots_in_order():
+    pool = EffectPool(3, alpha=1.0)
+    for radius in (1, 2):
+        pool.spawn(radius=radius)
+    assert len(pool) == 2
+    assert [effect['radius'] for effect in pool] == [1, 2]
+    assert all(effect['alpha'] == 1.0 for effect in pool)
+    assert pool.recycled == 0
+
+
+def test_full_pool_recycles_the_oldest_effect():
+    pool = EffectPool(3)
+    slots = list(pool.slots)
+    for radius in range(5):
+        pool.spawn(radius=radius)
+    assert len(pool) == 3
+    assert [effect['radius'] for effect in pool] == [2, 3, 4]
+    assert pool.recycled == 2
+    # No slot is allocated after construction
+    assert all(any(effect is slot for slot in slots) for effect in pool)
+
+
+def test_retire_keeps_live_effects_in_order():
+    pool = EffectPool(4)
+    for radius in range(6):
+        pool.spawn(radius=radius, alpha=radius % 2)
+    pool.retire(lambda effect: effect['alpha'] <= 0)
+    assert [effect['radius'] for effect in pool] == [3, 5]
+    pool.spawn(radius=6, alpha=1)
+    assert [effect['radius'] for effect in pool] == [3, 5, 6]
+
+
+def test_clear_and_minimum_capacity():
+    pool = EffectPool(0)
+    assert pool.capacity == 1
+    pool.spawn(radius=1)
+    pool.clear()
+    assert len(pool) == 0
+    assert list(pool) == []
@@ -0,0 +1,44 @@
+from vomtools import MetricHistory, lttb
+
+
+def test_history_keeps_the_newest_samples_in_order():
+    history = MetricHistory(4)
+    for i in range(6):
+        history.append(float(i * 10), when=float(i))
+    times, values = history.series()
+    assert list(times) == [2.0, 3.0, 4.0, 5.0]
+    assert list(values) == [20.0, 30.0, 40.0, 50.0]
+    assert len(history) == 4
+    assert history.peak() == 50.0
+
+
+def test_empty_history():
+    history = MetricHistory(1)
+    assert history.capacity == 2
+    assert len(history) == 0
+    assert history.peak() == 0.0
+
+
+def test_lttb_short_series_is_returned_unchanged():
+    xs, ys = [0, 1, 2], [5, 6, 7]
+    assert lttb(xs, ys, 10) == ([0, 1, 2], [5, 6, 7])
+    assert lttb(xs, ys, 2) == ([0, 1, 2], [5, 6, 7])
+
+
+def test_lttb_keeps_the_endpoints_and_the_threshold():
+    xs = list(range(100))
+    ys = [float(x % 7) for x in xs]
+    out_x, out_y = lttb(xs, ys, 20)
+    assert len(out_x) == len(out_y) == 20
+    assert (out_x[0], out_x[-1]) == (0, 99)
+    assert out_x == sorted(out_x)
+    assert all(ys[x] == y for x, y in zip(out_x, out_y))
+
+
+def test_lttb_keeps_a_single_spike():
+    xs = list(range(200))
+    ys = [0.0] * 200
+    ys[117] = 95.0
+    out_x, out_y = lttb(xs, ys, 12)
+    assert 117 in out_x
+    assert max(out_y) == 95.0
@@ -0,0 +1,103 @@
+import pytest
+
+from vomtools import ProcessTable
+
+
+class FakeSource:
+    """Hands out prepared scans: ((pid, start), name, cpu s, rss bytes, io bytes, title) rows"""
+    
+    def __init__(self, *scans):
+        self.scans = list(scans)
+    
+    def scan(self, known):
+        return self.scans.pop(0)
+
+
+MB = 1024 ** 2
+
+
+def refreshed_twice(first, second, elapsed=2.0):
+    table = ProcessTable(FakeSource(first, second))
+    table.refresh()
+    # Pretend the first scan happened elapsed seconds ago
+    table.updated -= elapsed
+    return table, {record['PID']: record for record in table.refresh()}
+
+
+def test_rates_come_from_the_interval_between_scans():
+    table, records = refreshed_twice(
+        [((1, 100), "a", 10.0, 100 * MB, 0, "")],
+        [((1, 100), "a", 11.0, 104 * MB, 4096, "")],
+    )
+    record = records[1]
+    assert record['CPUPercent'] == pytest.approx(50.0, rel=0.01)
+    assert record['MemGrowth'] == pytest.approx(2.0, rel=0.01)
+    assert record['IORate'] == pytest.approx(2.0, rel=0.01)
+    assert record['CPU'] == 11.0
+    assert record['Mem'] == 104.0
+
+
+def test_first_sighting_has_zero_rates():
+    table = ProcessTable(FakeSource([((1, 100), "a", 50.0, MB, 10, "")]))
+    record, = table.refresh()
+    assert (record['CPUPercent'], record['MemGrowth'], record['IORate']) == (0.0, 0.0, 0.0)
+
+
+def test_recycled_pid_is_a_new_process():
+    table, records = refreshed_twice(
+        [((1, 100), "old", 100.0, MB, 0, "")],
+        [((1, 200), "new", 1.0, MB, 0, "")],
+    )
+    assert records[1]['Name'] == "new"
+    assert records[1]['CPUPercent'] == 0.0
+    assert len(table.records) == 1
+
+
+def test_vanished_processes_are_dropped_and_known_ones_keep_their_record():
+    table = ProcessTable(FakeSource(
+        [((1, 1), "a", 0.0, MB, 0, ""), ((2, 2), "b", 0.0, MB, 0, "")],
+        [((1, 1), "a", 0.0, MB, 0, "")],
+    ))
+    first = {record['PID']: record for record in table.refresh()}
+    second = table.refresh()
+    assert [record['PID'] for record in second] == [1]
+    assert second[0] is first[1]
+
+
+def test_forget_drops_a_pid():
+    table = ProcessTable(FakeSource([((1, 1), "a", 0.0, MB, 0, ""), ((2, 2), "b", 0.0, MB, 0, "")]))
+    table.refresh()
+    table.forget(1)
+    assert [record['PID'] for record in table.records.values()] == [2]
+
+
+def ranked_table():
+    rows = [((pid, pid), f"p{pid}", 0.0, pid * MB, 0, "") for pid in range(1, 21)]
+    table = ProcessTable(FakeSource(rows))
+    for record in table.refresh():
+        record['CPUPercent'] = float(pid_cpu(record['PID']))
+    return table
+
+
+def pid_cpu(pid):
+    return (pid * 7) % 20
+
+
+def test_top_returns_the_highest_records_in_order():
+    table = ranked_table()
+    top = table.top(5, 'cpu')
+    assert [record['PID'] for record in top] == sorted(range(1, 21), key=pid_cpu, reverse=True)[:5]
+    assert [record['PID'] for record in table.top(3, 'rss')] == [20, 19, 18]
+
+
+def test_top_filters_with_where_and_falls_back_to_cpu():
+    table = ranked_table()
+    even = table.top(4, 'rss', where=lambda record: record['PID'] % 2 == 0)
+    assert [record['PID'] for record in even] == [20, 18, 16, 14]
+    assert table.top(2, 'unknown') == table.top(2, 'cpu')
+
+
+def test_top_with_more_than_available():
+    table = ranked_table()
+    assert len(table.top(100, 'rss')) == 20
+    assert table.top(0, 'rss') == []
@@ -0,0 +1,139 @@
+import threading
+import time
+
+from vomtools import CancelToken, OperationCancelled, ScanCache, WorkerPool
+
+
+class BlockingScan:
+    """A scan that waits for release() and counts how often it ran"""
+    
+    def __init__(self, value="result"):
+        self.value = value
+        self.calls = 0
+        self.started = threading.Event()
+        self.gate = threading.Event()
+    
+    def __call__(self, token):
+        self.calls += 1
+        self.started.set()
+        while not self.gate.wait(0.01):
+            if token.cancelled:
+                raise OperationCancelled()
+        return self.value
+    
+    def release(self):
+        self.gate.set()
+
+
+class Collector:
+    def __init__(self):
+        self.values = []
+        self.errors = []
+        self.done = threading.Event()
+    
+    def on_done(self, value):
+        self.values.append(value)
+        self.done.set()
+    
+    def on_error(self, error):
+        self.errors.append(error)
+        self.done.set()
+
+
+def wait_idle(cache, key):
+    deadline = time.monotonic() + 5
+    while key in cache.inflight and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_concurrent_requests_share_one_scan():
+    cache = ScanCache(lambda fn: fn())
+    scan = BlockingScan()
+    first, second = Collector(), Collector()
+    assert cache.request('k', scan, first.on_done) == 'started'
+    assert cache.request('k', scan, second.on_done) == 'joined'
+    scan.release()
+    assert first.done.wait(5) and second.done.wait(5)
+    assert scan.calls == 1
+    assert first.values == second.values == ["result"]
+
+
+def test_repeated_callback_is_delivered_once():
+    cache = ScanCache(lambda fn: fn())
+    scan = BlockingScan()
+    seen = Collector()
+    cache.request('k', scan, seen.on_done)
+    cache.request('k', scan, seen.on_done)
+    scan.release()
+    assert seen.done.wait(5)
+    wait_idle(cache, 'k')
+    assert seen.values == ["result"]
+
+
+def test_fresh_result_is_cached_and_stale_one_refreshed():
+    cache = ScanCache(lambda fn: fn())
+    scan = BlockingScan()
+    scan.release()
+    first = Collector()
+    cache.request('k', scan, first.on_done, ttl=60)
+    assert first.done.wait(5)
+    wait_idle(cache, 'k')
+    assert cache.request('k', scan, Collector().on_done, ttl=60) == 'cached'
+    assert scan.calls == 1
+    assert cache.request('k', scan, Collector().on_done, ttl=0) == 'stale'
+    wait_idle(cache, 'k')
+    assert scan.calls == 2
+
+
+def test_invalidate_during_a_scan_answers_but_does_not_cache():
+    cache = ScanCache(lambda fn: fn())
+    old_scan, new_scan = BlockingScan("old"), BlockingScan("new")
+    waiting = Collector()
+    cache.request('k', old_scan, waiting.on_done)
+    assert old_scan.started.wait(5)
+    cache.invalidate('k')
+    # The next request starts a fresh scan instead of joining the stale one
+    assert cache.request('k', new_scan, Collector().on_done) == 'started'
+    old_scan.release()
+    assert waiting.done.wait(5)
+    assert waiting.values == ["old"]
+    assert cache.results.get('k') is None
+    new_scan.release()
+    wait_idle(cache, 'k')
+    assert cache.results['k'][0] == "new"
+
+
+def test_cancelled_callers_are_skipped_and_their_scan_cancelled():
+    cache = ScanCache(lambda fn: fn())
+    scan = BlockingScan()
+    token = CancelToken()
+    seen = Collector()
+    cache.request('k', scan, seen.on_done, seen.on_error, token=token)
+    assert scan.started.wait(5)
+    token.cancel()
+    wait_idle(cache, 'k')
+    assert seen.values == [] and seen.errors == []
+    assert 'k' not in cache.results
+
+
+def test_scan_keeps_running_while_any_caller_waits():
+    cache = ScanCache(lambda fn: fn())
+    scan = BlockingScan()
+    first, second = CancelToken(), CancelToken()
+    seen = Collector()
+    cache.request('k', scan, Collector().on_done, token=first)
+    cache.request('k', scan, seen.on_done, token=second)
+    first.cancel()
+    scan.release()
+    assert seen.done.wait(5)
+    assert seen.values == ["result"]
+
+
+def test_request_is_refused_when_the_pool_is_shut_down():
+    pool = WorkerPool(1)
+    pool.shutdown()
+    cache = ScanCache(lambda fn: fn(), pool)
+    seen = Collector()
+    assert cache.request('k', BlockingScan(), seen.on_done, seen.on_error) == 'refused'
+    assert isinstance(seen.errors[0], RuntimeError)
+    assert cache.inflight == {}
@@ -0,0 +1,63 @@
+import json
+import re
+
+from vomtools import SessionLog
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records_are_written_as_json_lines(tmp_path):
+    path = tmp_path / "session.jsonl"
+    log = SessionLog(str(path))
+    log.record("started", "info")
+    log.record("ran", "accent", task="Build")
+    log.close()
+    records = read_records(path)
+    assert [(r['message'], r['tag'], r['task']) for r in records] == [
+        ("started", "info", None), ("ran", "accent", "Build"),
+    ]
+    assert log.written == 2
+
+
+def test_file_rotates_and_keeps_only_the_backups(tmp_path):
+    path = tmp_path / "session.jsonl"
+    log = SessionLog(str(path), max_bytes=2000, backups=2, batch=10)
+    for i in range(400):
+        log.record(f"message {i:04d}")
+    log.close()
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert names == ["session.jsonl", "session.jsonl.1", "session.jsonl.2"]
+    # Files are in age order and the newest record is in the live file
+    numbers = []
+    for name in ("session.jsonl.2", "session.jsonl.1", "session.jsonl"):
+        numbers += [int(r['message'].split()[1]) for r in read_records(tmp_path / name)]
+    assert numbers == sorted(numbers)
+    assert numbers[-1] == 399
+    for name in ("session.jsonl.1", "session.jsonl.2"):
+        assert (tmp_path / name).stat().st_size >= 2000
+
+
+def test_rotation_without_backups_starts_over(tmp_path):
+    path = tmp_path / "session.jsonl"
+    log = SessionLog(str(path), max_bytes=500, backups=0, batch=5)
+    for i in range(100):
+        log.record(f"message {i}")
+    log.close()
+    assert [p.name for p in tmp_path.iterdir()] in ([], ["session.jsonl"])
+
+
+def test_overflow_is_counted_not_lost_silently(tmp_path):
+    path = tmp_path / "session.jsonl"
+    log = SessionLog(str(path), max_queue=1)
+    for i in range(1000):
+        log.record(f"message {i}")
+    log.close()
+    records = read_records(path)
+    kept = sum(1 for r in records if r['message'].startswith("message "))
+    dropped = sum(int(re.match(r"(\d+) records dropped", r['message']).group(1))
+                  for r in records if r['message'].endswith("records dropped"))
+    assert kept + dropped == 1000
+    assert log.dropped == 0
@@ -0,0 +1,50 @@
+import random
+
+from vomtools import SpatialGrid, find_pairs_brute_force
+
+
+def points(count, size=400, seed=1):
+    rng = random.Random(seed)
+    return [rng.uniform(0, size) for _ in range(count)], [rng.uniform(0, size) for _ in range(count)]
+
+
+def pair_set(pairs):
+    return {frozenset([(x1, y1), (x2, y2)]) for x1, y1, x2, y2, _ in pairs}
+
+
+def test_pairs_match_brute_force():
+    xs, ys = points(150)
+    grid = SpatialGrid(cell_size=60)
+    grid.rebuild(xs, ys)
+    assert pair_set(grid.pairs(xs, ys, 60)) == pair_set(find_pairs_brute_force(xs, ys, 60))
+
+
+def test_limit_caps_the_pair_count():
+    xs, ys = points(150)
+    grid = SpatialGrid(cell_size=60)
+    grid.rebuild(xs, ys)
+    everything = pair_set(grid.pairs(xs, ys, 60))
+    capped = grid.pairs(xs, ys, 60, limit=25)
+    assert len(capped) == 25
+    assert pair_set(capped) <= everything
+    assert grid.pairs(xs, ys, 60, limit=0) == []
+
+
+def test_capped_pairs_are_spread_over_cells():
+    # Two dense clusters far apart: a cap must not be used up by the first one
+    xs = [10 + i % 5 for i in range(40)] + [390 - i % 5 for i in range(40)]
+    ys = [10 + i // 5 for i in range(40)] + [390 - i // 5 for i in range(40)]
+    grid = SpatialGrid(cell_size=60)
+    grid.rebuild(xs, ys)
+    capped = grid.pairs(xs, ys, 60, limit=10)
+    left = sum(1 for x1, _, _, _, _ in capped if x1 < 200)
+    assert 0 < left < 10
+
+
+def test_distances_are_below_the_radius():
+    xs, ys = points(100)
+    grid = SpatialGrid(cell_size=50)
+    grid.rebuild(xs, ys)
+    for x1, y1, x2, y2, dist in grid.pairs(xs, ys, 50):
+        assert dist < 50
+        assert abs(dist - ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5) < 1e-9
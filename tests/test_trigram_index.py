@@ -0,0 +1,76 @@
+import random
+import string
+
+from vomtools import TrigramIndex
+
+
+def corpus(count=300, seed=3):
+    rng = random.Random(seed)
+    words = ["".join(rng.choice(string.ascii_lowercase[:8]) for _ in range(rng.randint(3, 7))) for _ in range(60)]
+    return {f"key{i}": " ".join(rng.choice(words) for _ in range(rng.randint(1, 8))) for i in range(count)}
+
+
+def matches(texts, query):
+    return {key for key, text in texts.items() if query in text}
+
+
+def test_candidates_hold_every_match():
+    texts = corpus()
+    index = TrigramIndex.build(texts.items())
+    assert len(index) == len(texts)
+    for text in list(texts.values())[:40]:
+        query = text[:5]
+        if len(query) < 3:
+            continue
+        found = index.candidates(query)
+        assert found is not None
+        assert matches(texts, query) <= found
+        # Candidates hold every trigram, so they are close to the real matches
+        assert all(gram in texts[key] for key in found for gram in TrigramIndex.trigrams(query))
+
+
+def test_short_query_is_not_answered_by_the_index():
+    index = TrigramIndex.build([("a", "hello world")])
+    assert index.candidates("he") is None
+    assert index.candidates("") is None
+
+
+def test_unknown_trigram_gives_no_candidates():
+    index = TrigramIndex.build([("a", "hello world")])
+    assert index.candidates("xyz") == set()
+    assert index.candidates("hello") == {"a"}
+
+
+def test_remove_forgets_a_key():
+    texts = corpus(100)
+    index = TrigramIndex.build(texts.items())
+    removed = list(texts)[::3]
+    for key in removed:
+        index.remove(key, texts[key])
+    for key in removed:
+        assert key not in index
+        del texts[key]
+    for text in texts.values():
+        query = text[:4]
+        if len(query) == 4:
+            assert matches(texts, query) <= index.candidates(query) <= set(texts)
+    # A removed key added again gets a new id and is found again
+    index.add("again", "brand new text")
+    assert index.candidates("brand") == {"again"}
+
+
+def test_common_trigrams_are_dropped_and_skipped():
+    class SmallIndex(TrigramIndex):
+        MAX_POSTING = 4
+    index = SmallIndex.build((f"k{i}", f"common text {i:02d}") for i in range(10))
+    assert "com" in index.common and "com" not in index.postings
+    # Only common trigrams: the caller has to scan
+    assert index.candidates("common") is None
+    assert index.candidates("common text 07") == {"k7"}
+
+
+def test_clear_empties_the_index():
+    index = TrigramIndex.build([("a", "hello world")])
+    index.clear()
+    assert len(index) == 0
+    assert index.candidates("hello") == set()
@@ -7,286 +7,3376 @@ from datetime import datetime
 import random
 import sys
 import math
+import time
 import json
+import heapq
+import hashlib
+import queue
+import sqlite3
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from itertools import islice
+from operator import itemgetter
 import pystray
-from PIL import Image
+from PIL import Image, ImageDraw
 import keyboard
 
+try:
+    from PIL import ImageTk
+except ImportError:
+    ImageTk = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Hide PowerShell windows on Windows
 SUBPROCESS_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
 
 
-class AnimatedOrb:
-    """Animated green/black orb background inspired by Ampcode"""
+def hex_to_rgb(color):
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+
+class Palette:
+    """Precomputed color strings for the active accent preset.
+    
+    ramp[v] is the accent color scaled to intensity v (0-255), so render
+    loops index a table instead of formatting hex strings every frame.
+    Swapping the palette re-skins everything that draws from it.
+    """
+    
+    DEFAULT_ACCENT = '#00ff9f'
+    
+    def __init__(self, colors, name='Green'):
+        self.name = name
+        self._ramps = {}
+        self.ramp = self.ramp_for(colors.get('glow', self.DEFAULT_ACCENT))
+        self.scanline = self.ramp[26]
+    
+    def ramp_for(self, base):
+        """256-step lookup table from black to the given base color"""
+        ramp = self._ramps.get(base)
+        if ramp is None:
+            r, g, b = hex_to_rgb(base)
+            ramp = [f"#{r * v // 255:02x}{g * v // 255:02x}{b * v // 255:02x}" for v in range(256)]
+            self._ramps[base] = ramp
+        return ramp
+
+
+class ParticleSystem:
+    """Struct-of-arrays particle store for the orb background.
+    
+    Positions, velocities, size, brightness and phase live in one contiguous
+    array per field. With NumPy every frame is a handful of vectorized
+    operations; without it the same arrays are updated with plain loops.
+    """
+    
+    FIELDS = ('x', 'y', 'vx', 'vy', 'size', 'brightness', 'phase', 'glow')
+    
+    def __init__(self, count, width, height, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        self.use_numpy = use_numpy and np is not None
+        self.count = count
+        self.width = width
+        self.height = height
+        self.reset()
+    
+    def __len__(self):
+        return self.count
+    
+    def reset(self):
+        """Scatter all particles randomly across the area"""
+        n = self.count
+        if self.use_numpy:
+            rng = np.random.default_rng()
+            self.x = rng.integers(0, self.width + 1, n).astype(np.float64)
+            self.y = rng.integers(0, self.height + 1, n).astype(np.float64)
+            self.vx = rng.uniform(-0.5, 0.5, n)
+            self.vy = rng.uniform(-0.5, 0.5, n)
+            self.size = rng.uniform(1, 3, n)
+            self.brightness = rng.uniform(0.3, 1.0, n)
+            self.phase = rng.uniform(0, math.pi * 2, n)
+            self.glow = np.zeros(n)
+        else:
+            self.x = array('d', (random.randint(0, self.width) for _ in range(n)))
+            self.y = array('d', (random.randint(0, self.height) for _ in range(n)))
+            self.vx = array('d', (random.uniform(-0.5, 0.5) for _ in range(n)))
+            self.vy = array('d', (random.uniform(-0.5, 0.5) for _ in range(n)))
+            self.size = array('d', (random.uniform(1, 3) for _ in range(n)))
+            self.brightness = array('d', (random.uniform(0.3, 1.0) for _ in range(n)))
+            self.phase = array('d', (random.uniform(0, math.pi * 2) for _ in range(n)))
+            self.glow = array('d', bytes(8 * n))
+    
+    def resize(self, count):
+        """Grow or shrink to count particles, keeping the existing ones in place"""
+        if count == self.count:
+            return
+        keep = min(count, self.count)
+        old = {name: getattr(self, name)[:keep] for name in self.FIELDS}
+        extra = count - keep
+        self.count = extra
+        self.reset()
+        for name in self.FIELDS:
+            fresh = getattr(self, name)
+            if self.use_numpy:
+                setattr(self, name, np.concatenate((old[name], fresh)))
+            else:
+                setattr(self, name, old[name] + fresh)
+        self.count = count
+    
+    def columns(self, *names):
+        """Plain Python sequences for the given fields, cheap to iterate while drawing"""
+        if self.use_numpy:
+            return [getattr(self, name).tolist() for name in names]
+        return [getattr(self, name) for name in names]
+    
+    def step(self, orb_x, orb_y, mouse_x, mouse_y, width, height):
+        """Attract/orbit around the orb, repel from the mouse, damp, wrap and pulse"""
+        self.width = width
+        self.height = height
+        if self.use_numpy:
+            self._step_numpy(orb_x, orb_y, mouse_x, mouse_y, width, height)
+        else:
+            self._step_array(orb_x, orb_y, mouse_x, mouse_y, width, height)
+    
+    def _step_numpy(self, orb_x, orb_y, mouse_x, mouse_y, width, height):
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        
+        # Attraction plus tangential orbit velocity
+        dx = orb_x - x
+        dy = orb_y - y
+        dist = np.hypot(dx, dy)
+        inv = np.divide(1.0, dist, out=np.zeros_like(dist), where=dist > 0)
+        vx += (dx * 0.02 - dy * 0.01) * inv
+        vy += (dy * 0.02 + dx * 0.01) * inv
+        
+        # Mouse repulsion
+        mx = x - mouse_x
+        my = y - mouse_y
+        mouse_dist = np.hypot(mx, my)
+        near = (mouse_dist < 100) & (mouse_dist > 0)
+        repel = np.divide((100 - mouse_dist) / 500, mouse_dist, out=np.zeros_like(mouse_dist), where=near)
+        vx += mx * repel
+        vy += my * repel
+        
+        # Apply velocity with damping
+        x += vx
+        y += vy
+        vx *= 0.98
+        vy *= 0.98
+        
+        # Wrap around edges
+        low_x = x < 0
+        low_y = y < 0
+        x[x > width] = 0
+        y[y > height] = 0
+        x[low_x] = width
+        y[low_y] = height
+        
+        # Pulsing brightness, dimmed close to the orb
+        self.phase += 0.02
+        glow = self.glow
+        np.sin(self.phase, out=glow)
+        glow *= 0.3
+        glow += 0.7
+        glow *= self.brightness
+        glow *= np.where(dist < 200, 0.5 + 0.5 * (dist / 200), 1.0)
+    
+    def _step_array(self, orb_x, orb_y, mouse_x, mouse_y, width, height):
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        brightness, phase, glow = self.brightness, self.phase, self.glow
+        sqrt, sin = math.sqrt, math.sin
+        for i in range(self.count):
+            px = x[i]
+            py = y[i]
+            pvx = vx[i]
+            pvy = vy[i]
+            
+            dx = orb_x - px
+            dy = orb_y - py
+            dist = sqrt(dx*dx + dy*dy)
+            if dist > 0:
+                pvx += (dx * 0.02 - dy * 0.01) / dist
+                pvy += (dy * 0.02 + dx * 0.01) / dist
+            
+            mx = px - mouse_x
+            my = py - mouse_y
+            mouse_dist = sqrt(mx*mx + my*my)
+            if mouse_dist < 100 and mouse_dist > 0:
+                repel = (100 - mouse_dist) / 500
+                pvx += (mx / mouse_dist) * repel
+                pvy += (my / mouse_dist) * repel
+            
+            px += pvx
+            py += pvy
+            if px < 0: px = width
+            elif px > width: px = 0
+            if py < 0: py = height
+            elif py > height: py = 0
+            x[i] = px
+            y[i] = py
+            vx[i] = pvx * 0.98
+            vy[i] = pvy * 0.98
+            
+            ph = phase[i] + 0.02
+            phase[i] = ph
+            g = brightness[i] * (0.7 + 0.3 * sin(ph))
+            if dist < 200:
+                g *= (0.5 + 0.5 * (dist / 200))
+            glow[i] = g
+    
+    def scatter(self, cx, cy, radius=150, strength=15):
+        """Push particles within radius of (cx, cy) outward, stronger when closer"""
+        if self.use_numpy:
+            dx = self.x - cx
+            dy = self.y - cy
+            dist = np.hypot(dx, dy)
+            near = (dist < radius) & (dist > 0)
+            force = np.divide((radius - dist) / strength, dist, out=np.zeros_like(dist), where=near)
+            self.vx += dx * force
+            self.vy += dy * force
+            return
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        for i in range(self.count):
+            dx = x[i] - cx
+            dy = y[i] - cy
+            dist = math.sqrt(dx*dx + dy*dy)
+            if dist < radius and dist > 0:
+                force = (radius - dist) / strength
+                vx[i] += (dx / dist) * force
+                vy[i] += (dy / dist) * force
+
+
+class SpatialGrid:
+    """Uniform grid of particle indices for fixed-radius neighbor queries.
+    
+    With the cell size equal to the query radius every neighbor of a point
+    lies in its own cell or one of the eight around it, so only nearby
+    particles are ever compared.
+    """
+    
+    # Own cell plus the forward half of the neighborhood, so each pair of cells is visited once
+    HALF_NEIGHBORHOOD = ((1, 0), (-1, 1), (0, 1), (1, 1))
+    
+    def __init__(self, cell_size=80):
+        self.cell_size = cell_size
+        self.cells = {}
+    
+    def rebuild(self, xs, ys):
+        """Bucket every point index by the cell it falls in"""
+        inv = 1.0 / self.cell_size
+        cells = {}
+        for i in range(len(xs)):
+            key = (int(xs[i] * inv), int(ys[i] * inv))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [i]
+            else:
+                bucket.append(i)
+        self.cells = cells
+    
+    def pairs(self, xs, ys, radius, limit=None):
+        """Point pairs closer than radius as (x1, y1, x2, y2, dist), at most limit of them.
+        
+        Cells take turns handing out one pair each, so when limit cuts the
+        list short the pairs are spread over the whole grid rather than
+        used up by whichever cells come first.
+        """
+        if limit is None:
+            limit = sys.maxsize
+        found = []
+        if limit <= 0:
+            return found
+        r2 = radius * radius
+        active = [self._cell_pairs(key, members, xs, ys, r2) for key, members in self.cells.items()]
+        while active:
+            remaining = []
+            for cell in active:
+                pair = next(cell, None)
+                if pair is None:
+                    continue
+                found.append(pair)
+                if len(found) >= limit:
+                    return found
+                remaining.append(cell)
+            active = remaining
+        return found
+    
+    def _cell_pairs(self, key, members, xs, ys, r2):
+        """Close pairs inside one cell and between it and its forward neighbors"""
+        sqrt = math.sqrt
+        cx, cy = key
+        count = len(members)
+        for a in range(count):
+            i = members[a]
+            x1, y1 = xs[i], ys[i]
+            for b in range(a + 1, count):
+                j = members[b]
+                dx = x1 - xs[j]
+                dy = y1 - ys[j]
+                d2 = dx*dx + dy*dy
+                if d2 < r2:
+                    yield (x1, y1, xs[j], ys[j], sqrt(d2))
+        for ox, oy in self.HALF_NEIGHBORHOOD:
+            other = self.cells.get((cx + ox, cy + oy))
+            if other is None:
+                continue
+            for i in members:
+                x1, y1 = xs[i], ys[i]
+                for j in other:
+                    dx = x1 - xs[j]
+                    dy = y1 - ys[j]
+                    d2 = dx*dx + dy*dy
+                    if d2 < r2:
+                        yield (x1, y1, xs[j], ys[j], sqrt(d2))
+
+
+def find_pairs_brute_force(xs, ys, radius, limit=None):
+    """Reference O(n^2) version of SpatialGrid.pairs, kept for benchmarking"""
+    if limit is None:
+        limit = sys.maxsize
+    found = []
+    for i in range(len(xs)):
+        x1, y1 = xs[i], ys[i]
+        for j in range(i + 1, len(xs)):
+            dx = x1 - xs[j]
+            dy = y1 - ys[j]
+            dist = math.sqrt(dx*dx + dy*dy)
+            if dist < radius:
+                found.append((x1, y1, xs[j], ys[j], dist))
+                if len(found) >= limit:
+                    return found
+    return found
+
+
+def tcl_word(value):
+    """Quote one option value for a hand-built Tcl command"""
+    text = str(value)
+    if not text:
+        return "{}"
+    if any(c in text for c in ' \t\n;$[]"\\'):
+        return "{" + text + "}"
+    return text
+
+
+class CanvasBatch:
+    """Collects coords() and itemconfigure() calls and sends them as one Tcl script.
+    
+    Every Tkinter canvas call is its own round trip into Tcl, so a frame
+    that touches a few hundred items pays for a few hundred of them.
+    Queued here they cost one tk.eval() at flush(); every other canvas
+    method is passed straight through.
+    """
+    
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.path = str(canvas)
+        self.commands = []
+    
+    def __getattr__(self, name):
+        return getattr(self.canvas, name)
+    
+    def coords(self, item, *coords):
+        self.commands.append(f"{self.path} coords {item} {' '.join(map(str, coords))}")
+    
+    def itemconfigure(self, item, **options):
+        words = " ".join(f"-{key} {tcl_word(value)}" for key, value in options.items())
+        self.commands.append(f"{self.path} itemconfigure {item} {words}")
+    
+    def flush(self):
+        if self.commands:
+            script = "\n".join(self.commands)
+            self.commands = []
+            self.canvas.tk.eval(script)
+
+
+class CanvasItemPool:
+    """Fixed set of canvas items of one kind, reused from frame to frame.
+    
+    Each frame calls begin(), place() once per visible item and end().
+    Coordinates are rounded to whole pixels, and an item is only moved
+    when they differ from the last frame's and only reconfigured when its
+    options change; leftover items are hidden instead of deleted.
+    """
+    
+    def __init__(self, canvas, kind, tag, under=None):
+        self.canvas = canvas
+        self.kind = kind
+        self.tags = (tag, "orb_bg")
+        self.under = under  # pool whose items must stay above ours
+        self.items = []
+        self.options = []
+        self.positions = []  # coords last sent for each item
+        self.used = 0
+        self.shown = 0
+    
+    def reserve(self, count):
+        """Create hidden items up front so the pool does not grow mid-animation"""
+        while len(self.items) < count:
+            self._grow()
+    
+    def _grow(self):
+        create = getattr(self.canvas, f"create_{self.kind}")
+        if self.kind == "image":
+            item = create(0, 0, state="hidden", tags=self.tags)
+        else:
+            item = create(0, 0, 0, 0, state="hidden", tags=self.tags)
+        if self.under is not None and self.under.items:
+            self.canvas.tag_lower(item, self.under.items[0])
+        self.items.append(item)
+        self.options.append(None)
+        self.positions.append(None)
+    
+    def begin(self):
+        self.used = 0
+    
+    def place(self, x1, y1, x2, y2, options):
+        """Position the next free item; options is a hashable tuple of (key, value)"""
+        i = self.used
+        if i == len(self.items):
+            self._grow()
+        self._move(i, (round(x1), round(y1), round(x2), round(y2)))
+        self._configure(i, options)
+    
+    def place_at(self, x, y, options):
+        """Like place() for single-point items such as images"""
+        i = self.used
+        if i == len(self.items):
+            self._grow()
+        self._move(i, (round(x), round(y)))
+        self._configure(i, options)
+    
+    def _move(self, i, coords):
+        if self.positions[i] != coords:
+            self.canvas.coords(self.items[i], *coords)
+            self.positions[i] = coords
+    
+    def _configure(self, i, options):
+        item = self.items[i]
+        if i >= self.shown:
+            self.canvas.itemconfigure(item, state="normal", **dict(options))
+            self.options[i] = options
+        elif self.options[i] != options:
+            self.canvas.itemconfigure(item, **dict(options))
+            self.options[i] = options
+        self.used = i + 1
+    
+    def end(self):
+        """Hide items that were visible last frame but not used this frame"""
+        for i in range(self.used, self.shown):
+            self.canvas.itemconfigure(self.items[i], state="hidden")
+        self.shown = self.used
+    
+    def destroy(self):
+        self.canvas.delete(self.tags[0])
+        self.items = []
+        self.options = []
+        self.positions = []
+        self.used = 0
+        self.shown = 0
+
+
+class ImmediateOrbRenderer:
+    """Original renderer: deletes and recreates every orb item each frame"""
+    
+    def __init__(self, canvas, palette):
+        self.canvas = canvas
+        self.palette = palette
+    
+    def set_palette(self, palette):
+        self.palette = palette
+    
+    def render(self, orb):
+        canvas = self.canvas
+        canvas.delete("orb_bg")
+        ramp = self.palette.ramp
+        
+        # Draw outer glow layers - larger spread
+        pulse_offset = math.sin(orb.orb_pulse) * 15
+        for i in orb.glow_indices:
+            r = orb.orb_radius + i * 35 + pulse_offset
+            intensity = int(25 - i * 3)
+            color = ramp[max(0, intensity)]
+            canvas.create_oval(
+                orb.orb_x - r, orb.orb_y - r,
+                orb.orb_x + r, orb.orb_y + r,
+                fill=color, outline="",
+                tags="orb_bg"
+            )
+        
+        # Draw orb core
+        core_pulse = orb.orb_radius + math.sin(orb.orb_pulse * 1.5) * 5
+        for i in range(5, 0, -1):
+            r = core_pulse * (i / 5)
+            g = int(80 + (5 - i) * 35)
+            color = ramp[min(255, g)]
+            canvas.create_oval(
+                orb.orb_x - r, orb.orb_y - r,
+                orb.orb_x + r, orb.orb_y + r,
+                fill=color, outline="",
+                tags="orb_bg"
+            )
+        
+        # Particles
+        xs, ys, sizes, glows = orb.particles.columns('x', 'y', 'size', 'glow')
+        for x, y, size, glow in zip(xs, ys, sizes, glows):
+            color = ramp[int(glow * 255)]
+            canvas.create_oval(
+                x - size, y - size,
+                x + size, y + size,
+                fill=color, outline="",
+                tags="orb_bg"
+            )
+        
+        # Energy connections between close particles
+        radius = orb.connection_radius
+        for x1, y1, x2, y2, dist in orb.find_connections():
+            alpha = int((1 - dist/radius) * 40)
+            color = ramp[alpha]
+            canvas.create_line(
+                x1, y1, x2, y2,
+                fill=color, width=1,
+                tags="orb_bg"
+            )
+        
+        # Burst effects
+        for burst in orb.bursts:
+            for i in range(3):
+                r = burst['radius'] - i * 15
+                if r > 0:
+                    intensity = int(burst['alpha'] * 100 * (1 - i * 0.3))
+                    color = ramp[max(0, intensity)]
+                    canvas.create_oval(
+                        burst['x'] - r, burst['y'] - r,
+                        burst['x'] + r, burst['y'] + r,
+                        outline=color, width=3-i,
+                        tags="orb_bg"
+                    )
+        
+        # Shockwave rings
+        for ring in orb.rings:
+            intensity = int(ring['alpha'] * 180)
+            color = ramp[intensity]
+            canvas.create_oval(
+                ring['x'] - ring['radius'], ring['y'] - ring['radius'],
+                ring['x'] + ring['radius'], ring['y'] + ring['radius'],
+                outline=color, width=2,
+                tags="orb_bg"
+            )
+    
+    def destroy(self):
+        self.canvas.delete("orb_bg")
+
+
+class RetainedOrbRenderer:
+    """Renderer that keeps a pool of canvas items alive and only moves/recolors them.
+    
+    No items are created or deleted in steady state, and option changes are
+    skipped when the (quantized) color did not change since the last frame.
+    The updates of a frame reach Tk together through one CanvasBatch.
+    """
+    
+    PARTICLE_LEVELS = 64
+    
+    def __init__(self, canvas, num_particles, palette):
+        self.canvas = CanvasBatch(canvas)
+        self.pools = []
+        self.create_pools(num_particles)
+        self.set_palette(palette)
+    
+    def set_palette(self, palette):
+        """Build the per-effect option tables from the palette; the hot loop only indexes them"""
+        self.palette = palette
+        ramp = palette.ramp
+        self.glow_options = [
+            (('fill', ramp[max(0, 25 - i * 3)]), ('outline', ""))
+            for i in range(9)
+        ]
+        self.core_options = [
+            (('fill', ramp[min(255, int(80 + (5 - i) * 35))]), ('outline', ""))
+            for i in range(6)
+        ]
+        levels = self.PARTICLE_LEVELS - 1
+        self.particle_options = [
+            (('fill', ramp[level * 255 // levels]), ('outline', ""))
+            for level in range(self.PARTICLE_LEVELS)
+        ]
+        self.line_options = [(('fill', ramp[a]), ('width', 1)) for a in range(41)]
+        self.burst_options = [
+            [(('outline', ramp[v]), ('width', 3 - i)) for v in range(101)]
+            for i in range(3)
+        ]
+        self.ring_options = [
+            (('outline', ramp[v]), ('width', 2))
+            for v in range(181)
+        ]
+    
+    def add_pool(self, kind, tag, reserve=0):
+        """Append a pool on top of the existing ones, matching the original draw order"""
+        pool = CanvasItemPool(self.canvas, kind, tag)
+        if self.pools:
+            self.pools[-1].under = pool
+        pool.reserve(reserve)
+        self.pools.append(pool)
+        return pool
+    
+    def create_pools(self, num_particles):
+        self.glow = self.add_pool("oval", "orb_glow", 8)
+        self.core = self.add_pool("oval", "orb_core", 5)
+        self.particles = self.add_pool("oval", "orb_particles", num_particles)
+        self.lines = self.add_pool("line", "orb_lines", 20)
+        self.bursts = self.add_pool("oval", "orb_bursts", 3)
+        self.rings = self.add_pool("oval", "orb_rings", 4)
+    
+    def render(self, orb):
+        for pool in self.pools:
+            pool.begin()
+        self.draw_orb(orb)
+        self.draw_particles(orb)
+        self.draw_connections(orb)
+        for burst in orb.bursts:
+            self.draw_burst(burst)
+        self.draw_rings(orb)
+        for pool in self.pools:
+            pool.end()
+        self.canvas.flush()
+    
+    def draw_orb(self, orb):
+        ox, oy = orb.orb_x, orb.orb_y
+        
+        pulse_offset = math.sin(orb.orb_pulse) * 15
+        for i in orb.glow_indices:
+            r = orb.orb_radius + i * 35 + pulse_offset
+            self.glow.place(ox - r, oy - r, ox + r, oy + r, self.glow_options[i])
+        
+        core_pulse = orb.orb_radius + math.sin(orb.orb_pulse * 1.5) * 5
+        for i in range(5, 0, -1):
+            r = core_pulse * (i / 5)
+            self.core.place(ox - r, oy - r, ox + r, oy + r, self.core_options[i])
+    
+    def draw_particles(self, orb):
+        levels = self.PARTICLE_LEVELS - 1
+        options = self.particle_options
+        place = self.particles.place
+        xs, ys, sizes, glows = orb.particles.columns('x', 'y', 'size', 'glow')
+        for x, y, size, glow in zip(xs, ys, sizes, glows):
+            place(x - size, y - size, x + size, y + size, options[int(glow * levels)])
+    
+    def draw_connections(self, orb):
+        radius = orb.connection_radius
+        lines = [
+            (int((1 - dist/radius) * 40), x1, y1, x2, y2)
+            for x1, y1, x2, y2, dist in orb.find_connections()
+        ]
+        # Faintest first, so each line item mostly keeps the color it had last frame
+        lines.sort(key=lambda line: line[0])
+        for alpha, x1, y1, x2, y2 in lines:
+            self.lines.place(x1, y1, x2, y2, self.line_options[alpha])
+    
+    def draw_burst(self, burst):
+        bx, by = burst['x'], burst['y']
+        for i in range(3):
+            r = burst['radius'] - i * 15
+            if r > 0:
+                intensity = max(0, int(burst['alpha'] * 100 * (1 - i * 0.3)))
+                self.bursts.place(bx - r, by - r, bx + r, by + r, self.burst_options[i][intensity])
+    
+    def draw_rings(self, orb):
+        for ring in orb.rings:
+            r = ring['radius']
+            intensity = int(ring['alpha'] * 180)
+            self.rings.place(ring['x'] - r, ring['y'] - r, ring['x'] + r, ring['y'] + r, self.ring_options[intensity])
+    
+    def destroy(self):
+        for pool in self.pools:
+            pool.destroy()
+
+
+class SpriteCache:
+    """LRU cache of pre-rendered Pillow sprites converted to Tk PhotoImages.
+    
+    Sprites are keyed by a caller-supplied tuple (kind, quantized size,
+    intensity, theme, ...). Least recently used sprites are dropped once the
+    total pixel memory exceeds max_bytes.
+    """
+    
+    def __init__(self, max_bytes=48 * 1024 * 1024, photo_factory=None):
+        self.max_bytes = max_bytes
+        # Converts a PIL image for display; swapped out when profiling without Tk
+        self.photo_factory = photo_factory if photo_factory is not None else ImageTk.PhotoImage
+        self.sprites = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, render):
+        """Return the PhotoImage for key, calling render() -> PIL image on a miss"""
+        entry = self.sprites.get(key)
+        if entry is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        image = render()
+        photo = self.photo_factory(image)
+        size = image.width * image.height * 4
+        self.sprites[key] = (photo, size)
+        self.bytes += size
+        # Never evict the sprite that is about to be placed
+        while self.bytes > self.max_bytes and len(self.sprites) > 1:
+            _, (_, evicted) = self.sprites.popitem(last=False)
+            self.bytes -= evicted
+        return photo
+    
+    def clear(self):
+        self.sprites.clear()
+        self.bytes = 0
+
+
+class SpriteOrbRenderer(RetainedOrbRenderer):
+    """Retained renderer that draws the glow, core and click bursts as cached sprites.
+    
+    The 8 glow and 5 core ovals collapse into one image each, and a burst's
+    three rings into one image, so these effects cost a single coords() per
+    frame. Radii are quantized so a handful of sprites cover the whole pulse.
+    Bursts larger than max_sprite_radius fall back to vector ovals to keep
+    sprite memory bounded; shockwave rings stay vector ovals since each one
+    is already a single item.
+    """
+    
+    GLOW_STEP = 3
+    CORE_STEP = 1
+    BURST_STEP = 12
+    
+    def __init__(self, canvas, num_particles, palette, cache=None, max_sprite_radius=240):
+        self.cache = cache if cache is not None else SpriteCache()
+        self.max_sprite_radius = max_sprite_radius
+        super().__init__(canvas, num_particles, palette)
+    
+    def set_palette(self, palette):
+        super().set_palette(palette)
+        # Sprites of the previous theme will not be used again
+        self.cache.clear()
+        self.theme = palette.name
+    
+    def create_pools(self, num_particles):
+        self.glow = self.add_pool("image", "orb_glow", 1)
+        self.core = self.add_pool("image", "orb_core", 1)
+        self.particles = self.add_pool("oval", "orb_particles", num_particles)
+        self.lines = self.add_pool("line", "orb_lines", 20)
+        self.burst_sprites = self.add_pool("image", "orb_burst_sprites", 1)
+        self.bursts = self.add_pool("oval", "orb_bursts", 3)
+        self.rings = self.add_pool("oval", "orb_rings", 4)
+    
+    def draw_orb(self, orb):
+        ox, oy = orb.orb_x, orb.orb_y
+        base = orb.orb_radius
+        
+        offset = round(math.sin(orb.orb_pulse) * 15 / self.GLOW_STEP) * self.GLOW_STEP
+        layers = tuple(orb.glow_indices)
+        glow = self.cache.get(
+            ('glow', self.theme, base, offset, layers),
+            lambda: self.render_discs(
+                [(base + i * 35 + offset, self.glow_options[i][0][1]) for i in layers]
+            )
+        )
+        self.glow.place_at(ox, oy, (('image', glow),))
+        
+        core_pulse = round((base + math.sin(orb.orb_pulse * 1.5) * 5) / self.CORE_STEP) * self.CORE_STEP
+        core = self.cache.get(
+            ('core', self.theme, core_pulse),
+            lambda: self.render_discs(
+                [(core_pulse * (i / 5), self.core_options[i][0][1]) for i in range(5, 0, -1)]
+            )
+        )
+        self.core.place_at(ox, oy, (('image', core),))
+    
+    def draw_burst(self, burst):
+        radius = round(burst['radius'] / self.BURST_STEP) * self.BURST_STEP
+        if radius > self.max_sprite_radius:
+            super().draw_burst(burst)
+            return
+        intensity = max(0, int(burst['alpha'] * 100))
+        sprite = self.cache.get(
+            ('burst', self.theme, radius, intensity),
+            lambda: self.render_burst(radius, intensity)
+        )
+        self.burst_sprites.place_at(burst['x'], burst['y'], (('image', sprite),))
+    
+    def render_discs(self, discs):
+        """Filled concentric circles, largest first: [(radius, color), ...]"""
+        outer = max(r for r, _ in discs)
+        size = int(math.ceil(outer)) * 2 + 2
+        center = size / 2
+        image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        for r, color in discs:
+            if r > 0:
+                draw.ellipse((center - r, center - r, center + r, center + r), fill=color)
+        return image
+    
+    def render_burst(self, radius, intensity):
+        size = int(radius) * 2 + 4
+        center = size / 2
+        image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        for i in range(3):
+            r = radius - i * 15
+            if r > 0:
+                options = dict(self.burst_options[i][max(0, int(intensity * (1 - i * 0.3)))])
+                draw.ellipse(
+                    (center - r, center - r, center + r, center + r),
+                    outline=options['outline'], width=options['width']
+                )
+        return image
+
+
+class RasterOrbRenderer:
+    """Software renderer that composites the whole orb scene into one RGB buffer.
+    
+    Each frame is drawn with Pillow into an offscreen image and pushed to the
+    canvas with a single PhotoImage paste, so the canvas holds one item no
+    matter how many particles and effects are on screen. With threaded=True
+    the next frame is rasterized on a worker thread while Tk shows the
+    current one; the picture then trails the simulation by one frame.
+    """
+    
+    def __init__(self, canvas, palette, background='#0c0c0c', threaded=False, photo_factory=None):
+        self.canvas = canvas
+        self.background = hex_to_rgb(background)
+        # Converts a PIL image for display; swapped out when profiling without Tk
+        self.photo_factory = photo_factory if photo_factory is not None else ImageTk.PhotoImage
+        self.photo = None
+        self.photo_size = None
+        self.item = None
+        self.buffer = None
+        self.frames = 0
+        self.dropped = 0
+        self.set_palette(palette)
+        
+        # Worker hand-off: one pending scene in, one finished image out
+        self.threaded = threaded
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = None
+        self._ready = None
+        self._spare = []
+        self._closed = False
+        if threaded:
+            threading.Thread(target=self._worker, daemon=True).start()
+    
+    def set_palette(self, palette):
+        self.palette = palette
+        self.rgb = [hex_to_rgb(color) for color in palette.ramp]
+    
+    def render(self, orb):
+        scene = self.build_scene(orb)
+        size = (max(1, int(orb.width)), max(1, int(orb.height)))
+        if not self.threaded:
+            self.buffer = self.rasterize(size, scene, self.buffer)
+            self.present(self.buffer)
+            return
+        with self._lock:
+            ready, self._ready = self._ready, None
+            if self._pending is not None:
+                # Worker is behind - replace the stale scene with the newest one
+                self.dropped += 1
+            self._pending = (size, scene)
+        self._wake.set()
+        if ready is not None:
+            self.present(ready)
+            with self._lock:
+                self._spare.append(ready)
+    
+    def build_scene(self, orb):
+        """Snapshot the frame as plain tuples so it can be rasterized off the Tk thread"""
+        rgb = self.rgb
+        ox, oy = orb.orb_x, orb.orb_y
+        discs = []
+        
+        pulse_offset = math.sin(orb.orb_pulse) * 15
+        for i in orb.glow_indices:
+            r = orb.orb_radius + i * 35 + pulse_offset
+            discs.append(((ox - r, oy - r, ox + r, oy + r), rgb[max(0, 25 - i * 3)]))
+        
+        core_pulse = orb.orb_radius + math.sin(orb.orb_pulse * 1.5) * 5
+        for i in range(5, 0, -1):
+            r = core_pulse * (i / 5)
+            discs.append(((ox - r, oy - r, ox + r, oy + r), rgb[min(255, int(80 + (5 - i) * 35))]))
+        
+        xs, ys, sizes, glows = orb.particles.columns('x', 'y', 'size', 'glow')
+        for x, y, size, glow in zip(xs, ys, sizes, glows):
+            discs.append(((x - size, y - size, x + size, y + size), rgb[int(glow * 255)]))
+        
+        radius = orb.connection_radius
+        lines = [
+            ((x1, y1, x2, y2), rgb[int((1 - dist/radius) * 40)])
+            for x1, y1, x2, y2, dist in orb.find_connections()
+        ]
+        
+        outlines = []
+        for burst in orb.bursts:
+            bx, by = burst['x'], burst['y']
+            for i in range(3):
+                r = burst['radius'] - i * 15
+                if r > 0:
+                    intensity = max(0, int(burst['alpha'] * 100 * (1 - i * 0.3)))
+                    outlines.append(((bx - r, by - r, bx + r, by + r), rgb[intensity], 3 - i))
+        for ring in orb.rings:
+            r = ring['radius']
+            outlines.append((
+                (ring['x'] - r, ring['y'] - r, ring['x'] + r, ring['y'] + r),
+                rgb[int(ring['alpha'] * 180)], 2
+            ))
+        return discs, lines, outlines
+    
+    def rasterize(self, size, scene, image=None):
+        """Draw a scene into image (reused when the size matches) and return it"""
+        if image is None or image.size != size:
+            image = Image.new('RGB', size, self.background)
+        else:
+            image.paste(self.background, (0, 0) + size)
+        discs, lines, outlines = scene
+        draw = ImageDraw.Draw(image)
+        ellipse = draw.ellipse
+        line = draw.line
+        for box, fill in discs:
+            ellipse(box, fill=fill)
+        for coords, fill in lines:
+            line(coords, fill=fill)
+        for box, color, width in outlines:
+            ellipse(box, outline=color, width=width)
+        return image
+    
+    def present(self, image):
+        """Push a finished frame to the canvas - Tk thread only"""
+        if self.photo is None or self.photo_size != image.size:
+            self.photo = self.photo_factory(image.copy())
+            self.photo_size = image.size
+            if self.item is None:
+                self.item = self.canvas.create_image(
+                    0, 0, anchor="nw", image=self.photo, tags=("orb_raster", "orb_bg")
+                )
+                self.canvas.tag_lower(self.item)
+            else:
+                self.canvas.itemconfigure(self.item, image=self.photo)
+        else:
+            self.photo.paste(image)
+        self.frames += 1
+    
+    def _worker(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._lock:
+                if self._closed:
+                    return
+                job, self._pending = self._pending, None
+                spare = self._spare.pop() if self._spare else None
+            if job is None:
+                continue
+            try:
+                image = self.rasterize(job[0], job[1], spare)
+            except Exception:
+                continue
+            with self._lock:
+                if self._ready is not None:
+                    self._spare.append(self._ready)
+                self._ready = image
+    
+    def destroy(self):
+        with self._lock:
+            self._closed = True
+        self._wake.set()
+        if self.item is not None:
+            self.canvas.delete("orb_raster")
+        self.item = None
+        self.photo = None
+        self.photo_size = None
+
+
+class FrameClock:
+    """One Tk timer that drives every periodic job in the app.
+    
+    Jobs register with their own interval and the clock sleeps until the
+    earliest one is due. When the main thread falls behind, overdue ticks
+    are merged into a single run instead of stacking callbacks. pause()
+    suspends every job except those registered with keep_alive=True.
+    """
+    
+    # Run jobs that are due within this margin to absorb Tk timer jitter
+    SLACK = 0.002
+    
+    def __init__(self, widget):
+        self.widget = widget
+        self.jobs = {}
+        self.running = False
+        self.paused = False
+        self._after_id = None
+        self._last_tick = None
+        self.tick_interval = 0.0  # seconds between the last two ticks
+        self.tick_cost = 0.0      # seconds spent running jobs in the last tick
+        self.skipped = 0          # ticks merged because a job fell behind
+    
+    def add(self, name, interval_ms, callback, keep_alive=False, run_now=False):
+        """Register (or replace) a periodic job"""
+        now = time.perf_counter()
+        interval = interval_ms / 1000
+        due = now if run_now else now + interval
+        # Share a phase with jobs of the same rate so they run in the same wakeup
+        for other in self.jobs.values():
+            if other['interval'] == interval and not run_now:
+                due = other['due']
+                break
+        self.jobs[name] = {
+            'interval': interval,
+            'callback': callback,
+            'keep_alive': keep_alive,
+            'due': due,
+            'cost': 0.0,
+            'errors': 0,
+        }
+        self._reschedule()
+    
+    def remove(self, name):
+        self.jobs.pop(name, None)
+    
+    def has(self, name):
+        return name in self.jobs
+    
+    def set_interval(self, name, interval_ms):
+        job = self.jobs.get(name)
+        if job is not None:
+            job['due'] += interval_ms / 1000 - job['interval']
+            job['interval'] = interval_ms / 1000
+            self._reschedule()
+    
+    def start(self):
+        self.running = True
+        self._reschedule()
+    
+    def stop(self):
+        self.running = False
+        self._cancel()
+    
+    def pause(self):
+        """Suspend all jobs except keep-alive ones (e.g. while hidden in the tray)"""
+        self.paused = True
+        self._last_tick = None
+        self._reschedule()
+    
+    def resume(self):
+        """Resume all jobs; anything overdue runs on the next tick, once"""
+        now = time.perf_counter()
+        self.paused = False
+        for job in self.jobs.values():
+            job['due'] = min(job['due'], now)
+        self._reschedule()
+    
+    def _active(self, job):
+        return not self.paused or job['keep_alive']
+    
+    def _cancel(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+    
+    def _reschedule(self):
+        self._cancel()
+        if not self.running:
+            return
+        due = [job['due'] for job in self.jobs.values() if self._active(job)]
+        if not due:
+            return
+        delay = max(1, int((min(due) - time.perf_counter()) * 1000))
+        self._after_id = self.widget.after(delay, self._tick)
+    
+    def _tick(self):
+        self._after_id = None
+        start = time.perf_counter()
+        if self._last_tick is not None:
+            self.tick_interval = start - self._last_tick
+        self._last_tick = start
+        
+        for name, job in list(self.jobs.items()):
+            if self.jobs.get(name) is not job or not self._active(job):
+                continue
+            if job['due'] > start + self.SLACK:
+                continue
+            began = time.perf_counter()
+            try:
+                job['callback']()
+            except Exception:
+                job['errors'] += 1
+            finished = time.perf_counter()
+            job['cost'] = finished - began
+            
+            # Keep the cadence, but merge any ticks missed while the main thread was busy
+            due = job['due'] + job['interval']
+            if due <= finished:
+                self.skipped += int((finished - due) / job['interval']) + 1
+                due = finished + job['interval']
+            job['due'] = due
+        
+        self.tick_cost = time.perf_counter() - start
+        self._reschedule()
+
+
+# Orb quality tiers, lowest first. 'auto' quality lets QualityGovernor move
+# between 'low' and 'high'; 'ultra' is only used when picked explicitly.
+QUALITY_TIERS = [
+    {'name': 'low', 'particles': 30, 'glow_layers': 3, 'connections': 0, 'effects': False, 'fps': 30},
+    {'name': 'medium', 'particles': 60, 'glow_layers': 5, 'connections': 60, 'effects': True, 'fps': 45},
+    {'name': 'high', 'particles': 80, 'glow_layers': 8, 'connections': 150, 'effects': True, 'fps': 60},
+    {'name': 'ultra', 'particles': 1000, 'glow_layers': 8, 'connections': 400, 'effects': True, 'fps': 60},
+]
+
+
+class QualityGovernor:
+    """Picks an orb quality tier from measured frame cost and frame lateness.
+    
+    Steps down after frames persistently exceed their budget (or arrive late
+    because the main thread is busy) and back up after a long stretch of
+    headroom. Every step down doubles the wait before the next step up so
+    the tier does not oscillate under steady load.
+    """
+    
+    def __init__(self, tier, min_tier=0, max_tier=2, budget_ratio=0.5, down_after=20, up_after=180):
+        self.tier = tier
+        self.min_tier = min_tier
+        self.max_tier = max_tier
+        self.budget_ratio = budget_ratio
+        self.down_after = down_after
+        self.base_up_after = up_after
+        self.up_after = up_after
+        self.avg_cost = 0.0
+        self.avg_late = 0.0
+        self.over = 0
+        self.under = 0
+    
+    def observe(self, cost, interval, target):
+        """Feed one frame (seconds); returns a new tier index when it should change"""
+        self.avg_cost += (cost - self.avg_cost) * 0.1
+        if interval is not None:
+            late = max(0.0, interval - target) / target
+            self.avg_late += (late - self.avg_late) * 0.1
+        
+        budget = target * self.budget_ratio
+        if self.avg_cost > budget or self.avg_late > 0.5:
+            self.over += 1
+            self.under = 0
+        elif self.avg_cost < budget * 0.4 and self.avg_late < 0.1:
+            self.under += 1
+            self.over = 0
+        else:
+            self.over = 0
+            self.under = 0
+        
+        if self.over >= self.down_after and self.tier > self.min_tier:
+            self.up_after = min(self.up_after * 2, self.base_up_after * 16)
+            return self._move(-1)
+        if self.under >= self.up_after and self.tier < self.max_tier:
+            return self._move(1)
+        return None
+    
+    def _move(self, step):
+        self.tier += step
+        self.over = 0
+        self.under = 0
+        # Start the new tier from a clean slate
+        self.avg_cost = 0.0
+        self.avg_late = 0.0
+        return self.tier
+
+
+class EffectPool:
+    """Fixed number of reusable effect slots (click bursts, shockwave rings).
+    
+    Slots are plain dicts allocated once and kept in a ring, oldest first.
+    spawn() fills the next free slot or, when all slots are live, recycles
+    the oldest effect, so click spam cannot grow the pool. Iterating yields
+    the live effects; retire() drops faded ones by swapping slots in place.
+    """
+    
+    def __init__(self, capacity, **defaults):
+        self.capacity = max(1, capacity)
+        self.slots = [dict(defaults) for _ in range(self.capacity)]
+        self.start = 0
+        self.count = 0
+        self.recycled = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        slots = self.slots
+        capacity = self.capacity
+        for k in range(self.count):
+            yield slots[(self.start + k) % capacity]
+    
+    def spawn(self, **values):
+        """Claim a slot for a new effect and return it"""
+        if self.count == self.capacity:
+            slot = self.slots[self.start]
+            self.start = (self.start + 1) % self.capacity
+            self.recycled += 1
+        else:
+            slot = self.slots[(self.start + self.count) % self.capacity]
+            self.count += 1
+        slot.update(values)
+        return slot
+    
+    def retire(self, expired):
+        """Drop effects for which expired(effect) is true, keeping the rest in order"""
+        slots = self.slots
+        capacity = self.capacity
+        kept = 0
+        for k in range(self.count):
+            i = (self.start + k) % capacity
+            if not expired(slots[i]):
+                j = (self.start + kept) % capacity
+                if i != j:
+                    slots[i], slots[j] = slots[j], slots[i]
+                kept += 1
+        self.count = kept
+    
+    def clear(self):
+        self.start = 0
+        self.count = 0
+
+
+class AnimatedOrb:
+    """Animated green/black orb background inspired by Ampcode"""
+    
+    RENDER_MODES = ('sprite', 'retained', 'immediate', 'raster')
+    
+    def __init__(self, canvas, colors, render_mode='sprite', clock=None, quality='auto', fps=60, palette=None,
+                 raster_thread=False, max_bursts=6):
+        self.canvas = canvas
+        self.colors = colors
+        self.palette = palette if palette is not None else Palette(colors)
+        self.width = 900
+        self.height = 650
+        
+        # Orb state
+        self.orb_x = self.width // 2
+        self.orb_y = self.height // 2
+        self.orb_target_x = self.orb_x
+        self.orb_target_y = self.orb_y
+        self.orb_radius = 120  # Larger orb
+        self.orb_pulse = 0
+        
+        # Mouse state
+        self.mouse_x = self.width // 2
+        self.mouse_y = self.height // 2
+        
+        # Particles - more for fuller effect
+        self.particles = None
+        self.num_particles = 80
+        
+        # Energy connections - neighbor grid rebuilt every step
+        self.connection_radius = 80
+        self.max_connections = 150
+        self.grid = SpatialGrid(self.connection_radius)
+        
+        # Click burst state - fixed slots, the oldest burst is recycled on overflow
+        self.bursts = EffectPool(max_bursts, x=0, y=0, radius=0, alpha=0.0)
+        
+        # Energy rings - four per burst
+        self.rings = EffectPool(max_bursts * 4, x=0, y=0, radius=0, alpha=0.0, speed=0)
+        
+        # Animation control - frames are driven by a shared FrameClock
+        self._running = False
+        self._last_frame = None
+        self._owns_clock = clock is None
+        self.clock = clock if clock is not None else FrameClock(canvas)
+        if self._owns_clock:
+            self.clock.start()
+        
+        # Quality tier - sets particle count, glow layers, connections, effects and fps
+        self.max_fps = fps
+        self.frame_ms = 16
+        self.glow_indices = list(range(8, 0, -1))
+        self.effects = True
+        self.quality = quality if quality == 'auto' or self.tier_index(quality) is not None else 'auto'
+        self.tier = self.tier_index('high') if self.quality == 'auto' else self.tier_index(quality)
+        self.governor = None
+        if self.quality == 'auto':
+            self.governor = QualityGovernor(self.tier, max_tier=self.tier_index('high'))
+        self.apply_tier(self.tier)
+        self.init_particles()
+        
+        # Rendering backend
+        self.renderer = None
+        self.raster_thread = raster_thread
+        self.set_render_mode(render_mode)
+        
+        # Bind mouse events
+        self.canvas.bind("<Motion>", self.on_mouse_move)
+        self.canvas.bind("<Button-1>", self.on_click)
+        self.canvas.bind("<Configure>", self.on_resize)
+        
+        # Start animation
+        self.start()
+    
+    def set_render_mode(self, mode):
+        """Switch between sprite, retained item pool, software raster and the original delete-and-recreate paths"""
+        if mode not in self.RENDER_MODES:
+            mode = 'sprite'
+        if mode in ('sprite', 'raster') and ImageTk is None:
+            mode = 'retained'
+        if self.renderer is not None:
+            self.renderer.destroy()
+        if mode == 'immediate':
+            self.renderer = ImmediateOrbRenderer(self.canvas, self.palette)
+        elif mode == 'raster':
+            self.renderer = RasterOrbRenderer(
+                self.canvas, self.palette, self.colors.get('bg', '#0c0c0c'), threaded=self.raster_thread
+            )
+        elif mode == 'sprite':
+            self.renderer = SpriteOrbRenderer(self.canvas, self.num_particles, self.palette)
+        else:
+            self.renderer = RetainedOrbRenderer(self.canvas, self.num_particles, self.palette)
+        self.render_mode = mode
+    
+    def set_palette(self, palette):
+        """Re-skin the orb with a new theme palette, effective from the next frame"""
+        self.palette = palette
+        self.renderer.set_palette(palette)
+    
+    @staticmethod
+    def tier_index(name):
+        for i, tier in enumerate(QUALITY_TIERS):
+            if tier['name'] == name:
+                return i
+        return None
+    
+    def apply_tier(self, index):
+        """Switch to QUALITY_TIERS[index], resizing particles and the frame rate in place"""
+        tier = QUALITY_TIERS[index]
+        self.tier = index
+        self.num_particles = tier['particles']
+        if self.particles is not None:
+            self.particles.resize(self.num_particles)
+        layers = tier['glow_layers']
+        # Keep the outermost layer and spread the rest evenly so the glow keeps its size
+        self.glow_indices = [8 - k * 8 // layers for k in range(layers)]
+        self.max_connections = tier['connections']
+        self.effects = tier['effects']
+        if not self.effects:
+            self.bursts.clear()
+            self.rings.clear()
+        self.frame_ms = max(1, int(1000 / min(tier['fps'], self.max_fps)))
+        if self._running:
+            self.clock.set_interval('orb', self.frame_ms)
+    
+    def init_particles(self):
+        """Initialize floating particles"""
+        self.particles = ParticleSystem(self.num_particles, self.width, self.height)
+    
+    def on_resize(self, event):
+        self.width = event.width
+        self.height = event.height
+    
+    def on_mouse_move(self, event):
+        self.mouse_x = event.x
+        self.mouse_y = event.y
+        self.orb_target_x = event.x
+        self.orb_target_y = event.y
+    
+    def on_click(self, event):
+        """Create burst effect on click"""
+        if not self.effects:
+            self.particles.scatter(event.x, event.y)
+            return
+        self.bursts.spawn(x=event.x, y=event.y, radius=0, alpha=1.0)
+        # Add shockwave rings
+        for i in range(4):
+            self.rings.spawn(x=event.x, y=event.y, radius=i * 10, alpha=1.0, speed=8 + i * 2)
+        # Scatter nearby particles
+        self.particles.scatter(event.x, event.y)
+    
+    def lerp(self, a, b, t):
+        return a + (b - a) * t
+    
+    def start(self):
+        """Start the animation loop"""
+        if self._running:
+            return
+        self._running = True
+        self._last_frame = None
+        self.clock.add('orb', self.frame_ms, self._animate_frame, run_now=True)
+    
+    def stop(self):
+        """Stop the animation loop"""
+        self._running = False
+        self.clock.remove('orb')
+    
+    def _animate_frame(self):
+        """Main animation frame - advance the simulation and render one frame"""
+        started = time.perf_counter()
+        self.step()
+        self.renderer.render(self)
+        if self.governor is not None:
+            self._govern(started, time.perf_counter() - started)
+    
+    def _govern(self, started, cost):
+        """Let the governor adjust the tier from this frame's cost and lateness"""
+        interval = None
+        if self._last_frame is not None and started - self._last_frame < 1.0:
+            interval = started - self._last_frame
+        self._last_frame = started
+        tier = self.governor.observe(cost, interval, self.frame_ms / 1000)
+        if tier is not None:
+            self.apply_tier(tier)
+    
+    def step(self):
+        """Advance orb, particles and effects by one frame"""
+        # Update orb position (smooth follow)
+        self.orb_x = self.lerp(self.orb_x, self.orb_target_x, 0.03)
+        self.orb_y = self.lerp(self.orb_y, self.orb_target_y, 0.03)
+        self.orb_pulse += 0.05
+        
+        # Update particles
+        self.particles.step(
+            self.orb_x, self.orb_y,
+            self.mouse_x, self.mouse_y,
+            self.width, self.height
+        )
+        if self.max_connections:
+            xs, ys = self.particles.columns('x', 'y')
+            self.grid.rebuild(xs, ys)
+        
+        # Update burst effects
+        for burst in self.bursts:
+            burst['radius'] += 12
+            burst['alpha'] -= 0.03
+        self.bursts.retire(self.faded)
+        
+        # Update shockwave rings
+        for ring in self.rings:
+            ring['radius'] += ring['speed']
+            ring['alpha'] -= 0.025
+        self.rings.retire(self.faded)
+    
+    @staticmethod
+    def faded(effect):
+        return effect['alpha'] <= 0
+    
+    def find_connections(self):
+        """Close particle pairs to join with energy lines: (x1, y1, x2, y2, dist)"""
+        if not self.max_connections:
+            return []
+        xs, ys = self.particles.columns('x', 'y')
+        return self.grid.pairs(xs, ys, self.connection_radius, self.max_connections)
+
+
+class OperationCancelled(Exception):
+    """Raised by blocking helpers when their CancelToken is cancelled"""
+
+
+class CancelToken:
+    """Cancellation flag for background work, usually tied to a popup's lifetime.
+    
+    cancel() kills every child process registered with track() and runs the
+    on_cancel() callbacks. bind(popup) cancels the token when the popup is
+    destroyed, so closing a window stops the work it started.
+    """
+    
+    def __init__(self):
+        self.cancelled = False
+        self._processes = set()
+        self._callbacks = []
+        self._lock = threading.Lock()
+    
+    def cancel(self):
+        with self._lock:
+            if self.cancelled:
+                return
+            self.cancelled = True
+            processes, self._processes = self._processes, set()
+            callbacks, self._callbacks = self._callbacks, []
+        for process in processes:
+            try:
+                process.kill()
+            except Exception:
+                pass
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+    
+    def on_cancel(self, callback):
+        """Run callback on cancel(), or right away if already cancelled"""
+        with self._lock:
+            if not self.cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+    
+    def remove_callback(self, callback):
+        """Forget a callback once the work it guards has finished"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+    
+    def track(self, process):
+        """Kill process if the token is cancelled while it runs"""
+        with self._lock:
+            if not self.cancelled:
+                self._processes.add(process)
+                return
+        try:
+            process.kill()
+        except Exception:
+            pass
+    
+    def untrack(self, process):
+        with self._lock:
+            self._processes.discard(process)
+    
+    def bind(self, widget):
+        """Cancel when widget is destroyed; returns the token"""
+        widget.bind("<Destroy>", lambda e: self.cancel() if e.widget is widget else None, add="+")
+        return self
+
+
+def run_process(args, timeout=None, token=None):
+    """subprocess.run(args, capture_output=True, text=True) whose child dies with token"""
+    process = subprocess.Popen(
+        args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        creationflags=SUBPROCESS_FLAGS
+    )
+    if token is not None:
+        token.track(process)
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        raise
+    finally:
+        if token is not None:
+            token.untrack(process)
+    if token is not None and token.cancelled:
+        raise OperationCancelled()
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+
+
+class StreamingCommand:
+    """Runs a command and hands its output over line by line as it arrives.
+    
+    stdout is read on the thread that calls run() and stderr on a helper
+    thread, so output shows up while the command is still working instead
+    of after it exits. drain() returns the (text, is_error) lines gathered
+    since the last call; at most max_pending wait in between and older
+    ones are counted as dropped rather than held. The last tail_lines are
+    kept for the summary, and spill_path, when set, receives everything.
+    abandon() finishes a command whose run() never got to start.
+    """
+    
+    def __init__(self, args, timeout=None, token=None, tail_lines=50,
+                 max_pending=2000, spill_path=None):
+        self.args = args
+        self.timeout = timeout
+        self.token = token
+        self.max_pending = max_pending
+        self.spill_path = spill_path
+        self.tail = deque(maxlen=tail_lines)
+        self.pending = deque()
+        self.dropped = 0
+        self.lines = 0
+        self.returncode = None
+        self.timed_out = False
+        self.error = None
+        self.done = threading.Event()
+        self._started = False
+        self._spill = None
+        self._lock = threading.Lock()
+    
+    @property
+    def finished(self):
+        return self.done.is_set()
+    
+    @property
+    def cancelled(self):
+        return self.token is not None and self.token.cancelled
+    
+    def run(self):
+        """Start the command and block until it exits and its pipes are drained"""
+        with self._lock:
+            if self.done.is_set():
+                return
+            self._started = True
+        try:
+            if self.spill_path:
+                self._spill = open(self.spill_path, 'w', encoding='utf-8', errors='replace')
+            process = subprocess.Popen(
+                self.args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                text=True, errors='replace', bufsize=1, creationflags=SUBPROCESS_FLAGS
+            )
+        except Exception as e:
+            self.error = e
+            self._close_spill()
+            self.done.set()
+            return
+        if self.token is not None:
+            self.token.track(process)
+        timer = None
+        if self.timeout is not None:
+            timer = threading.Timer(self.timeout, self._expire, args=(process,))
+            timer.daemon = True
+            timer.start()
+        errors = threading.Thread(target=self._read, args=(process.stderr, True), daemon=True)
+        errors.start()
+        try:
+            self._read(process.stdout, False)
+            process.wait()
+            errors.join()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if self.token is not None:
+                self.token.untrack(process)
+            self._close_spill()
+            self.returncode = process.returncode
+            self.done.set()
+    
+    def abandon(self):
+        """Mark a command that will never run as finished, e.g. when its job was skipped"""
+        with self._lock:
+            if not self._started:
+                self.done.set()
+    
+    def _expire(self, process):
+        self.timed_out = True
+        try:
+            process.kill()
+        except Exception:
+            pass
+    
+    def _read(self, pipe, is_error):
+        try:
+            for text in pipe:
+                text = text.rstrip('\r\n')
+                with self._lock:
+                    self.lines += 1
+                    self.tail.append((text, is_error))
+                    if len(self.pending) >= self.max_pending:
+                        self.pending.popleft()
+                        self.dropped += 1
+                    self.pending.append((text, is_error))
+                    if self._spill is not None:
+                        self._spill.write(('! ' if is_error else '') + text + '\n')
+        except Exception:
+            pass
+        finally:
+            pipe.close()
+    
+    def _close_spill(self):
+        with self._lock:
+            if self._spill is not None:
+                try:
+                    self._spill.close()
+                except Exception:
+                    pass
+                self._spill = None
+    
+    def drain(self):
+        """Return (lines, dropped) collected since the previous drain"""
+        with self._lock:
+            lines = list(self.pending)
+            self.pending.clear()
+            dropped, self.dropped = self.dropped, 0
+        return lines, dropped
+
+
+class WorkerPool:
+    """Fixed set of worker threads shared by every background operation.
+    
+    Jobs run in priority order - USER actions ahead of PERIODIC sampling,
+    first come first served within a lane. A job submitted with a key is
+    dropped while another job with that key is queued or running, so a
+    slow periodic sample never has a second run stacked behind it. Jobs
+    whose token was cancelled before they started are skipped, and
+    shutdown() cancels the tokens of running jobs.
+    """
+    
+    USER = 0
+    PERIODIC = 10
+    
+    def __init__(self, workers=4):
+        self.queue = queue.PriorityQueue()
+        self.workers = workers
+        self.keys = set()
+        self.running = set()  # tokens of jobs currently executing
+        self.dropped = 0
+        self._next = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"worker-{i}", daemon=True).start()
+    
+    def submit(self, fn, *args, priority=USER, key=None, token=None):
+        """Queue fn(*args); returns False if dropped by backpressure or after shutdown"""
+        with self._lock:
+            if self._closed:
+                return False
+            if key is not None:
+                if key in self.keys:
+                    self.dropped += 1
+                    return False
+                self.keys.add(key)
+            self._next += 1
+            self.queue.put((priority, self._next, fn, args, key, token))
+        return True
+    
+    def _work(self):
+        while True:
+            _, _, fn, args, key, token = self.queue.get()
+            if fn is None:
+                return
+            if token is not None:
+                with self._lock:
+                    self.running.add(token)
+            try:
+                if token is None or not token.cancelled:
+                    fn(*args)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self.keys.discard(key)
+                    self.running.discard(token)
+    
+    def shutdown(self):
+        """Stop accepting work, cancel running jobs and let the workers exit"""
+        with self._lock:
+            self._closed = True
+            tokens = list(self.running)
+            for _ in range(self.workers):
+                self._next += 1
+                self.queue.put((sys.maxsize, self._next, None, (), None, None))
+        for token in tokens:
+            token.cancel()
+
+
+# Long-lived PowerShell loop behind ShellHost: one JSON request per stdin line,
+# one JSON response per stdout line. Scripts run in a child scope so their
+# variables do not leak into the next request.
+POWERSHELL_WORKER = r'''
+$utf8 = New-Object System.Text.UTF8Encoding $false
+[Console]::InputEncoding = $utf8
+[Console]::OutputEncoding = $utf8
+$reader = [Console]::In
+$writer = [Console]::Out
+while ($true) {
+    $line = $reader.ReadLine()
+    if ($line -eq $null) { break }
+    if (-not $line.Trim()) { continue }
+    $id = $null
+    $out = New-Object System.Text.StringBuilder
+    $err = New-Object System.Text.StringBuilder
+    $code = 0
+    try {
+        $request = $line | ConvertFrom-Json
+        $id = $request.id
+        $block = [ScriptBlock]::Create($request.script)
+        foreach ($item in (& $block *>&1)) {
+            if ($item -is [System.Management.Automation.ErrorRecord]) {
+                [void]$err.AppendLine($item.ToString())
+                $code = 1
+            } else {
+                [void]$out.AppendLine(($item | Out-String -Width 4096).TrimEnd())
+            }
+        }
+    } catch {
+        [void]$err.AppendLine($_.ToString())
+        $code = 1
+    }
+    $response = @{ 'id' = $id; 'stdout' = $out.ToString(); 'stderr' = $err.ToString(); 'returncode' = $code }
+    $writer.WriteLine(($response | ConvertTo-Json -Compress))
+    $writer.Flush()
+}
+'''
+
+POWERSHELL_WORKER_COMMAND = [
+    "powershell", "-NoLogo", "-NoProfile", "-WindowStyle", "Hidden", "-Command", POWERSHELL_WORKER
+]
+
+# Stand-in worker speaking the same protocol with Python snippets instead of
+# PowerShell, so ShellHost can be exercised on any platform
+PYTHON_WORKER = r'''
+import contextlib, io, json, sys, traceback
+for line in sys.stdin:
+    if not line.strip():
+        continue
+    request = json.loads(line)
+    out, err = io.StringIO(), io.StringIO()
+    code = 0
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            exec(request["script"], {"__name__": "__worker__"})
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except Exception:
+        err.write(traceback.format_exc())
+        code = 1
+    response = {"id": request["id"], "stdout": out.getvalue(), "stderr": err.getvalue(), "returncode": code}
+    sys.stdout.write(json.dumps(response) + "\n")
+    sys.stdout.flush()
+'''
+
+PYTHON_WORKER_COMMAND = [sys.executable, "-u", "-c", PYTHON_WORKER]
+
+
+class ShellHost:
+    """One long-lived shell process that runs scripts sent as framed JSON requests.
+    
+    Each request is a single line {"id", "script"} on the worker's stdin and
+    each answer a single line {"id", "stdout", "stderr", "returncode"} on its
+    stdout, so concurrent callers are matched to their responses by id. The
+    worker is started on first use and restarted after it exits. The worker
+    runs requests one at a time in the order they were written, so only the
+    request at the head of that order is actually running: if it overruns
+    its timeout the worker is killed, since a stuck script would otherwise
+    block everything behind it, while a request that times out still queued
+    is just dropped and its answer ignored. A cancelled request kills the
+    worker once it is running, or straight away if it already is, so its
+    script stops instead of finishing unseen. Requests queued behind a
+    killed worker had not started and are sent again to its replacement.
+    
+    run() returns a subprocess.CompletedProcess and raises
+    subprocess.TimeoutExpired, so it drops in for subprocess.run().
+    """
+    
+    def __init__(self, command, name="shell"):
+        self.command = command
+        self.name = name
+        self.process = None
+        self.pending = {}  # request id -> {'done', 'response', 'process'}
+        self.order = deque()  # ids written to the current worker and not yet answered
+        self.cancelled = set()  # ids in order whose caller has given up
+        self.started = False
+        self.restarts = 0
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def start(self):
+        """Start the worker ahead of the first request"""
+        with self._lock:
+            return self._ensure()
+    
+    def _ensure(self):
+        if self.process is not None and self.process.poll() is None:
+            return self.process
+        if self.started:
+            self.restarts += 1
+        self.started = True
+        self.order = deque()
+        self.cancelled = set()
+        self.process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding='utf-8', errors='replace', bufsize=1,
+            creationflags=SUBPROCESS_FLAGS
+        )
+        threading.Thread(target=self._read, args=(self.process,), daemon=True).start()
+        return self.process
+    
+    def run(self, script, timeout=30, token=None):
+        """Run script in the worker, like subprocess.run(..., capture_output=True, text=True).
+        
+        Cancelling token raises OperationCancelled and stops the script by
+        killing the worker when it gets to run; the next request starts a
+        fresh one.
+        """
+        if token is not None and token.cancelled:
+            raise OperationCancelled()
+        entry = {'done': threading.Event(), 'response': None, 'process': None, 'requeue': False}
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} host is closed")
+            request_id = self._next_id
+            self._next_id += 1
+            line = json.dumps({'id': request_id, 'script': script}) + "\n"
+            self.pending[request_id] = entry
+            self._send(request_id, line, entry)
+        
+        cancel = lambda: self._cancel(request_id, entry)
+        if token is not None:
+            token.on_cancel(cancel)
+        try:
+            while True:
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                finished = entry['done'].wait(remaining)
+                if not finished or entry['response'] is not None or not entry['requeue']:
+                    break
+                with self._lock:
+                    # Checked under the lock, which _cancel() takes before it wakes us
+                    if token is not None and token.cancelled:
+                        break
+                    if self._closed:
+                        raise RuntimeError(f"{self.name} host is closed")
+                    entry['done'].clear()
+                    entry['requeue'] = False
+                    self.pending[request_id] = entry
+                    self._send(request_id, line, entry)
+        finally:
+            # Long-lived tokens such as the monitor's would otherwise collect one per request
+            if token is not None:
+                token.remove_callback(cancel)
+        if not finished:
+            with self._lock:
+                self.pending.pop(request_id, None)
+                process = entry['process']
+                running = self.process is process and self.order and self.order[0] == request_id
+                if running:
+                    self._kill(process)
+            raise subprocess.TimeoutExpired(self.command[0], timeout)
+        
+        response = entry['response']
+        if response is None:
+            with self._lock:
+                self.pending.pop(request_id, None)
+            raise OperationCancelled()
+        return subprocess.CompletedProcess(
+            self.command[0], response.get('returncode', 1),
+            response.get('stdout') or "", response.get('stderr') or ""
+        )
+    
+    def _send(self, request_id, line, entry):
+        """Write a request to the worker; called with the lock held"""
+        # One retry covers a worker that died since the last request
+        for attempt in range(2):
+            process = self._ensure()
+            entry['process'] = process
+            try:
+                process.stdin.write(line)
+                process.stdin.flush()
+                self.order.append(request_id)
+                return
+            except OSError:
+                self._kill(process)
+                if attempt:
+                    self.pending.pop(request_id, None)
+                    raise
+    
+    def _cancel(self, request_id, entry):
+        """Give up on a request, killing the worker if its script is running"""
+        with self._lock:
+            self.pending.pop(request_id, None)
+            process = entry['process']
+            if self.process is process and request_id in self.order:
+                if self.order[0] == request_id:
+                    self._kill(process)
+                else:
+                    # _read() kills the worker when the request reaches the head
+                    self.cancelled.add(request_id)
+        entry['done'].set()
+    
+    def _read(self, process):
+        """Hand each response line to the request waiting for its id"""
+        try:
+            for line in process.stdout:
+                try:
+                    response = json.loads(line.lstrip('\ufeff'))
+                except ValueError:
+                    continue
+                with self._lock:
+                    entry = self.pending.pop(response.get('id'), None)
+                    # Answers come back in request order; dropped requests still ran
+                    if self.process is process and response.get('id') in self.order:
+                        while self.order.popleft() != response.get('id'):
+                            pass
+                        if self.order and self.order[0] in self.cancelled:
+                            self._kill(process)
+                if entry is not None:
+                    entry['response'] = response
+                    entry['done'].set()
+        except Exception:
+            pass
+        
+        # Worker is gone - fail the requests that were sent to it
+        with self._lock:
+            if self.process is process:
+                self.process = None
+            lost = [rid for rid, entry in self.pending.items() if entry['process'] is process]
+            entries = [self.pending.pop(rid) for rid in lost]
+        for entry in entries:
+            if not entry['requeue']:
+                entry['response'] = {'returncode': -1, 'stdout': "", 'stderr': f"{self.name} worker exited"}
+            entry['done'].set()
+    
+    def _kill(self, process):
+        """Kill a worker; called with the lock held"""
+        if self.process is process:
+            self.process = None
+            # Everything behind the running request is still unread on stdin
+            for request_id in islice(self.order, 1, None):
+                entry = self.pending.get(request_id)
+                if entry is not None:
+                    entry['requeue'] = True
+        try:
+            process.kill()
+        except Exception:
+            pass
+    
+    def close(self):
+        with self._lock:
+            self._closed = True
+            if self.process is not None:
+                self._kill(self.process)
+
+
+class ScanCache:
+    """Single-flight, TTL-cached background scans.
+    
+    request() runs scan() on a worker thread, unless an identical scan is
+    already in flight, in which case the caller joins it instead of
+    starting another. Results are kept for ttl seconds: a fresh result is
+    delivered straight away, and a stale one is delivered straight away too
+    while a refresh runs in the background for the next request. Scans run
+    on the shared WorkerPool when one is given, background refreshes in the
+    PERIODIC lane. Callbacks are handed to dispatch (root.after) so they run
+    on the Tk thread, and a
+    callback that is already waiting on a scan is not queued twice, so
+    repeated key presses open one popup. A caller whose token has been
+    cancelled by the time the result arrives is skipped.
+    
+    scan(token) gets a CancelToken of its own, cancelled once every caller
+    waiting on the scan has cancelled theirs, to pass on to ShellHost.run()
+    and run_process(). A request never joins a scan cancelled that way.
+    
+    Dict records in a list result are copied before they are cached, so a
+    later ProcessTable refresh cannot change them underneath a popup.
+    invalidate() bumps the key's generation: a scan that was already
+    running still answers its own callers but is not cached.
+    """
+    
+    def __init__(self, dispatch, pool=None):
+        self.dispatch = dispatch
+        self.pool = pool
+        self.results = {}  # key -> (value, monotonic time it finished)
+        self.inflight = {}  # key -> [(on_done, on_error), ...]
+        self.watches = {}  # key -> {'token', 'live'} of the scan in inflight
+        self.generations = {}  # key -> count of invalidate() calls
+        self.hits = 0
+        self.joins = 0
+        self.scans = 0
+        self._lock = threading.Lock()
+    
+    def request(self, key, scan, on_done, on_error=None, ttl=30, token=None):
+        """Deliver the result of scan() for key.
+        
+        Returns 'cached', 'stale', 'joined', 'started' or 'refused'; on
+        'refused' the pool would not take the scan and on_error gets a
+        RuntimeError instead.
+        """
+        if token is not None:
+            on_done = self._guard(on_done, token)
+            on_error = self._guard(on_error, token)
+        watch = None
+        with self._lock:
+            cached = self.results.get(key)
+            if cached is not None:
+                self.hits += 1
+                stale = time.monotonic() - cached[1] > ttl
+                if stale and key not in self.inflight:
+                    self._start(key, scan, [])
+                state = 'stale' if stale else 'cached'
+            elif key in self.inflight and not self.watches[key]['token'].cancelled:
+                self.joins += 1
+                waiters = self.inflight[key]
+                # A callback already waiting is replaced, not queued twice, since
+                # the earlier request's token may have been cancelled since
+                callback = getattr(on_done, 'callback', on_done)
+                waiters[:] = [w for w in waiters if getattr(w[0], 'callback', w[0]) != callback]
+                waiters.append((on_done, on_error))
+                watch, state = self.watches[key], 'joined'
+            elif self._start(key, scan, [(on_done, on_error)]):
+                watch, state = self.watches[key], 'started'
+            if watch is not None:
+                watch['live'] += 1
+        if watch is not None:
+            # Outside the lock: an already-cancelled token runs _leave() right away
+            if token is not None:
+                token.on_cancel(lambda: self._leave(watch))
+            return state
+        if cached is None:
+            # Only reached when the pool refused a new scan
+            if on_error is not None:
+                error = RuntimeError("background workers are busy or shut down")
+                self.dispatch(lambda: on_error(error))
+            return 'refused'
+        value = cached[0]
+        self.dispatch(lambda: on_done(value))
+        return state
+    
+    @staticmethod
+    def _guard(callback, token):
+        if callback is None:
+            return None
+        
+        def guarded(*args):
+            if not token.cancelled:
+                callback(*args)
+        # Keeps the duplicate-waiter check working for wrapped callbacks
+        guarded.callback = callback
+        return guarded
+    
+    def invalidate(self, key):
+        """Forget a cached result, e.g. after an action that changes what the scan reports"""
+        with self._lock:
+            self.results.pop(key, None)
+            self.generations[key] = self.generations.get(key, 0) + 1
+            # Requests from now on start a fresh scan instead of joining the old one
+            self.inflight.pop(key, None)
+            self.watches.pop(key, None)
+    
+    def _leave(self, watch):
+        # A caller without a token is never taken off, so it keeps the scan alive
+        with self._lock:
+            watch['live'] -= 1
+            abandoned = watch['live'] == 0
+        if abandoned:
+            watch['token'].cancel()
+    
+    def _start(self, key, scan, waiters):
+        # Called with the lock held; False if the pool refused the scan
+        self.scans += 1
+        token = CancelToken()
+        self.inflight[key] = waiters
+        self.watches[key] = {'token': token, 'live': 0}
+        generation = self.generations.get(key, 0)
+        if self.pool is None:
+            threading.Thread(target=self._run, args=(key, scan, waiters, generation, token), daemon=True).start()
+            return True
+        priority = WorkerPool.USER if waiters else WorkerPool.PERIODIC
+        if not self.pool.submit(self._run, key, scan, waiters, generation, token, priority=priority):
+            del self.inflight[key]
+            del self.watches[key]
+            return False
+        return True
+    
+    def _finish(self, key, waiters):
+        # Called with the lock held
+        if self.inflight.get(key) is waiters:
+            del self.inflight[key]
+            del self.watches[key]
+    
+    def _run(self, key, scan, waiters, generation, token):
+        try:
+            if token.cancelled:
+                raise OperationCancelled()
+            value = scan(token)
+            if isinstance(value, list):
+                value = [dict(item) if isinstance(item, dict) else item for item in value]
+        except Exception as e:
+            with self._lock:
+                self._finish(key, waiters)
+            for _, on_error in waiters:
+                if on_error is not None:
+                    self.dispatch(lambda on_error=on_error, e=e: on_error(e))
+            return
+        with self._lock:
+            if self.generations.get(key, 0) == generation:
+                self.results[key] = (value, time.monotonic())
+            self._finish(key, waiters)
+        for on_done, _ in waiters:
+            self.dispatch(lambda on_done=on_done: on_done(value))
+
+
+class ProcProcessSource:
+    """Linux process scan: /proc/[pid]/stat, plus /proc/[pid]/io when read_io is set"""
+    
+    def __init__(self, proc_root="/proc", read_io=True):
+        self.proc_root = proc_root
+        self.read_io = read_io
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+    
+    @staticmethod
+    def available(proc_root="/proc"):
+        return os.path.exists(os.path.join(proc_root, "stat"))
+    
+    def scan(self, known):
+        """Yield ((pid, start), name, cpu seconds, rss bytes, io bytes, window title) per process"""
+        for entry in os.listdir(self.proc_root):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.proc_root, entry, "stat")) as f:
+                    stat = f.read()
+            except OSError:
+                continue  # exited while we were listing
+            # comm is in parentheses and may itself contain spaces or ')'
+            close = stat.rfind(')')
+            fields = stat[close + 2:].split()
+            key = (int(entry), int(fields[19]))
+            record = known.get(key)
+            name = record['Name'] if record is not None else stat[stat.find('(') + 1:close]
+            cpu = (int(fields[11]) + int(fields[12])) / self.clock_ticks
+            io = self.read_io_bytes(entry) if self.read_io else 0
+            yield key, name, cpu, int(fields[21]) * self.page_size, io, ""
+    
+    def read_io_bytes(self, pid):
+        """Bytes read plus written (rchar + wchar); 0 for processes we may not inspect"""
+        try:
+            with open(os.path.join(self.proc_root, pid, "io")) as f:
+                total = 0
+                for line in f:
+                    if line.startswith(('rchar', 'wchar')):
+                        total += int(line.split()[1])
+                return total
+        except (OSError, ValueError, IndexError):
+            return 0
+
+
+class PowerShellProcessSource:
+    """Windows process scan: one Get-Process pass in the persistent PowerShell worker"""
+    
+    SCRIPT = '''
+$io = @{}
+Get-CimInstance Win32_Process -Property ProcessId, ReadTransferCount, WriteTransferCount | ForEach-Object {
+    $io[[int]$_.ProcessId] = $_.ReadTransferCount + $_.WriteTransferCount
+}
+Get-Process | ForEach-Object {
+    $start = if ($_.StartTime) { $_.StartTime.Ticks } else { 0 }
+    $cpu = if ($_.CPU) { $_.CPU } else { 0 }
+    $bytes = if ($io.ContainsKey($_.Id)) { $io[$_.Id] } else { 0 }
+    "$($_.Id)`t$start`t$cpu`t$($_.WorkingSet64)`t$bytes`t$($_.ProcessName)`t$($_.MainWindowTitle)"
+}
+'''
+    
+    def __init__(self, shell, timeout=30):
+        self.shell = shell
+        self.timeout = timeout
+    
+    def scan(self, known):
+        result = self.shell.run(self.SCRIPT, timeout=self.timeout)
+        return self.parse(result.stdout.splitlines())
+    
+    @staticmethod
+    def parse(lines):
+        """Rows from SCRIPT's output lines, skipping any that are not process rows"""
+        for line in lines:
+            parts = line.split('\t', 6)
+            if len(parts) < 7:
+                continue
+            try:
+                key = (int(parts[0]), int(parts[1]))
+                cpu = float(parts[2])
+                rss = int(parts[3])
+                io = int(parts[4])
+            except ValueError:
+                continue
+            yield key, parts[5], cpu, rss, io, parts[6]
+
+
+class ProcessTable:
+    """Process list shared by the System Monitor, Process Killer and Suspend Task.
+    
+    Records are keyed by (pid, start time), so a recycled PID is never taken
+    for the process that used to own it. A refresh diffs the new scan against
+    the previous one: known processes keep their record and only get their
+    counters updated, new ones are added and vanished ones dropped.
+    
+    Records are dicts with PID, Start, Name, CPU (seconds), Mem (MB), IO
+    (bytes) and Title, the same keys the PowerShell scans used to return,
+    plus rates over the interval since the previous refresh: CPUPercent
+    (100 = one core busy), MemGrowth (MB/s) and IORate (KB/s). top() ranks
+    on any of SORT_KEYS with a heap, so only the K winners are ordered.
+    """
+    
+    SORT_KEYS = {
+        'cpu': 'CPUPercent',
+        'rss': 'Mem',
+        'io': 'IORate',
+        'growth': 'MemGrowth',
+    }
+    
+    def __init__(self, source, max_age=5.0, warmup=0.5):
+        self.source = source
+        self.max_age = max_age
+        self.warmup = warmup  # gap between the two scans of a cold table
+        self.records = {}
+        self.updated = None
+        self._lock = threading.Lock()
+    
+    def refresh(self, rows=None):
+        """Rescan now and return the records; rows stands in for a scan the caller already ran"""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.updated if self.updated is not None else 0
+            previous = self.records
+            records = {}
+            if rows is None:
+                rows = self.source.scan(previous)
+            for key, name, cpu, rss, io, title in rows:
+                mem = rss / 1024 ** 2
+                record = previous.get(key)
+                if record is None:
+                    record = {
+                        'PID': key[0], 'Start': key[1], 'Name': name,
+                        'CPUPercent': 0.0, 'MemGrowth': 0.0, 'IORate': 0.0,
+                    }
+                elif elapsed > 0:
+                    record['CPUPercent'] = round(max(0.0, cpu - record['_cpu']) * 100 / elapsed, 1)
+                    record['MemGrowth'] = round((mem - record['_mem']) / elapsed, 2)
+                    record['IORate'] = round(max(0, io - record['IO']) / 1024 / elapsed, 1)
+                record['_cpu'] = cpu
+                record['_mem'] = mem
+                record['CPU'] = round(cpu, 1)
+                record['Mem'] = round(mem, 1)
+                record['IO'] = io
+                record['Title'] = title
+                records[key] = record
+            self.records = records
+            self.updated = now
+            return list(records.values())
+    
+    def snapshot(self, max_age=None):
+        """The records, rescanning only when the last refresh is older than max_age seconds.
+        
+        A cold table is scanned twice, warmup seconds apart, so the rates are
+        filled in. Call from a worker thread.
+        """
+        if max_age is None:
+            max_age = self.max_age
+        with self._lock:
+            updated = self.updated
+            if updated is not None and time.monotonic() - updated <= max_age:
+                return list(self.records.values())
+        if updated is None:
+            self.refresh()
+            time.sleep(self.warmup)
+        return self.refresh()
+    
+    def forget(self, pid):
+        """Drop a process known to be gone, e.g. just killed, without waiting for a rescan"""
+        with self._lock:
+            self.records = {key: record for key, record in self.records.items() if key[0] != pid}
+    
+    def top(self, count, sort='cpu', where=None, records=None):
+        """The count highest records by SORT_KEYS[sort].
+        
+        heapq.nlargest keeps a heap of count entries, so ranking is O(n log k)
+        rather than sorting every process. where filters records first;
+        records defaults to the current table contents.
+        """
+        field = self.SORT_KEYS.get(sort, 'CPUPercent')
+        if records is None:
+            records = list(self.records.values())
+        if where is not None:
+            records = (r for r in records if where(r))
+        return heapq.nlargest(count, records, key=itemgetter(field))
+
+
+def create_process_source(shell):
+    """Native /proc scanning where available, otherwise Get-Process in the PowerShell worker"""
+    if sys.platform.startswith('linux') and ProcProcessSource.available():
+        return ProcProcessSource()
+    return PowerShellProcessSource(shell)
+
+
+class MetricHistory:
+    """Fixed-size ring buffer of (time, value) samples backed by array('d').
+    
+    Once full, each append overwrites the oldest sample, so a metric costs
+    16 bytes per slot however long the monitor runs and no per-sample
+    objects are kept.
+    """
+    
+    def __init__(self, capacity):
+        self.capacity = max(2, capacity)
+        self.times = array('d', bytes(8 * self.capacity))
+        self.values = array('d', bytes(8 * self.capacity))
+        self.head = 0  # next slot to write
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def append(self, value, when=None):
+        self.times[self.head] = time.monotonic() if when is None else when
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+    
+    def series(self):
+        """(times, values) arrays, oldest sample first"""
+        start = (self.head - self.count) % self.capacity
+        end = start + self.count
+        if end <= self.capacity:
+            return self.times[start:end], self.values[start:end]
+        return self.times[start:] + self.times[:self.head], self.values[start:] + self.values[:self.head]
+    
+    def peak(self):
+        return max(self.series()[1]) if self.count else 0.0
+
+
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets downsampling of a series to threshold points.
+    
+    Keeps the first and last points and, from each bucket in between, the
+    point forming the largest triangle with the previously kept point and
+    the next bucket's average, so short spikes survive where plain
+    decimation would drop them. Returns (xs, ys) lists.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(xs), list(ys)
+    
+    out_x = [xs[0]]
+    out_y = [ys[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_count = avg_end - avg_start
+        avg_x = sum(xs[avg_start:avg_end]) / avg_count
+        avg_y = sum(ys[avg_start:avg_end]) / avg_count
+        
+        ax, ay = xs[a], ys[a]
+        best_area = -1.0
+        best = start = int(i * every) + 1
+        for j in range(start, int((i + 1) * every) + 1):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        out_x.append(xs[best])
+        out_y.append(ys[best])
+        a = best
+    
+    out_x.append(xs[-1])
+    out_y.append(ys[-1])
+    return out_x, out_y
+
+
+class SystemMetricsProvider(ABC):
+    """Source of System Monitor samples.
+    
+    sample() returns a dict shaped like the monitor's original PowerShell
+    output: CPU, RAM and Disk percentages, RAMUsed/RAMTotal in GB and Procs,
+    the top processes by the sort key as {PID, Name, CPU (%), Mem (MB),
+    IO (KB/s)}. The process list comes from the shared ProcessTable, which
+    each sample refreshes.
+    """
+    
+    name = "none"
+    
+    def __init__(self, table, top=8):
+        self.table = table
+        self.top = top
+        self.sort = 'cpu'  # any of ProcessTable.SORT_KEYS
+    
+    @abstractmethod
+    def sample(self, token=None):
+        """One monitor sample; token cancels a scan that is still running"""
+    
+    def top_processes(self, records=None):
+        if records is None:
+            records = self.table.refresh()
+        procs = self.table.top(self.top, self.sort, records=records)
+        return [
+            {'PID': p['PID'], 'Name': p['Name'], 'CPU': p['CPUPercent'], 'Mem': p['Mem'], 'IO': p['IORate']}
+            for p in procs
+        ]
+
+
+class PowerShellMetricsProvider(SystemMetricsProvider):
+    """Windows backend: CIM queries run in the persistent PowerShell worker.
+    
+    When the table scans with PowerShellProcessSource, its script is sent in
+    the same request, so each sample costs one round trip and the JSON line
+    comes back ahead of the process rows.
+    """
+    
+    name = "powershell"
+    
+    SCRIPT = '''
+$cpu = (Get-CimInstance Win32_Processor | Measure-Object -Property LoadPercentage -Average).Average
+$os = Get-CimInstance Win32_OperatingSystem
+$ramUsed = [math]::Round((($os.TotalVisibleMemorySize - $os.FreePhysicalMemory) / $os.TotalVisibleMemorySize) * 100, 1)
+$ramTotal = [math]::Round($os.TotalVisibleMemorySize / 1MB, 1)
+$ramUsedGB = [math]::Round(($os.TotalVisibleMemorySize - $os.FreePhysicalMemory) / 1MB, 1)
+
+$disk = Get-CimInstance Win32_LogicalDisk -Filter "DeviceID='C:'"
+$diskUsed = [math]::Round((($disk.Size - $disk.FreeSpace) / $disk.Size) * 100, 1)
+
+@{
+    "CPU" = $cpu
+    "RAM" = $ramUsed
+    "RAMUsed" = $ramUsedGB
+    "RAMTotal" = $ramTotal
+    "Disk" = $diskUsed
+} | ConvertTo-Json -Compress
+'''
+    
+    def __init__(self, table, shell, timeout=10, top=8):
+        super().__init__(table, top)
+        self.shell = shell
+        self.timeout = timeout
+    
+    def sample(self, token=None):
+        source = self.table.source
+        if not isinstance(source, PowerShellProcessSource):
+            result = self.shell.run(self.SCRIPT, timeout=self.timeout, token=token)
+            if not result.stdout.strip():
+                return None
+            data = json.loads(result.stdout)
+            data['Procs'] = self.top_processes()
+            return data
+        
+        result = self.shell.run(self.SCRIPT + source.SCRIPT, timeout=self.timeout + source.timeout, token=token)
+        lines = result.stdout.splitlines()
+        head = next((i for i, line in enumerate(lines) if line.startswith('{')), None)
+        if head is None:
+            return None
+        data = json.loads(lines[head])
+        records = self.table.refresh(rows=source.parse(lines[head + 1:]))
+        data['Procs'] = self.top_processes(records)
+        return data
+
+
+class ProcMetricsProvider(SystemMetricsProvider):
+    """Linux backend reading /proc and statvfs directly - no subprocess at all.
+    
+    CPU percentages come from tick deltas between consecutive samples, so the
+    first sample reports 0% until there is a previous one to compare with.
+    """
+    
+    name = "proc"
+    
+    def __init__(self, table, proc_root="/proc", disk_path="/", top=8):
+        super().__init__(table, top)
+        self.proc_root = proc_root
+        self.disk_path = disk_path
+        self.last_cpu = None  # (busy, total) jiffies
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def available(proc_root="/proc"):
+        return os.path.exists(os.path.join(proc_root, "stat"))
+    
+    def sample(self, token=None):
+        with self._lock:
+            ram, ram_used, ram_total = self.read_memory()
+            return {
+                'CPU': self.read_cpu(),
+                'RAM': ram,
+                'RAMUsed': ram_used,
+                'RAMTotal': ram_total,
+                'Disk': self.read_disk(),
+                'Procs': self.top_processes(),
+            }
+    
+    def read_cpu(self):
+        with open(os.path.join(self.proc_root, "stat")) as f:
+            fields = f.readline().split()[1:9]
+        ticks = [int(v) for v in fields]
+        idle = ticks[3] + ticks[4]  # idle + iowait
+        total = sum(ticks)
+        busy = total - idle
+        last, self.last_cpu = self.last_cpu, (busy, total)
+        if last is None or total <= last[1]:
+            return 0.0
+        return round((busy - last[0]) * 100 / (total - last[1]), 1)
+    
+    def read_memory(self):
+        info = {}
+        with open(os.path.join(self.proc_root, "meminfo")) as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                info[key] = int(value.split()[0])
+        total = info.get('MemTotal', 0)
+        available = info.get('MemAvailable', info.get('MemFree', 0))
+        used = total - available
+        percent = round(used * 100 / total, 1) if total else 0
+        return percent, round(used / 1024 ** 2, 1), round(total / 1024 ** 2, 1)
+    
+    def read_disk(self):
+        try:
+            st = os.statvfs(self.disk_path)
+        except OSError:
+            return 0
+        # Same convention as df: reserved blocks count as neither used nor free
+        used = st.f_blocks - st.f_bfree
+        usable = used + st.f_bavail
+        return round(used * 100 / usable, 1) if usable else 0
+
+
+def create_metrics_provider(shell, table):
+    """Native /proc sampling where available, otherwise the PowerShell backend"""
+    if sys.platform.startswith('linux') and ProcMetricsProvider.available():
+        return ProcMetricsProvider(table)
+    return PowerShellMetricsProvider(table, shell)
+
+
+class ConsoleLog:
+    """Line buffer in front of the console Text widget.
     
-    def __init__(self, canvas, colors):
-        self.canvas = canvas
-        self.colors = colors
-        self.width = 900
-        self.height = 650
-        
-        # Orb state
-        self.orb_x = self.width // 2
-        self.orb_y = self.height // 2
-        self.orb_target_x = self.orb_x
-        self.orb_target_y = self.orb_y
-        self.orb_radius = 120  # Larger orb
-        self.orb_pulse = 0
-        
-        # Mouse state
-        self.mouse_x = self.width // 2
-        self.mouse_y = self.height // 2
-        
-        # Particles - more for fuller effect
-        self.particles = []
-        self.num_particles = 80
-        self.init_particles()
-        
-        # Click burst state
-        self.bursts = []
-        
-        # Energy rings
-        self.rings = []
-        
-        # Animation control
-        self._running = False
-        self._after_id = None
-        
-        # Bind mouse events
-        self.canvas.bind("<Motion>", self.on_mouse_move)
-        self.canvas.bind("<Button-1>", self.on_click)
-        self.canvas.bind("<Configure>", self.on_resize)
-        
-        # Start animation
-        self.start()
+    Lines written during one pass of the event loop are held back and
+    applied with a single insert once Tk is idle, so a scan that logs
+    hundreds of lines costs one widget update. A line identical to the
+    one before it is folded into that line as a repeat count, and the
+    oldest lines are deleted once the widget holds more than max_lines.
+    A message may span several lines; self.lines counts widget lines, so
+    all writes to the widget must go through here to keep it in step.
+    """
     
-    def init_particles(self):
-        """Initialize floating particles"""
-        self.particles = []
-        for _ in range(self.num_particles):
-            self.particles.append({
-                'x': random.randint(0, self.width),
-                'y': random.randint(0, self.height),
-                'vx': random.uniform(-0.5, 0.5),
-                'vy': random.uniform(-0.5, 0.5),
-                'size': random.uniform(1, 3),
-                'brightness': random.uniform(0.3, 1.0),
-                'phase': random.uniform(0, math.pi * 2),
-            })
+    def __init__(self, widget, max_lines=1000):
+        self.widget = widget
+        self.max_lines = max_lines
+        self.pending = []  # [stamp, message, tag, count] entries not yet shown
+        self.last = None  # newest entry, shown or pending
+        self.rewrite = False  # last is shown but its repeat count changed
+        self.lines = 0  # widget lines, not entries
+        self.scheduled = False
     
-    def on_resize(self, event):
-        self.width = event.width
-        self.height = event.height
+    def write(self, message, tag="dim", stamp=None):
+        """Queue one line; stamp is shown in front of it, None gives a raw line"""
+        last = self.last
+        if (message is not None and last is not None and last[1] == message
+                and last[2] == tag and (last[0] is None) == (stamp is None)):
+            last[0] = stamp
+            last[3] += 1
+            if not self.pending:
+                self.pending.append(last)
+                self.rewrite = True
+        else:
+            self.last = [stamp, message, tag, 1]
+            self.pending.append(self.last)
+        self._schedule()
     
-    def on_mouse_move(self, event):
-        self.mouse_x = event.x
-        self.mouse_y = event.y
-        self.orb_target_x = event.x
-        self.orb_target_y = event.y
+    def blank(self):
+        """Queue an empty separator line"""
+        self.last = [None, None, "dim", 1]
+        self.pending.append(self.last)
+        self._schedule()
     
-    def on_click(self, event):
-        """Create burst effect on click"""
-        self.bursts.append({
-            'x': event.x,
-            'y': event.y,
-            'radius': 0,
-            'max_radius': 200,
-            'alpha': 1.0,
-            'rings': [],
-        })
-        # Add shockwave rings
-        for i in range(4):
-            self.rings.append({
-                'x': event.x,
-                'y': event.y,
-                'radius': i * 10,
-                'alpha': 1.0,
-                'speed': 8 + i * 2,
+    def clear(self):
+        self.widget.delete("1.0", tk.END)
+        self.pending = []
+        self.last = None
+        self.rewrite = False
+        self.lines = 0
+    
+    @staticmethod
+    def _height(entry):
+        message = entry[1]
+        return 1 if message is None else message.count("\n") + 1
+    
+    def _schedule(self):
+        if not self.scheduled:
+            self.scheduled = True
+            self.widget.after_idle(self.flush)
+    
+    def flush(self):
+        self.scheduled = False
+        if not self.pending:
+            return
+        chunks = []
+        for stamp, message, tag, count in self.pending:
+            if stamp is not None:
+                chunks += [f"{stamp} ", "timestamp", f"│ {message}", tag]
+            elif message is not None:
+                chunks += [f"       │ {message}", tag]
+            if count > 1:
+                chunks += [f"  ×{count}", "dim"]
+            chunks += ["\n", tag]
+        if self.rewrite:
+            height = min(self._height(self.pending[0]), self.lines)
+            self.widget.delete(f"{self.lines - height + 1}.0", f"{self.lines + 1}.0")
+            self.lines -= height
+        self.widget.insert(tk.END, *chunks)
+        self.lines += sum(self._height(entry) for entry in self.pending)
+        if self.lines > self.max_lines:
+            self.widget.delete("1.0", f"{self.lines - self.max_lines + 1}.0")
+            self.lines = self.max_lines
+        self.widget.see(tk.END)
+        self.pending = []
+        self.rewrite = False
+
+
+class VirtualList(tk.Canvas):
+    """Scrollable list drawn on one canvas that only renders the rows in view.
+    
+    A fixed set of slots - a background rectangle plus one text item per
+    column - covers the viewport, item i always drawn by slot i modulo
+    the slot count. Scrolling shifts every row with one move() and only
+    the slots that wrap around to a new item are placed and rewritten, so
+    a list of 5000 opens and scrolls as fast as one of 30. Hover and
+    click are a single binding each that finds the row under the pointer.
+    
+    columns holds (x, font, anchor) per cell, a negative x counting from
+    the right edge, and render(item, index)
+    returns one (text, color) per column. set_items() can name a
+    placeholder to show while the list is empty. yview, yview_scroll and
+    yview_moveto follow the Canvas protocol, so a Scrollbar command and
+    bind_mousewheel drive it like a plain canvas; set yscroll to the
+    scrollbar's set method to keep the thumb in step.
+    """
+    
+    def __init__(self, parent, columns, render, on_click, row_bg, hover_bg,
+                 row_height=36, gap=2, placeholder_font=None, placeholder_fill=None, **kwargs):
+        super().__init__(parent, highlightthickness=0, cursor="hand2", **kwargs)
+        self.columns = columns
+        self.render = render
+        self.on_click = on_click
+        self.row_bg = row_bg
+        self.hover_bg = hover_bg
+        self.row_height = row_height
+        self.gap = gap
+        self.items = []
+        self.top = 0  # pixels scrolled past the first row
+        self.drawn_top = 0  # scroll offset the shown slots were placed for
+        self.slots = []  # [rect, texts, index shown, None if hidden, -1 if stale]
+        self.hover = None
+        self.yscroll = None
+        self.placeholder = self.create_text(
+            0, 20, anchor='n', font=placeholder_font, fill=placeholder_fill, state="hidden"
+        )
+        self.bind("<Configure>", lambda e: self._layout())
+        self.bind("<Motion>", self._on_motion)
+        self.bind("<Leave>", lambda e: self._set_hover(None))
+        self.bind("<Button-1>", self._on_click)
+    
+    def set_items(self, items, placeholder=""):
+        """Show a new sequence of items, scrolled back to the top"""
+        self.items = items
+        self.itemconfigure(self.placeholder, text=placeholder)
+        self.top = 0
+        self.hover = None
+        for slot in self.slots:
+            slot[2] = -1
+        self._draw()
+    
+    def _viewport(self):
+        return max(1, self.winfo_height())
+    
+    def _max_top(self):
+        return max(0, len(self.items) * self.row_height - self._viewport())
+    
+    def yview(self, *args):
+        if not args:
+            total = max(1, len(self.items) * self.row_height)
+            return self.top / total, min(1.0, (self.top + self._viewport()) / total)
+        if args[0] == 'moveto':
+            self.yview_moveto(float(args[1]))
+        elif args[0] == 'scroll':
+            self.yview_scroll(int(args[1]), args[2])
+    
+    def yview_moveto(self, fraction):
+        self._scroll_to(fraction * len(self.items) * self.row_height)
+    
+    def yview_scroll(self, number, what):
+        step = self.row_height if what == 'units' else max(self.row_height, self._viewport() - self.row_height)
+        self._scroll_to(self.top + number * step)
+    
+    def _scroll_to(self, top):
+        top = int(min(max(top, 0), self._max_top()))
+        if top != self.top:
+            self.top = top
+            self._draw()
+    
+    def _layout(self):
+        """Match the slot count to the viewport height"""
+        needed = self._viewport() // self.row_height + 2
+        while len(self.slots) < needed:
+            rect = self.create_rectangle(0, 0, 0, 0, width=0, fill=self.row_bg, state="hidden", tags="row")
+            texts = [
+                self.create_text(x, 0, font=font, anchor=anchor, state="hidden", tags="row")
+                for x, font, anchor in self.columns
+            ]
+            self.slots.append([rect, texts, None])
+        # Slot assignment and row width both depend on the size, so place everything again
+        for slot in self.slots:
+            slot[2] = -1
+        self.top = min(self.top, self._max_top())
+        self._draw()
+    
+    def _draw(self):
+        height = self.row_height
+        width = self.winfo_width()
+        self.coords(self.placeholder, width / 2, 20)
+        self.itemconfigure(self.placeholder, state="hidden" if self.items else "normal")
+        if self.drawn_top != self.top:
+            self.move("row", 0, self.drawn_top - self.top)
+            self.drawn_top = self.top
+        count = len(self.slots)
+        first = self.top // height
+        for index in range(first, first + count):
+            slot = self.slots[index % count]
+            rect, texts, shown = slot
+            if index >= len(self.items):
+                if shown is not None:
+                    self.itemconfigure(rect, state="hidden")
+                    for text in texts:
+                        self.itemconfigure(text, state="hidden")
+                    slot[2] = None
+                continue
+            if shown == index:
+                continue
+            y = index * height - self.top
+            self.coords(rect, 0, y + self.gap / 2, width, y + height - self.gap / 2)
+            for (x, font, anchor), text in zip(self.columns, texts):
+                self.coords(text, x if x >= 0 else width + x, y + height / 2)
+            cells = self.render(self.items[index], index)
+            for text, (label, color) in zip(texts, cells):
+                self.itemconfigure(text, text=label, fill=color, state="normal")
+            fill = self.hover_bg if index == self.hover else self.row_bg
+            self.itemconfigure(rect, fill=fill, state="normal")
+            slot[2] = index
+        if self.yscroll is not None:
+            self.yscroll(*self.yview())
+    
+    def index_at(self, y):
+        index = int((self.top + y) // self.row_height)
+        return index if 0 <= index < len(self.items) else None
+    
+    def _set_hover(self, index):
+        if index == self.hover:
+            return
+        for slot in self.slots:
+            if slot[2] is not None and slot[2] in (self.hover, index):
+                self.itemconfigure(slot[0], fill=self.hover_bg if slot[2] == index else self.row_bg)
+        self.hover = index
+    
+    def _on_motion(self, event):
+        self._set_hover(self.index_at(event.y))
+    
+    def _on_click(self, event):
+        index = self.index_at(event.y)
+        if index is not None:
+            self.on_click(self.items[index])
+
+
+class SessionLog:
+    """Appends log records to a file from a background thread.
+    
+    record() only puts a dict on a bounded queue, so the Tk thread never
+    touches the disk. The writer thread takes whatever has queued up,
+    writes it as JSON lines with one flush per batch, and rotates the file
+    to path.1 ... path.<backups> once it grows past max_bytes. When the
+    disk falls behind, records beyond max_queue are counted and dropped
+    rather than held in memory, and the count is logged once it catches up.
+    """
+    
+    def __init__(self, path, max_bytes=1_000_000, backups=3, max_queue=5000, batch=500):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch = batch
+        self.queue = queue.Queue(max_queue)
+        self.dropped = 0  # shared by both threads, guarded by _lock
+        self.written = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="session-log", daemon=True)
+        self.thread.start()
+    
+    def record(self, message, tag="info", task=None):
+        if self._stop.is_set():
+            return
+        try:
+            self.queue.put_nowait({
+                'time': datetime.now().isoformat(timespec='milliseconds'),
+                'tag': tag, 'message': message, 'task': task
             })
-        # Scatter nearby particles
-        for p in self.particles:
-            dx = p['x'] - event.x
-            dy = p['y'] - event.y
-            dist = math.sqrt(dx*dx + dy*dy)
-            if dist < 150 and dist > 0:
-                force = (150 - dist) / 15
-                p['vx'] += (dx / dist) * force
-                p['vy'] += (dy / dist) * force
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
     
-    def lerp(self, a, b, t):
-        return a + (b - a) * t
+    def close(self, timeout=2.0):
+        """Write out what is queued and stop the writer thread"""
+        self._stop.set()
+        self.thread.join(timeout)
     
-    def start(self):
-        """Start the animation loop"""
-        if self._running:
+    def _run(self):
+        f = None
+        while True:
+            try:
+                batch = [self.queue.get(timeout=0.5)]
+            except queue.Empty:
+                if self._stop.is_set():
+                    break
+                continue
+            while len(batch) < self.batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            with self._lock:
+                dropped, self.dropped = self.dropped, 0
+            if dropped:
+                batch.append({
+                    'time': datetime.now().isoformat(timespec='milliseconds'),
+                    'tag': 'warn', 'message': f"{dropped} records dropped", 'task': None
+                })
+            try:
+                f = self._write(f, batch)
+            except Exception:
+                if f is not None:
+                    try:
+                        f.close()
+                    except Exception:
+                        pass
+                f = None
+        if f is not None:
+            f.close()
+    
+    def _write(self, f, batch):
+        if f is None:
+            f = open(self.path, 'a', encoding='utf-8')
+        f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch))
+        f.flush()
+        self.written += len(batch)
+        if f.tell() >= self.max_bytes:
+            f.close()
+            self._rotate()
+            return None
+        return f
+    
+    def _rotate(self):
+        if self.backups <= 0:
+            os.remove(self.path)
             return
-        self._running = True
-        self._tick()
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+class ClipboardWatcher:
+    """Tells when the clipboard changed without holding on to its contents.
     
-    def stop(self):
-        """Stop the animation loop"""
-        self._running = False
-        if self._after_id is not None:
+    On Windows every copy bumps the clipboard sequence number, so a poll is
+    a single user32 call and read() runs only after the number moved.
+    Elsewhere the text has to be read to compare, but only a fingerprint is
+    kept - its length and a hash, taken over the head and tail once the
+    text is longer than hash_limit characters.
+    """
+    
+    def __init__(self, read, hash_limit=1 << 20):
+        self.read = read
+        self.hash_limit = hash_limit
+        self.sequence = self._sequence_number()
+        self.last = None
+        self.changes = 0
+    
+    @staticmethod
+    def _sequence_number():
+        if sys.platform != 'win32':
+            return None
+        try:
+            import ctypes
+            from ctypes import wintypes
+            fn = ctypes.windll.user32.GetClipboardSequenceNumber
+            fn.restype = wintypes.DWORD
+            fn.argtypes = []
+            return fn
+        except Exception:
+            return None
+    
+    def fingerprint(self, text):
+        sample = text
+        if len(text) > self.hash_limit:
+            half = self.hash_limit // 2
+            sample = text[:half] + text[-half:]
+        digest = hashlib.blake2b(sample.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        return len(text), digest
+    
+    def poll(self):
+        """Return the clipboard text if it changed since the last poll, else None"""
+        if self.sequence is not None:
+            number = self.sequence()
+            if number == self.last:
+                return None
+            self.last = number
             try:
-                self.canvas.after_cancel(self._after_id)
+                text = self.read()
             except Exception:
-                pass
-            self._after_id = None
+                return None
+        else:
+            try:
+                text = self.read()
+            except Exception:
+                return None
+            if not text:
+                return None
+            mark = self.fingerprint(text)
+            if mark == self.last:
+                return None
+            self.last = mark
+        if not text:
+            return None
+        self.changes += 1
+        return text
+
+
+class TrigramIndex:
+    """Inverted index from three-character substrings to the keys containing them.
     
-    def _tick(self):
-        """Animation tick - schedules next frame"""
-        if not self._running:
-            self._after_id = None
+    Texts are expected already folded to lower case. A query of three or
+    more characters narrows to the keys holding all of its trigrams by
+    intersecting postings, smallest first; callers confirm the actual
+    substring on that short list. remove() needs the same text add() got.
+    
+    Each key gets a small integer id and a posting is an array('I') of
+    ids, 4 bytes per entry instead of a set slot pointing at a key
+    string. Ids only ever grow, so appending keeps every posting sorted
+    and a removal finds its id by bisection.
+    
+    A trigram found in more than MAX_POSTING keys is dropped from the
+    index for good and skipped by queries: it would barely narrow the
+    search, and such common trigrams hold most of the ids. A query made
+    only of them returns None, like a short one, and the caller scans.
+    """
+    
+    MAX_POSTING = 1024
+    
+    def __init__(self):
+        self.postings = {}
+        self.common = set()  # trigrams too frequent to keep a posting for
+        self.ids = {}  # key -> id
+        self.keys = {}  # id -> key
+        self.next_id = 0
+    
+    @staticmethod
+    def trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+    
+    @classmethod
+    def build(cls, items):
+        """Index every (key, text) pair; safe to run off the Tk thread"""
+        index = cls()
+        for key, text in items:
+            index.add(key, text)
+        return index
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __contains__(self, key):
+        return key in self.ids
+    
+    def add(self, key, text):
+        if key in self.ids:
             return
-        self._animate_frame()
-        self._after_id = self.canvas.after(16, self._tick)
+        ident = self.next_id
+        self.next_id += 1
+        self.ids[key] = ident
+        self.keys[ident] = key
+        postings = self.postings
+        for gram in self.trigrams(text):
+            ids = postings.get(gram)
+            if ids is not None:
+                ids.append(ident)
+                if len(ids) > self.MAX_POSTING:
+                    del postings[gram]
+                    self.common.add(gram)
+            elif gram not in self.common:
+                postings[gram] = array('I', (ident,))
     
-    def _animate_frame(self):
-        """Main animation frame - render one frame"""
-        self.canvas.delete("orb_bg")
-        
-        # Update orb position (smooth follow)
-        self.orb_x = self.lerp(self.orb_x, self.orb_target_x, 0.03)
-        self.orb_y = self.lerp(self.orb_y, self.orb_target_y, 0.03)
-        self.orb_pulse += 0.05
-        
-        # Draw outer glow layers - larger spread
-        pulse_offset = math.sin(self.orb_pulse) * 15
-        for i in range(8, 0, -1):
-            r = self.orb_radius + i * 35 + pulse_offset
-            intensity = int(25 - i * 3)
-            color = f"#{0:02x}{max(0,intensity):02x}{0:02x}"
-            self.canvas.create_oval(
-                self.orb_x - r, self.orb_y - r,
-                self.orb_x + r, self.orb_y + r,
-                fill=color, outline="",
-                tags="orb_bg"
-            )
-        
-        # Draw orb core
-        core_pulse = self.orb_radius + math.sin(self.orb_pulse * 1.5) * 5
-        for i in range(5, 0, -1):
-            r = core_pulse * (i / 5)
-            g = int(80 + (5 - i) * 35)
-            color = f"#{0:02x}{min(255, g):02x}{int(g*0.4):02x}"
-            self.canvas.create_oval(
-                self.orb_x - r, self.orb_y - r,
-                self.orb_x + r, self.orb_y + r,
-                fill=color, outline="",
-                tags="orb_bg"
+    def remove(self, key, text):
+        ident = self.ids.pop(key, None)
+        if ident is None:
+            return
+        del self.keys[ident]
+        for gram in self.trigrams(text):
+            ids = self.postings.get(gram)
+            if ids is None:
+                continue
+            pos = bisect_left(ids, ident)
+            if pos < len(ids) and ids[pos] == ident:
+                del ids[pos]
+                if not ids:
+                    del self.postings[gram]
+    
+    def candidates(self, query):
+        """Keys holding every trigram of query, or None if it is too short to use the index"""
+        grams = self.trigrams(query) - self.common
+        if not grams:
+            return None
+        postings = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            if not result:
+                break
+            if len(result) * 16 < len(ids):
+                # Few survivors left: look each one up instead of walking the posting
+                result = {ident for ident in result if self._holds(ids, ident)}
+            else:
+                result.intersection_update(ids)
+        keys = self.keys
+        return {keys[ident] for ident in result}
+    
+    @staticmethod
+    def _holds(ids, ident):
+        pos = bisect_left(ids, ident)
+        return pos < len(ids) and ids[pos] == ident
+    
+    def clear(self):
+        self.postings.clear()
+        self.common.clear()
+        self.ids.clear()
+        self.keys.clear()
+
+
+class ClipboardStore:
+    """Clipboard history in an ordered hash map with SQLite behind it.
+    
+    Entries are keyed by a hash of their text and kept newest last, so a
+    repeated copy is found and moved to the front in O(1) and the entry
+    evicted past capacity is always the oldest. Memory holds only each
+    entry's key, preview, line and character counts and the lower-cased
+    head that search() matches against, all worked out once when the
+    entry is added. Bodies stay in the database, zlib-compressed beyond
+    COMPRESS_OVER bytes, until body() reads one back for pasting.
+    
+    Besides the entry count, max_bytes bounds the oldest-first eviction.
+    Each entry is charged its stored body plus an estimate of what it
+    keeps in memory: ENTRY_BYTES for its record, its head and preview
+    text, and INDEX_BYTES per trigram position for its share of the
+    search index. A single copy larger than the whole budget is not kept. Without a usable path the database
+    lives in memory and the history lasts for the session.
+    
+    The trigram index over the heads follows every add and eviction. For
+    a history loaded from disk it starts out empty: TrigramIndex.build()
+    fills a new one from index_items() on a worker thread, install_index()
+    swaps it in, and search() scans the heads directly until then.
+    """
+    
+    PREVIEW = 60
+    SEARCH_CHARS = 128  # leading characters of each entry that search looks at
+    COMPRESS_OVER = 1024
+    ENTRY_BYTES = 512  # entry dict, key and the OrderedDict link, measured with tracemalloc
+    INDEX_BYTES = 6  # postings id plus array and dict overhead per trigram
+    
+    # Columns added after the first schema, with how to fill them for old plain-text rows
+    COLUMNS = (
+        ('head', "TEXT", f"substr(body, 1, {SEARCH_CHARS})"),
+        ('lines', "INTEGER", "length(body) - length(replace(body, char(10), '')) + 1"),
+        ('stored', "INTEGER", "length(CAST(body AS BLOB))"),
+        ('compressed', "INTEGER", "0"),
+    )
+    
+    def __init__(self, path=None, capacity=20000, max_bytes=64 * 1024 ** 2):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.entries = OrderedDict()
+        self.index = TrigramIndex()
+        try:
+            self.db = self._open(path or ':memory:')
+        except Exception:
+            self.db = self._open(':memory:')
+        rows = self.db.execute(
+            "SELECT key, preview, size, used, head, lines, stored FROM clips ORDER BY used"
+        )
+        for key, preview, size, used, head, lines, stored in rows:
+            entry = self._entry(key, preview, size, lines, stored, used, head.lower())
+            self.entries[key] = entry
+            self.bytes += entry['cost']
+        self.indexed = not self.entries
+        self._evict()
+        self.db.commit()
+    
+    @classmethod
+    def _open(cls, path):
+        db = sqlite3.connect(path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS clips (key TEXT PRIMARY KEY, body BLOB NOT NULL,"
+            " preview TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)"
+        )
+        existing = {row[1] for row in db.execute("PRAGMA table_info(clips)")}
+        for name, kind, fill in cls.COLUMNS:
+            if name not in existing:
+                db.execute(f"ALTER TABLE clips ADD COLUMN {name} {kind}")
+                db.execute(f"UPDATE clips SET {name} = {fill}")
+        db.commit()
+        return db
+    
+    @staticmethod
+    def _entry(key, preview, size, lines, stored, used, folded):
+        meta = f"{lines} lines" if lines > 1 else ""
+        if size > ClipboardStore.PREVIEW:
+            meta = f"{meta} · {size:,} chars" if meta else f"{size:,} chars"
+        resident = (
+            ClipboardStore.ENTRY_BYTES + len(preview) + len(folded)
+            + ClipboardStore.INDEX_BYTES * max(0, len(folded) - 2)
+        )
+        return {
+            'key': key, 'preview': preview, 'size': size, 'lines': lines, 'stored': stored,
+            'meta': meta, 'used': used, 'folded': folded, 'cost': stored + resident
+        }
+    
+    @staticmethod
+    def key(text):
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+    
+    @classmethod
+    def preview(cls, text):
+        preview = text[:cls.PREVIEW] + "..." if len(text) > cls.PREVIEW else text
+        return preview.replace('\n', ' ').replace('\r', '')
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def add(self, text):
+        """Store text as the newest entry, or move an identical one to the front"""
+        key = self.key(text)
+        now = time.time()
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry['used'] = now
+            self.entries.move_to_end(key)
+            self.db.execute("UPDATE clips SET used = ? WHERE key = ?", (now, key))
+        else:
+            body, compressed, stored = self.pack(text)
+            head = text[:self.SEARCH_CHARS]
+            entry = self._entry(
+                key, self.preview(text), len(text), text.count('\n') + 1, stored, now, head.lower()
             )
-        
-        # Update and draw particles
-        for p in self.particles:
-            # Attract to orb slightly
-            dx = self.orb_x - p['x']
-            dy = self.orb_y - p['y']
-            dist = math.sqrt(dx*dx + dy*dy)
-            
-            if dist > 0:
-                # Orbit around orb
-                attract = 0.02
-                p['vx'] += (dx / dist) * attract
-                p['vy'] += (dy / dist) * attract
-                
-                # Tangential velocity for orbit effect
-                p['vx'] += (-dy / dist) * 0.01
-                p['vy'] += (dx / dist) * 0.01
-            
-            # Mouse repulsion
-            mx = p['x'] - self.mouse_x
-            my = p['y'] - self.mouse_y
-            mouse_dist = math.sqrt(mx*mx + my*my)
-            if mouse_dist < 100 and mouse_dist > 0:
-                repel = (100 - mouse_dist) / 500
-                p['vx'] += (mx / mouse_dist) * repel
-                p['vy'] += (my / mouse_dist) * repel
-            
-            # Apply velocity with damping
-            p['x'] += p['vx']
-            p['y'] += p['vy']
-            p['vx'] *= 0.98
-            p['vy'] *= 0.98
-            
-            # Wrap around edges
-            if p['x'] < 0: p['x'] = self.width
-            if p['x'] > self.width: p['x'] = 0
-            if p['y'] < 0: p['y'] = self.height
-            if p['y'] > self.height: p['y'] = 0
-            
-            # Pulsing brightness
-            p['phase'] += 0.02
-            brightness = p['brightness'] * (0.7 + 0.3 * math.sin(p['phase']))
-            
-            # Distance-based brightness
-            if dist < 200:
-                brightness *= (0.5 + 0.5 * (dist / 200))
-            
-            g = int(brightness * 255)
-            color = f"#{0:02x}{g:02x}{int(g*0.5):02x}"
-            
-            size = p['size']
-            self.canvas.create_oval(
-                p['x'] - size, p['y'] - size,
-                p['x'] + size, p['y'] + size,
-                fill=color, outline="",
-                tags="orb_bg"
+            if entry['cost'] > self.max_bytes:
+                return None
+            self.entries[key] = entry
+            self.bytes += entry['cost']
+            self.index.add(key, entry['folded'])
+            self.db.execute(
+                "INSERT OR REPLACE INTO clips (key, body, preview, size, used, head, lines, stored, compressed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, body, entry['preview'], entry['size'], now, head, entry['lines'], stored, compressed)
             )
-        
-        # Draw energy connections between close particles
-        for i, p1 in enumerate(self.particles[:20]):
-            for p2 in self.particles[i+1:20]:
-                dx = p1['x'] - p2['x']
-                dy = p1['y'] - p2['y']
-                dist = math.sqrt(dx*dx + dy*dy)
-                if dist < 80:
-                    alpha = int((1 - dist/80) * 40)
-                    color = f"#{0:02x}{alpha:02x}{0:02x}"
-                    self.canvas.create_line(
-                        p1['x'], p1['y'], p2['x'], p2['y'],
-                        fill=color, width=1,
-                        tags="orb_bg"
-                    )
-        
-        # Update and draw burst effects
-        active_bursts = []
-        for burst in self.bursts:
-            burst['radius'] += 12
-            burst['alpha'] -= 0.03
-            
-            if burst['alpha'] > 0:
-                # Draw expanding burst
-                for i in range(3):
-                    r = burst['radius'] - i * 15
-                    if r > 0:
-                        intensity = int(burst['alpha'] * 100 * (1 - i * 0.3))
-                        color = f"#{0:02x}{max(0,intensity):02x}{0:02x}"
-                        self.canvas.create_oval(
-                            burst['x'] - r, burst['y'] - r,
-                            burst['x'] + r, burst['y'] + r,
-                            outline=color, width=3-i,
-                            tags="orb_bg"
-                        )
-                active_bursts.append(burst)
-        self.bursts = active_bursts
-        
-        # Update and draw shockwave rings
-        active_rings = []
-        for ring in self.rings:
-            ring['radius'] += ring['speed']
-            ring['alpha'] -= 0.025
-            
-            if ring['alpha'] > 0:
-                intensity = int(ring['alpha'] * 180)
-                color = f"#{0:02x}{intensity:02x}{int(intensity*0.6):02x}"
-                self.canvas.create_oval(
-                    ring['x'] - ring['radius'], ring['y'] - ring['radius'],
-                    ring['x'] + ring['radius'], ring['y'] + ring['radius'],
-                    outline=color, width=2,
-                    tags="orb_bg"
-                )
-                active_rings.append(ring)
-        self.rings = active_rings
+            self._evict()
+        self.db.commit()
+        return entry
+    
+    @classmethod
+    def pack(cls, text):
+        """(body, compressed, stored bytes): zlib data for large text that shrinks, else the text"""
+        data = text.encode('utf-8', 'surrogatepass')
+        if len(data) > cls.COMPRESS_OVER:
+            packed = zlib.compress(data, 6)
+            if len(packed) < len(data):
+                return packed, 1, len(packed)
+        return text, 0, len(data)
+    
+    def _evict(self):
+        # The newest entry always stays; add() already refused anything over budget
+        while len(self.entries) > self.capacity or (self.bytes > self.max_bytes and len(self.entries) > 1):
+            key, entry = self.entries.popitem(last=False)
+            self.bytes -= entry['cost']
+            self.index.remove(key, entry['folded'])
+            self.db.execute("DELETE FROM clips WHERE key = ?", (key,))
+    
+    def body(self, key):
+        """Full text of an entry, decompressed if needed, or None if it is gone"""
+        row = self.db.execute("SELECT body, compressed FROM clips WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        body, compressed = row
+        if compressed:
+            return zlib.decompress(body).decode('utf-8', 'surrogatepass')
+        return body
+    
+    def page(self, number, size=20):
+        """Entries on page number, newest first"""
+        start = number * size
+        return list(islice(reversed(self.entries.values()), start, start + size))
+    
+    def pages(self, size=20):
+        return max(1, -(-len(self.entries) // size))
+    
+    def index_items(self):
+        """Snapshot of (key, head) pairs for build_index, taken on the Tk thread"""
+        return [(key, entry['folded']) for key, entry in self.entries.items()]
+    
+    def install_index(self, index, items):
+        """Swap in an index built from the items snapshot, catching up on changes since"""
+        stale = [key for key in index.ids if key not in self.entries]
+        if stale:
+            heads = dict(items)
+            for key in stale:
+                index.remove(key, heads[key])
+        for key in self.index.ids:
+            if key not in index and key in self.entries:
+                index.add(key, self.entries[key]['folded'])
+        self.index = index
+        self.indexed = True
+    
+    def search(self, query, limit=200):
+        """The limit most recent entries whose head contains query, best matches first.
+        
+        A match at the start of an entry ranks above one at the start of a
+        word, which ranks above one inside a word; recency decides within
+        each. When the index leaves only a few candidates just those are
+        checked, otherwise common queries match densely and walking the
+        history newest first stops after limit hits.
+        """
+        query = query.lower()
+        if not query:
+            return self.page(0, limit)
+        candidates = self.index.candidates(query) if self.indexed else None
+        if candidates is not None and len(candidates) <= limit * 4:
+            entries = [self.entries[key] for key in candidates if key in self.entries]
+            entries.sort(key=itemgetter('used'), reverse=True)
+        else:
+            entries = reversed(self.entries.values())
+        matches = []
+        for entry in entries:
+            folded = entry['folded']
+            pos = folded.find(query)
+            if pos < 0:
+                continue
+            if pos == 0:
+                quality = 2
+            elif not folded[pos - 1].isalnum():
+                quality = 1
+            else:
+                quality = 0
+            matches.append((quality, entry))
+            if len(matches) == limit:
+                break
+        # Stable sort, so recency still orders entries of equal quality
+        matches.sort(key=itemgetter(0), reverse=True)
+        return [entry for _, entry in matches]
+    
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+        self.index.clear()
+        self.indexed = True
+        self.db.execute("DELETE FROM clips")
+        self.db.commit()
+    
+    def close(self):
+        try:
+            self.db.close()
+        except Exception:
+            pass
+
 
 # Minimalist ASCII banner - clean pixel-art style
 ASCII_BANNER = r"""
@@ -348,16 +3438,40 @@ class VomTools:
             'glow': '#00ff9f',
         }
         
-        # Animation state
+        # Animation state - every periodic job runs off one shared clock
         self.cursor_visible = True
         self.animated_orb = None
-        self._after_cursor = None
-        self._after_scanline = None
-        self._after_clipboard = None
+        self.scanline_item = None
+        self.clock = FrameClock(self.root)
+        
+        # PowerShell scripts run in one persistent worker instead of a process per call
+        self.shell = ShellHost(POWERSHELL_WORKER_COMMAND, "powershell")
+        
+        # One process table shared by the monitor, process killer and suspend task
+        self.processes = ProcessTable(create_process_source(self.shell))
+        self.metrics = create_metrics_provider(self.shell, self.processes)
+        
+        # System Monitor history - one ring buffer per metric, sampled every 2 s
+        self.monitor_history_minutes = 10
+        self.metric_history = {
+            key: MetricHistory(self.monitor_history_minutes * 60 // 2)
+            for key in ('cpu', 'ram', 'disk')
+        }
+        
+        # Background work shares a fixed set of threads, user actions first.
+        # Task commands get their own workers so a long one never holds up scans
+        self.pool = WorkerPool(4)
+        self.command_pool = WorkerPool(2)
         
-        # Clipboard history for clipboard manager
-        self.clipboard_history = []
-        self.last_clipboard = ""
+        # Only the latest scan may open its popup; hiding to tray drops it too
+        self.scan_token = CancelToken()
+        
+        # Repeated scans share one in-flight run and answer from cache while fresh
+        self.scans = ScanCache(lambda fn: self.root.after(0, fn), self.pool)
+        
+        # Clipboard history for clipboard manager, opened once settings are loaded
+        self.clipboard_history = None
+        self.clipboard_watcher = ClipboardWatcher(self.root.clipboard_get)
         
         # Quick launcher apps (customizable)
         self.quick_launch_apps = [
@@ -455,14 +3569,38 @@ class VomTools:
         }
         self.current_hotkey = 'ctrl+decimal'
         self.current_color_name = 'Green'
+        self.render_mode = 'sprite'
+        self.orb_quality = 'auto'
+        self.orb_fps = 60
+        self.raster_thread = False
+        self.max_bursts = 6
+        self.task_log_dir = ''
+        self.console_lines = 1000
+        self.session_log_path = ''
+        self.clipboard_capacity = 20000
+        self.clipboard_budget_mb = 64
+        self.clipboard_persist = True
+        self.running_tasks = []
         self.load_config()
+        # Copied passwords end up in the history too, so keeping it on disk can be turned off
+        clipboard_path = None
+        if self.clipboard_persist:
+            clipboard_path = os.path.join(os.path.dirname(self.config_path), 'vomtools_clipboard.db')
+        self.clipboard_history = ClipboardStore(
+            clipboard_path, self.clipboard_capacity, self.clipboard_budget_mb * 1024 ** 2
+        )
+        if not self.clipboard_history.indexed:
+            self.index_clipboard_history()
+        self.session_log = None
+        if self.session_log_path:
+            self.session_log = SessionLog(os.path.join(os.path.dirname(self.config_path), self.session_log_path))
+        self.palette = Palette(self.colors, self.current_color_name)
         
         self.setup_scrollbar_style()
         self.setup_ui()
         self.setup_tray()
         self.bind_keys()
         self.start_animations()
-        self.start_clipboard_monitor()
         self.log_startup()
     
     def setup_scrollbar_style(self):
@@ -503,7 +3641,11 @@ class VomTools:
         self.bg_canvas.pack(fill=tk.BOTH, expand=True)
         
         # Initialize animated orb background
-        self.animated_orb = AnimatedOrb(self.bg_canvas, self.colors)
+        self.animated_orb = AnimatedOrb(
+            self.bg_canvas, self.colors, self.render_mode, clock=self.clock,
+            quality=self.orb_quality, fps=self.orb_fps, palette=self.palette,
+            raster_thread=self.raster_thread, max_bursts=self.max_bursts
+        )
         
         # All UI placed on canvas with canvas bg for transparency effect
         canvas_bg = self.colors['bg']
@@ -596,6 +3738,7 @@ class VomTools:
         
         console_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.console.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.console_log = ConsoleLog(self.console, self.console_lines)
         
         # Configure text tags
         self.console.tag_configure("timestamp", foreground=self.colors['text_muted'])
@@ -624,6 +3767,7 @@ class VomTools:
             bg=canvas_bg
         )
         self.status_label.place(x=35, rely=0.95, anchor='w')
+        self.status_label.bind("<Button-1>", lambda e: self.cancel_tasks())
         
         # ESC hint
         self.esc_hint = tk.Label(
@@ -716,10 +3860,17 @@ class VomTools:
         else:
             self.show_from_tray()
     
+    def new_scan_token(self):
+        """Cancel the previous scan's delivery and return a token for the next one"""
+        self.scan_token.cancel()
+        self.scan_token = CancelToken()
+        return self.scan_token
+    
     def hide_to_tray(self):
         """Hide window and stop all animations for 0 CPU usage"""
         self.is_visible = False
         self.stop_animations()
+        self.scan_token.cancel()
         self.root.withdraw()
     
     def show_from_tray(self):
@@ -738,7 +3889,13 @@ class VomTools:
     
     def quit_app(self, icon=None, item=None):
         # Stop all animations first
-        self.stop_animations()
+        self.clock.stop()
+        self.pool.shutdown()
+        self.command_pool.shutdown()
+        self.shell.close()
+        if self.session_log:
+            self.session_log.close()
+        self.clipboard_history.close()
         if self.tray_icon:
             self.tray_icon.stop()
         self.root.quit()
@@ -749,122 +3906,72 @@ class VomTools:
         self.root.bind("<Escape>", lambda e: self.hide_to_tray())
     
     def start_animations(self):
-        """Start background animations"""
+        """Register background animations and periodic jobs on the frame clock"""
         self.scan_line_y = 0
-        self.start_cursor()
-        self.start_scanline()
+        self.scanline_item = self.bg_canvas.create_line(
+            0, 0, 0, 0, fill=self.palette.scanline, width=1, tags="scanline"
+        )
+        self.clock.add('scanline', 16, self.animate_scanline)
+        self.clock.add('cursor', 530, self.animate_cursor)
+        # Keeps capturing from the tray; a poll is cheap until something is copied
+        self.clock.add('clipboard', 1000, self.update_clipboard_history, keep_alive=True)
+        self.clock.start()
     
     def stop_animations(self):
-        """Stop all background animations"""
-        if self.animated_orb:
-            self.animated_orb.stop()
-        self.stop_cursor()
-        self.stop_scanline()
-        self.stop_clipboard_monitor()
+        """Pause all background animations"""
+        self.clock.pause()
     
     def resume_animations(self):
-        """Resume all background animations"""
-        if self.animated_orb:
-            self.animated_orb.start()
-        self.start_cursor()
-        self.start_scanline()
-        self.start_clipboard_monitor()
-    
-    def start_clipboard_monitor(self):
-        """Monitor clipboard for history"""
-        if self._after_clipboard is not None:
-            return
-        self._clipboard_tick()
-    
-    def stop_clipboard_monitor(self):
-        """Stop clipboard monitoring"""
-        if self._after_clipboard is not None:
-            try:
-                self.root.after_cancel(self._after_clipboard)
-            except Exception:
-                pass
-            self._after_clipboard = None
-    
-    def _clipboard_tick(self):
-        """Clipboard monitoring tick"""
-        if not self.is_visible:
-            self._after_clipboard = None
-            return
-        self.update_clipboard_history()
-        self._after_clipboard = self.root.after(1000, self._clipboard_tick)
-    
-    def start_cursor(self):
-        """Start cursor animation"""
-        if self._after_cursor is not None:
-            return
-        self.animate_cursor()
-    
-    def stop_cursor(self):
-        """Stop cursor animation"""
-        if self._after_cursor is not None:
-            try:
-                self.root.after_cancel(self._after_cursor)
-            except Exception:
-                pass
-            self._after_cursor = None
+        """Resume all background animations"""
+        self.clock.resume()
     
     def animate_cursor(self):
         """Blinking cursor animation"""
-        if not self.is_visible:
-            self._after_cursor = None
-            return
         self.cursor_visible = not self.cursor_visible
         self.cursor_label.config(
             fg=self.colors['primary'] if self.cursor_visible else self.colors['bg']
         )
-        self._after_cursor = self.root.after(530, self.animate_cursor)
-    
-    def start_scanline(self):
-        """Start scanline animation"""
-        if self._after_scanline is not None:
-            return
-        self.animate_scanline()
-    
-    def stop_scanline(self):
-        """Stop scanline animation"""
-        if self._after_scanline is not None:
-            try:
-                self.root.after_cancel(self._after_scanline)
-            except Exception:
-                pass
-            self._after_scanline = None
     
     def animate_scanline(self):
-        """Subtle scanline effect"""
-        if not self.is_visible:
-            self._after_scanline = None
-            return
-        self.bg_canvas.delete("scanline")
-        self.scan_line_y = (self.scan_line_y + 2) % max(1, self.root.winfo_height())
-        self.bg_canvas.create_line(
-            0, self.scan_line_y,
-            self.root.winfo_width(), self.scan_line_y,
-            fill='#1a1a1a', width=1, tags="scanline"
-        )
-        self.bg_canvas.tag_raise("scanline")
-        self._after_scanline = self.root.after(16, self.animate_scanline)
+        """Subtle scanline effect - one persistent line moved down the window"""
+        width = self.animated_orb.width
+        height = self.animated_orb.height
+        self.scan_line_y = (self.scan_line_y + 2) % max(1, height)
+        self.bg_canvas.coords(self.scanline_item, 0, self.scan_line_y, width, self.scan_line_y)
+        self.bg_canvas.tag_raise(self.scanline_item)
+    
+    def apply_palette(self):
+        """Rebuild the color tables for the current preset and re-skin running animations"""
+        self.palette = Palette(self.colors, self.current_color_name)
+        if self.animated_orb:
+            self.animated_orb.set_palette(self.palette)
+        if self.scanline_item is not None:
+            self.bg_canvas.itemconfigure(self.scanline_item, fill=self.palette.scanline)
     
-    def log(self, message, tag="success"):
+    def log(self, message, tag="success", task=None):
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.console.insert(tk.END, f"{timestamp} ", "timestamp")
-        self.console.insert(tk.END, f"│ {message}\n", tag)
-        self.console.see(tk.END)
+        self.console_log.write(message, tag, timestamp)
+        if self.session_log:
+            self.session_log.record(message, tag, task)
     
     def log_raw(self, message, tag="dim"):
         """Log without timestamp"""
-        self.console.insert(tk.END, f"       │ {message}\n", tag)
-        self.console.see(tk.END)
+        self.console_log.write(message, tag)
+    
+    def log_lines(self, lines):
+        """Append (text, is_error) command output lines"""
+        for text, is_error in lines:
+            self.console_log.write(text, "error" if is_error else "success")
     
     def log_startup(self):
-        self.console.insert(tk.END, "\n", "dim")
+        self.console_log.blank()
         self.log("VomTools initialized", "accent")
         self.log_raw("Ready to execute commands", "dim")
-        self.console.insert(tk.END, "\n", "dim")
+        self.console_log.blank()
+    
+    def scan_failed(self, error):
+        self.log(f"Error: {error}", "error")
+        self.set_status("ERROR", True)
     
     def set_status(self, text, is_error=False, is_warning=False):
         if is_error:
@@ -879,7 +3986,7 @@ class VomTools:
     
     def execute_task(self, task):
         if task["command"] is None:
-            self.console.delete(1.0, tk.END)
+            self.console_log.clear()
             self.log_startup()
             self.log("Console cleared", "info")
             return
@@ -912,30 +4019,75 @@ class VomTools:
             self.show_process_killer()
             return
         
-        self.log(f"Executing: {task['name']}", "warn")
+        self.log(f"Executing: {task['name']}", "warn", task['name'])
         self.set_status(f"RUNNING: {task['name']}", is_warning=True)
         
-        def run():
-            try:
-                cmd = [task["command"]] + task["args"]
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    shell=False,
-                    timeout=300,
-                    creationflags=SUBPROCESS_FLAGS
-                )
-                self.root.after(0, lambda: self.handle_result(task, result))
-            except subprocess.TimeoutExpired:
-                self.root.after(0, lambda: self.log("Task timed out (300s limit)", "error"))
-                self.root.after(0, lambda: self.set_status("TIMEOUT", True))
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error: {str(e)}", "error"))
-                self.root.after(0, lambda: self.set_status("ERROR", True))
+        # The token lets shutdown or a click on the status line kill the task
+        token = CancelToken()
+        cmd = [task["command"]] + task["args"]
+        runner = StreamingCommand(cmd, timeout=300, token=token, spill_path=self.task_log_path(task))
+        entry = {'task': task, 'runner': runner, 'job': f"task:{id(runner)}", 'skipped': 0}
+        self.running_tasks.append(entry)
+        # Output reaches the console in batches, a few times a second at most;
+        # kept alive so a task run from the tray still finishes while hidden
+        self.clock.add(entry['job'], 100, lambda: self.flush_task_output(entry), keep_alive=True)
+        # A job cancelled while queued is skipped by the pool, so finish it here
+        token.on_cancel(runner.abandon)
+        if not self.command_pool.submit(runner.run, token=token):
+            token.cancel()
+    
+    def task_log_path(self, task):
+        """File that receives the full output of task, or None without task_log_dir"""
+        if not self.task_log_dir:
+            return None
+        try:
+            os.makedirs(self.task_log_dir, exist_ok=True)
+        except Exception:
+            return None
+        name = "".join(c if c.isalnum() else "_" for c in task['name'])
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.task_log_dir, f"{stamp}-{name}.log")
+    
+    def flush_task_output(self, entry):
+        runner = entry['runner']
+        # Read finished before draining so no line lands after the last drain
+        finished = runner.finished
+        lines, dropped = runner.drain()
+        if dropped:
+            entry['skipped'] += dropped
+            self.log_raw(f"... {dropped} lines skipped", "dim")
+        self.log_lines(lines)
+        if not finished:
+            return
         
-        thread = threading.Thread(target=run, daemon=True)
-        thread.start()
+        self.clock.remove(entry['job'])
+        self.running_tasks.remove(entry)
+        task = entry['task']
+        if runner.cancelled:
+            self.log(f"Cancelled: {task['name']}", "warn", task['name'])
+            self.set_status("CANCELLED", is_warning=True)
+            return
+        if entry['skipped']:
+            self.log_raw(f"Last {len(runner.tail)} of {runner.lines} lines:", "dim")
+            self.log_lines(runner.tail)
+        if runner.spill_path and runner.error is None:
+            self.log_raw(f"Full output: {runner.spill_path}", "dim")
+        if runner.error is not None:
+            self.log(f"Error: {str(runner.error)}", "error", task['name'])
+            self.set_status("ERROR", True)
+        elif runner.timed_out:
+            self.log("Task timed out (300s limit)", "error", task['name'])
+            self.set_status("TIMEOUT", True)
+        else:
+            # Output is already on the console, only the outcome is left
+            self.handle_result(task, subprocess.CompletedProcess(runner.args, runner.returncode))
+    
+    def cancel_tasks(self):
+        """Kill every command task that is still running"""
+        for entry in self.running_tasks:
+            if not entry['runner'].cancelled:
+                self.log(f"Cancelling: {entry['task']['name']}", "warn", entry['task']['name'])
+                entry['runner'].token.cancel()
     
     def handle_result(self, task, result):
         if result.stdout:
@@ -946,10 +4098,10 @@ class VomTools:
                 self.log_raw(line, "error")
         
         if result.returncode == 0:
-            self.log(f"Completed: {task['name']}", "accent")
+            self.log(f"Completed: {task['name']}", "accent", task['name'])
             self.set_status("READY")
         else:
-            self.log(f"Failed with code: {result.returncode}", "error")
+            self.log(f"Failed with code: {result.returncode}", "error", task['name'])
             self.set_status("FAILED", True)
     
     # ─── SUSPEND TASK MANAGEMENT ──────────────────────────────────────────
@@ -958,119 +4110,28 @@ class VomTools:
         self.set_status("SCANNING", is_warning=True)
         self.suspended_pids = getattr(self, 'suspended_pids', set())
         
-        def scan():
-            try:
-                ps_script = '''
-Add-Type @"
-using System;
-using System.Runtime.InteropServices;
-using System.Text;
-using System.Collections.Generic;
-
-public class WindowEnumerator {
-    [DllImport("user32.dll")]
-    private static extern bool EnumWindows(EnumWindowsProc lpEnumFunc, IntPtr lParam);
-    
-    [DllImport("user32.dll")]
-    private static extern bool IsWindowVisible(IntPtr hWnd);
-    
-    [DllImport("user32.dll", SetLastError = true)]
-    private static extern uint GetWindowThreadProcessId(IntPtr hWnd, out uint lpdwProcessId);
-    
-    [DllImport("user32.dll", CharSet = CharSet.Auto)]
-    private static extern int GetWindowText(IntPtr hWnd, StringBuilder lpString, int nMaxCount);
-    
-    [DllImport("user32.dll")]
-    private static extern int GetWindowTextLength(IntPtr hWnd);
-    
-    private delegate bool EnumWindowsProc(IntPtr hWnd, IntPtr lParam);
-    
-    private static List<uint> processIds = new List<uint>();
-    
-    private static bool EnumWindowCallback(IntPtr hWnd, IntPtr lParam) {
-        if (!IsWindowVisible(hWnd)) return true;
-        
-        int length = GetWindowTextLength(hWnd);
-        if (length == 0) return true;
-        
-        uint processId;
-        GetWindowThreadProcessId(hWnd, out processId);
-        
-        if (!processIds.Contains(processId)) {
-            processIds.Add(processId);
-        }
-        return true;
-    }
-    
-    public static uint[] GetVisibleWindowProcessIds() {
-        processIds.Clear();
-        EnumWindows(new EnumWindowsProc(EnumWindowCallback), IntPtr.Zero);
-        return processIds.ToArray();
-    }
-}
-"@
-
-$procIds = [WindowEnumerator]::GetVisibleWindowProcessIds()
-$results = @()
-$seen = @{}
-
-foreach ($procId in $procIds) {
-    try {
-        $proc = Get-Process -Id $procId -ErrorAction SilentlyContinue
-        if ($proc -and $proc.MainWindowTitle -and -not $seen.ContainsKey($proc.Id)) {
-            $seen[$proc.Id] = $true
-            $results += @{
-                "PID" = $proc.Id
-                "Name" = $proc.ProcessName
-                "Title" = $proc.MainWindowTitle
-            }
-        }
-    } catch {}
-}
-
-$results | ConvertTo-Json -Compress
-'''
-                result = subprocess.run(
-                    ["powershell", "-WindowStyle", "Hidden", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=30,
-                    creationflags=SUBPROCESS_FLAGS
-                )
-                self.root.after(0, lambda: self.display_suspend_tasks(result.stdout, result.stderr))
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
-                self.root.after(0, lambda: self.set_status("ERROR", True))
+        def scan(token):
+            # A process with a main window title owns a visible, titled window
+            return [p for p in self.processes.snapshot() if p['Title']]
         
-        thread = threading.Thread(target=scan, daemon=True)
-        thread.start()
+        self.scans.request('windows', scan, self.display_suspend_tasks, self.scan_failed, ttl=5, token=self.new_scan_token())
     
-    def display_suspend_tasks(self, json_output, stderr=""):
+    def display_suspend_tasks(self, processes):
         self.log("Applications with windows:", "accent")
         
-        if stderr:
-            self.log_raw(f"Warning: {stderr[:200]}", "warn")
+        if not processes:
+            self.log_raw("No visible windows found", "warn")
+            self.set_status("NO WINDOWS", True)
+            return
         
-        try:
-            processes = json.loads(json_output) if json_output.strip() else []
-            if not isinstance(processes, list):
-                processes = [processes]
-            
-            if not processes:
-                self.log_raw("No visible windows found", "warn")
-                self.set_status("NO WINDOWS", True)
-                return
-            
-            for proc in processes:
-                name = proc.get('Name', 'Unknown')
-                pid = proc.get('PID', 0)
-                status = "⏸ SUSPENDED" if pid in self.suspended_pids else ""
-                self.log_raw(f"[{pid}] {name} {status}", "success")
-            
-            self.show_suspend_selector(processes)
-            self.set_status("SELECT APP")
-            
-        except json.JSONDecodeError:
-            self.log_raw("Could not parse process list", "error")
-            self.set_status("PARSE ERROR", True)
+        for proc in processes:
+            name = proc.get('Name', 'Unknown')
+            pid = proc.get('PID', 0)
+            status = "⏸ SUSPENDED" if pid in self.suspended_pids else ""
+            self.log_raw(f"[{pid}] {name} {status}", "success")
+        
+        self.show_suspend_selector(processes)
+        self.set_status("SELECT APP")
     
     def center_popup(self, popup, width, height):
         """Center a popup window over the main application window"""
@@ -1101,6 +4162,20 @@ $results | ConvertTo-Json -Compress
             canvas.unbind_all("<MouseWheel>")
         canvas.bind("<Destroy>", unbind_mousewheel)
     
+    def create_virtual_list(self, parent, columns, render, on_click, row_height=40):
+        """VirtualList with its scrollbar packed into parent, scrolled by the mouse wheel"""
+        rows = VirtualList(
+            parent, columns, render, on_click, self.colors['bg_elevated'], self.colors['bg_hover'],
+            row_height=row_height, placeholder_font=self.small_font,
+            placeholder_fill=self.colors['text_muted'], bg=self.colors['bg']
+        )
+        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=rows.yview, style="Dark.Vertical.TScrollbar")
+        rows.yscroll = scrollbar.set
+        rows.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.bind_mousewheel(rows)
+        return rows
+    
     def show_suspend_selector(self, processes):
         popup = tk.Toplevel(self.root)
         popup.configure(bg=self.colors['bg'])
@@ -1129,86 +4204,19 @@ $results | ConvertTo-Json -Compress
         list_frame = tk.Frame(popup, bg=self.colors['bg'])
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20)
         
-        canvas = tk.Canvas(list_frame, bg=self.colors['bg'], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=canvas.yview, style="Dark.Vertical.TScrollbar")
-        scrollable_frame = tk.Frame(canvas, bg=self.colors['bg'])
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.bind_mousewheel(canvas)
-        
-        for proc in processes:
-            name = proc.get('Name', 'Unknown')
-            title = proc.get('Title', '')
+        def render(proc, index):
             pid = proc.get('PID', 0)
+            title = proc.get('Title', '')
             is_suspended = pid in self.suspended_pids
-            
-            btn = tk.Frame(scrollable_frame, bg=self.colors['bg_elevated'], cursor="hand2")
-            btn.pack(fill=tk.X, pady=2)
-            
-            content = tk.Frame(btn, bg=self.colors['bg_elevated'])
-            content.pack(fill=tk.X, padx=12, pady=10)
-            
-            status_icon = tk.Label(
-                content,
-                text="⏸" if is_suspended else "▶",
-                font=self.tiny_font,
-                fg=self.colors['warning'] if is_suspended else self.colors['primary'],
-                bg=self.colors['bg_elevated'],
-                width=2
-            )
-            status_icon.pack(side=tk.LEFT)
-            
-            name_lbl = tk.Label(
-                content,
-                text=f"{name} (PID: {pid})",
-                font=self.small_font,
-                fg=self.colors['warning'] if is_suspended else self.colors['text'],
-                bg=self.colors['bg_elevated'],
-                anchor='w'
-            )
-            name_lbl.pack(side=tk.LEFT, padx=(10, 0))
-            
-            if title and len(title) < 50:
-                title_lbl = tk.Label(
-                    content,
-                    text=f"  {title[:40]}",
-                    font=self.tiny_font,
-                    fg=self.colors['text_muted'],
-                    bg=self.colors['bg_elevated'],
-                    anchor='w'
-                )
-                title_lbl.pack(side=tk.LEFT, padx=(5, 0))
-            else:
-                title_lbl = None
-            
-            widgets = [btn, content, status_icon, name_lbl]
-            if title_lbl:
-                widgets.append(title_lbl)
-            
-            def on_enter(e, w=widgets):
-                for widget in w:
-                    widget.configure(bg=self.colors['bg_hover'])
-            
-            def on_leave(e, w=widgets):
-                for widget in w:
-                    widget.configure(bg=self.colors['bg_elevated'])
-            
-            def on_click(e, p=proc, pop=popup):
-                self.toggle_suspend(p, pop)
-            
-            for w in widgets:
-                w.bind("<Enter>", on_enter)
-                w.bind("<Leave>", on_leave)
-                w.bind("<Button-1>", on_click)
+            return [
+                ("⏸" if is_suspended else "▶", self.colors['warning'] if is_suspended else self.colors['primary']),
+                (f"{proc.get('Name', 'Unknown')[:20]} (PID: {pid})", self.colors['warning'] if is_suspended else self.colors['text']),
+                (title[:30] if title and len(title) < 50 else "", self.colors['text_muted'])
+            ]
+        
+        columns = [(16, self.tiny_font, 'w'), (42, self.small_font, 'w'), (280, self.tiny_font, 'w')]
+        rows = self.create_virtual_list(list_frame, columns, render, lambda p: self.toggle_suspend(p, popup))
+        rows.set_items(processes)
         
         cancel_frame = tk.Frame(popup, bg=self.colors['bg'])
         cancel_frame.pack(fill=tk.X, padx=20, pady=15)
@@ -1239,71 +4247,46 @@ $results | ConvertTo-Json -Compress
         
         def do_toggle():
             try:
-                if is_suspended:
-                    ps_script = f'''
+                # One type declares both calls; the worker session is shared, so it is
+                # added once and reused by every later suspend or resume
+                call = "ResumeThread" if is_suspended else "SuspendThread"
+                ps_script = f'''
 $proc = Get-Process -Id {pid} -ErrorAction Stop
-$handle = $proc.Handle
-$result = [System.Diagnostics.Process]::GetProcessById({pid})
-foreach ($thread in $result.Threads) {{
-    $tHandle = [IntPtr]::Zero
-    try {{
-        Add-Type @"
+if (-not ('VomThreadControl' -as [type])) {{
+    Add-Type @"
 using System;
 using System.Runtime.InteropServices;
-public class ThreadControl {{
+public static class VomThreadControl {{
     [DllImport("kernel32.dll")]
     public static extern IntPtr OpenThread(int dwDesiredAccess, bool bInheritHandle, int dwThreadId);
     [DllImport("kernel32.dll")]
+    public static extern uint SuspendThread(IntPtr hThread);
+    [DllImport("kernel32.dll")]
     public static extern uint ResumeThread(IntPtr hThread);
     [DllImport("kernel32.dll")]
     public static extern bool CloseHandle(IntPtr hObject);
 }}
-"@ -ErrorAction SilentlyContinue
-        $tHandle = [ThreadControl]::OpenThread(0x0002, $false, $thread.Id)
-        if ($tHandle -ne [IntPtr]::Zero) {{
-            [ThreadControl]::ResumeThread($tHandle) | Out-Null
-            [ThreadControl]::CloseHandle($tHandle) | Out-Null
-        }}
-    }} catch {{}}
-}}
-Write-Output "SUCCESS"
-'''
-                else:
-                    ps_script = f'''
-$proc = Get-Process -Id {pid} -ErrorAction Stop
-Add-Type @"
-using System;
-using System.Runtime.InteropServices;
-public class ThreadControl {{
-    [DllImport("kernel32.dll")]
-    public static extern IntPtr OpenThread(int dwDesiredAccess, bool bInheritHandle, int dwThreadId);
-    [DllImport("kernel32.dll")]
-    public static extern uint SuspendThread(IntPtr hThread);
-    [DllImport("kernel32.dll")]
-    public static extern bool CloseHandle(IntPtr hObject);
+"@
 }}
-"@ -ErrorAction SilentlyContinue
+$done = 0
 foreach ($thread in $proc.Threads) {{
-    $tHandle = [ThreadControl]::OpenThread(0x0002, $false, $thread.Id)
+    $tHandle = [VomThreadControl]::OpenThread(0x0002, $false, $thread.Id)
     if ($tHandle -ne [IntPtr]::Zero) {{
-        [ThreadControl]::SuspendThread($tHandle) | Out-Null
-        [ThreadControl]::CloseHandle($tHandle) | Out-Null
+        if ([VomThreadControl]::{call}($tHandle) -ne [uint32]::MaxValue) {{ $done++ }}
+        [VomThreadControl]::CloseHandle($tHandle) | Out-Null
     }}
 }}
-Write-Output "SUCCESS"
+if ($done -gt 0) {{ Write-Output "SUCCESS" }} else {{ Write-Error "{call} failed for every thread" }}
 '''
-                result = subprocess.run(
-                    ["powershell", "-WindowStyle", "Hidden", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=30,
-                    creationflags=SUBPROCESS_FLAGS
-                )
+                result = self.shell.run(ps_script, timeout=30, token=token)
                 self.root.after(0, lambda: self.handle_suspend_result(pid, name, is_suspended, result))
             except Exception as e:
                 self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
                 self.root.after(0, lambda: self.set_status("ERROR", True))
         
-        thread = threading.Thread(target=do_toggle, daemon=True)
-        thread.start()
+        # The popup is already gone; the token lets shutdown stop the script
+        token = CancelToken()
+        self.pool.submit(do_toggle, token=token)
     
     def handle_suspend_result(self, pid, name, was_suspended, result):
         output = result.stdout.strip() if result.stdout else ""
@@ -1311,13 +4294,13 @@ Write-Output "SUCCESS"
         if "SUCCESS" in output:
             if was_suspended:
                 self.suspended_pids.discard(pid)
-                self.log(f"Resumed: {name}", "accent")
+                self.log(f"Resumed: {name} (PID: {pid})", "accent", "Suspend Task")
             else:
                 self.suspended_pids.add(pid)
-                self.log(f"Suspended: {name}", "accent")
+                self.log(f"Suspended: {name} (PID: {pid})", "accent", "Suspend Task")
             self.set_status("READY")
         else:
-            self.log(f"Failed to toggle suspend state", "error")
+            self.log(f"Failed to toggle suspend state", "error", "Suspend Task")
             if result.stderr:
                 self.log_raw(result.stderr.strip()[:100], "error")
             self.set_status("FAILED", True)
@@ -1327,9 +4310,8 @@ Write-Output "SUCCESS"
         self.log("Scanning audio devices...", "info")
         self.set_status("SCANNING", is_warning=True)
         
-        def scan():
-            try:
-                ps_script = '''
+        def scan(token):
+            ps_script = '''
 $results = @()
 $renderKey = "HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\MMDevices\\Audio\\Render"
 
@@ -1372,21 +4354,13 @@ if (Test-Path $renderKey) {
 
 $results | ConvertTo-Json -Compress
 '''
-                result = subprocess.run(
-                    ["powershell", "-WindowStyle", "Hidden", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=30,
-                    creationflags=SUBPROCESS_FLAGS
-                )
-                self.root.after(0, lambda: self.display_audio_devices(result.stdout, result.stderr))
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
-                self.root.after(0, lambda: self.set_status("ERROR", True))
+            return self.shell.run(ps_script, timeout=30, token=token)
         
-        thread = threading.Thread(target=scan, daemon=True)
-        thread.start()
+        self.scans.request('audio', scan, self.display_audio_devices, self.scan_failed, ttl=60, token=self.new_scan_token())
     
-    def display_audio_devices(self, json_output, stderr=""):
+    def display_audio_devices(self, result):
         self.log("Audio playback devices:", "accent")
+        json_output, stderr = result.stdout, result.stderr
         
         if stderr:
             self.log_raw(f"Warning: {stderr[:200]}", "warn")
@@ -1468,52 +4442,18 @@ $results | ConvertTo-Json -Compress
         devices_frame = tk.Frame(popup, bg=self.colors['bg'])
         devices_frame.pack(fill=tk.BOTH, expand=True, padx=20)
         
-        for i, dev in enumerate(devices):
-            name = dev.get('Name', 'Unknown')
-            
-            btn = tk.Frame(devices_frame, bg=self.colors['bg_elevated'], cursor="hand2")
-            btn.pack(fill=tk.X, pady=2)
-            
-            content = tk.Frame(btn, bg=self.colors['bg_elevated'])
-            content.pack(fill=tk.X, padx=12, pady=10)
-            
-            num = tk.Label(
-                content,
-                text=f"{i+1}",
-                font=self.tiny_font,
-                fg=self.colors['primary'],
-                bg=self.colors['bg_elevated'],
-                width=2
-            )
-            num.pack(side=tk.LEFT)
-            
-            name_lbl = tk.Label(
-                content,
-                text=name,
-                font=self.small_font,
-                fg=self.colors['text'],
-                bg=self.colors['bg_elevated'],
-                anchor='w'
-            )
-            name_lbl.pack(side=tk.LEFT, padx=(10, 0))
-            
-            widgets = [btn, content, num, name_lbl]
-            
-            def on_enter(e, w=widgets):
-                for widget in w:
-                    widget.configure(bg=self.colors['bg_hover'])
-            
-            def on_leave(e, w=widgets):
-                for widget in w:
-                    widget.configure(bg=self.colors['bg_elevated'])
-            
-            def on_click(e, d=dev, p=popup):
-                self.set_default_audio(d, p, self.selected_role.get())
-            
-            for w in widgets:
-                w.bind("<Enter>", on_enter)
-                w.bind("<Leave>", on_leave)
-                w.bind("<Button-1>", on_click)
+        def render(dev, index):
+            return [
+                (f"{index + 1}", self.colors['primary']),
+                (dev.get('Name', 'Unknown'), self.colors['text'])
+            ]
+        
+        columns = [(16, self.tiny_font, 'w'), (42, self.small_font, 'w')]
+        rows = self.create_virtual_list(
+            devices_frame, columns, render,
+            lambda d: self.set_default_audio(d, popup, self.selected_role.get())
+        )
+        rows.set_items(devices)
         
         # Cancel button
         cancel_frame = tk.Frame(popup, bg=self.colors['bg'])
@@ -1594,21 +4534,19 @@ if ($result -eq 0) {{
     Write-Output "ERROR:$result"
 }}
 '''
-                result = subprocess.run(
-                    ["powershell", "-WindowStyle", "Hidden", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=30,
-                    creationflags=SUBPROCESS_FLAGS
-                )
+                result = self.shell.run(ps_script, timeout=30, token=token)
                 self.root.after(0, lambda: self.handle_audio_set_result(name, result))
             except Exception as e:
                 self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
                 self.root.after(0, lambda: self.set_status("ERROR", True))
         
-        thread = threading.Thread(target=set_device, daemon=True)
-        thread.start()
+        token = CancelToken()
+        self.pool.submit(set_device, token=token)
     
     def handle_audio_set_result(self, device_name, result):
         output = result.stdout.strip() if result.stdout else ""
+        # The cached device list no longer shows the right default
+        self.scans.invalidate('audio')
         
         if "SUCCESS" in output:
             self.log(f"Audio set: {device_name}", "accent")
@@ -1638,49 +4576,12 @@ if ($result -eq 0) {{
         list_frame = tk.Frame(popup, bg=self.colors['bg'])
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20)
         
-        canvas = tk.Canvas(list_frame, bg=self.colors['bg'], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=canvas.yview, style="Dark.Vertical.TScrollbar")
-        scrollable_frame = tk.Frame(canvas, bg=self.colors['bg'])
+        def render(app, index):
+            return [(app['icon'], self.colors['primary']), (app['name'], self.colors['text'])]
         
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw", width=350)
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.bind_mousewheel(canvas)
-        
-        for app in self.quick_launch_apps:
-            btn = tk.Frame(scrollable_frame, bg=self.colors['bg_elevated'], cursor="hand2")
-            btn.pack(fill=tk.X, pady=2)
-            
-            content = tk.Frame(btn, bg=self.colors['bg_elevated'])
-            content.pack(fill=tk.X, padx=12, pady=10)
-            
-            icon_lbl = tk.Label(content, text=app['icon'], font=self.small_font, fg=self.colors['primary'], bg=self.colors['bg_elevated'], width=3)
-            icon_lbl.pack(side=tk.LEFT)
-            name_lbl = tk.Label(content, text=app['name'], font=self.small_font, fg=self.colors['text'], bg=self.colors['bg_elevated'], anchor='w')
-            name_lbl.pack(side=tk.LEFT, padx=(10, 0))
-            
-            widgets = [btn, content, icon_lbl, name_lbl]
-            
-            def on_enter(e, w=widgets):
-                for widget in w:
-                    try: widget.configure(bg=self.colors['bg_hover'])
-                    except: pass
-            
-            def on_leave(e, w=widgets):
-                for widget in w:
-                    try: widget.configure(bg=self.colors['bg_elevated'])
-                    except: pass
-            
-            def on_click(e, a=app, p=popup):
-                self.launch_app(a, p)
-            
-            for w in widgets:
-                w.bind("<Enter>", on_enter)
-                w.bind("<Leave>", on_leave)
-                w.bind("<Button-1>", on_click)
+        columns = [(24, self.small_font, 'center'), (54, self.small_font, 'w')]
+        rows = self.create_virtual_list(list_frame, columns, render, lambda a: self.launch_app(a, popup))
+        rows.set_items(self.quick_launch_apps)
         
         cancel_frame = tk.Frame(popup, bg=self.colors['bg'])
         cancel_frame.pack(fill=tk.X, padx=20, pady=15)
@@ -1708,7 +4609,7 @@ if ($result -eq 0) {{
                 self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
                 self.root.after(0, lambda: self.set_status("FAILED", True))
         
-        threading.Thread(target=run, daemon=True).start()
+        self.pool.submit(run)
 
     # ─── CLIPBOARD MANAGER ─────────────────────────────────────────────────
     def show_clipboard_manager(self):
@@ -1727,57 +4628,49 @@ if ($result -eq 0) {{
         tk.Label(header, text="◫", font=self.tiny_font, fg=self.colors['primary'], bg=self.colors['bg']).pack(side=tk.LEFT)
         tk.Label(header, text=" CLIPBOARD HISTORY", font=self.tiny_font, fg=self.colors['text_dim'], bg=self.colors['bg']).pack(side=tk.LEFT)
         
+        search_var = tk.StringVar()
+        search_box = tk.Entry(
+            header, textvariable=search_var, font=self.small_font, width=22,
+            fg=self.colors['text'], bg=self.colors['bg_elevated'],
+            insertbackground=self.colors['primary'], relief=tk.FLAT, border=4
+        )
+        search_box.pack(side=tk.RIGHT)
+        tk.Label(header, text="⌕ ", font=self.small_font, fg=self.colors['text_muted'], bg=self.colors['bg']).pack(side=tk.RIGHT)
+        
         list_frame = tk.Frame(popup, bg=self.colors['bg'])
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20)
         
-        canvas = tk.Canvas(list_frame, bg=self.colors['bg'], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=canvas.yview, style="Dark.Vertical.TScrollbar")
-        scrollable_frame = tk.Frame(canvas, bg=self.colors['bg'])
+        def render(item, index):
+            # Leave room for the line and size counts when there are any
+            preview = item['preview'][:36] + "..." if item['meta'] and len(item['preview']) > 39 else item['preview']
+            return [
+                (f"{index + 1}", self.colors['primary']),
+                (preview, self.colors['text']),
+                (item['meta'], self.colors['text_muted'])
+            ]
+        
+        columns = [(12, self.tiny_font, 'w'), (52, self.small_font, 'w'), (-12, self.tiny_font, 'e')]
+        rows = self.create_virtual_list(list_frame, columns, render, lambda item: self.paste_from_history(item['key'], popup), row_height=36)
+        state = {'results': None}
+        
+        def fill():
+            if state['results'] is None:
+                rows.set_items(self.clipboard_history.page(0, len(self.clipboard_history)), "No clipboard history")
+            else:
+                rows.set_items(state['results'], "No matches")
         
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw", width=450)
-        canvas.configure(yscrollcommand=scrollbar.set)
+        def on_search(*args):
+            query = search_var.get().strip()
+            state['results'] = self.clipboard_history.search(query) if query else None
+            fill()
         
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.bind_mousewheel(canvas)
+        def on_submit(e):
+            if rows.items:
+                self.paste_from_history(rows.items[0]['key'], popup)
         
-        if not self.clipboard_history:
-            tk.Label(scrollable_frame, text="No clipboard history", font=self.small_font, fg=self.colors['text_muted'], bg=self.colors['bg']).pack(pady=20)
-        else:
-            for i, item in enumerate(self.clipboard_history[:20]):
-                preview = item[:60] + "..." if len(item) > 60 else item
-                preview = preview.replace('\n', ' ').replace('\r', '')
-                
-                btn = tk.Frame(scrollable_frame, bg=self.colors['bg_elevated'], cursor="hand2")
-                btn.pack(fill=tk.X, pady=2)
-                
-                content = tk.Frame(btn, bg=self.colors['bg_elevated'])
-                content.pack(fill=tk.X, padx=12, pady=8)
-                
-                num_lbl = tk.Label(content, text=f"{i+1}", font=self.tiny_font, fg=self.colors['primary'], bg=self.colors['bg_elevated'], width=2)
-                num_lbl.pack(side=tk.LEFT)
-                
-                text_lbl = tk.Label(content, text=preview, font=self.small_font, fg=self.colors['text'], bg=self.colors['bg_elevated'], anchor='w')
-                text_lbl.pack(side=tk.LEFT, padx=(10, 0), fill=tk.X, expand=True)
-                
-                widgets = [btn, content, num_lbl, text_lbl]
-                
-                def on_enter(e, w=widgets):
-                    for widget in w:
-                        widget.configure(bg=self.colors['bg_hover'])
-                
-                def on_leave(e, w=widgets):
-                    for widget in w:
-                        widget.configure(bg=self.colors['bg_elevated'])
-                
-                def on_click(e, text=item, p=popup):
-                    self.paste_from_history(text, p)
-                
-                for w in widgets:
-                    w.bind("<Enter>", on_enter)
-                    w.bind("<Leave>", on_leave)
-                    w.bind("<Button-1>", on_click)
+        search_var.trace_add("write", on_search)
+        search_box.bind("<Return>", on_submit)
+        search_box.bind("<Escape>", lambda e: popup.destroy())
         
         btn_frame = tk.Frame(popup, bg=self.colors['bg'])
         btn_frame.pack(fill=tk.X, padx=20, pady=15)
@@ -1789,28 +4682,42 @@ if ($result -eq 0) {{
         cancel_btn = tk.Label(btn_frame, text="Close", font=self.tiny_font, fg=self.colors['text_muted'], bg=self.colors['bg'], cursor="hand2")
         cancel_btn.pack(side=tk.RIGHT)
         cancel_btn.bind("<Button-1>", lambda e: popup.destroy())
+        
+        fill()
+        search_box.focus_set()
+    
+    def index_clipboard_history(self):
+        """Build the search index for history loaded from disk on a worker thread"""
+        items = self.clipboard_history.index_items()
+        
+        def build():
+            index = TrigramIndex.build(items)
+            self.root.after(0, lambda: self.clipboard_history.install_index(index, items))
+        
+        self.pool.submit(build, priority=WorkerPool.PERIODIC)
     
     def update_clipboard_history(self):
         try:
-            current = self.root.clipboard_get()
-            if current and current != self.last_clipboard:
-                self.last_clipboard = current
-                if current not in self.clipboard_history:
-                    self.clipboard_history.insert(0, current)
-                    if len(self.clipboard_history) > 50:
-                        self.clipboard_history = self.clipboard_history[:50]
+            current = self.clipboard_watcher.poll()
+            if current:
+                self.clipboard_history.add(current)
         except:
             pass
     
-    def paste_from_history(self, text, popup):
+    def paste_from_history(self, key, popup):
         popup.destroy()
+        text = self.clipboard_history.body(key)
+        if text is None:
+            self.log("Clipboard entry no longer available", "error")
+            self.set_status("FAILED", True)
+            return
         self.root.clipboard_clear()
         self.root.clipboard_append(text)
         self.log(f"Copied: {text[:40]}...", "accent")
         self.set_status("COPIED")
     
     def clear_clipboard_history(self, popup):
-        self.clipboard_history = []
+        self.clipboard_history.clear()
         popup.destroy()
         self.log("Clipboard history cleared", "info")
         self.set_status("READY")
@@ -1820,9 +4727,8 @@ if ($result -eq 0) {{
         self.log("Gathering network info...", "info")
         self.set_status("SCANNING", is_warning=True)
         
-        def scan():
-            try:
-                ps_script = '''
+        def scan(token):
+            ps_script = '''
 $results = @{}
 
 # Get network adapters
@@ -1859,19 +4765,12 @@ $results = @{
 
 $results | ConvertTo-Json -Depth 3 -Compress
 '''
-                result = subprocess.run(
-                    ["powershell", "-WindowStyle", "Hidden", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=30,
-                    creationflags=SUBPROCESS_FLAGS
-                )
-                self.root.after(0, lambda: self.display_network_info(result.stdout, result.stderr))
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
-                self.root.after(0, lambda: self.set_status("ERROR", True))
+            return self.shell.run(ps_script, timeout=30, token=token)
         
-        threading.Thread(target=scan, daemon=True).start()
+        self.scans.request('network', scan, self.display_network_info, self.scan_failed, ttl=30, token=self.new_scan_token())
     
-    def display_network_info(self, json_output, stderr=""):
+    def display_network_info(self, result):
+        json_output = result.stdout
         try:
             data = json.loads(json_output) if json_output.strip() else {}
             
@@ -1920,11 +4819,11 @@ $results | ConvertTo-Json -Depth 3 -Compress
         popup = tk.Toplevel(self.root)
         popup.configure(bg=self.colors['bg'])
         popup.overrideredirect(True)
-        self.center_popup(popup, 600, 500)
+        self.center_popup(popup, 600, 580)
         
         self.monitor_popup = popup
         self.monitor_running = True
-        self._after_monitor = None
+        self.monitor_token = CancelToken().bind(popup)
         
         header = tk.Frame(popup, bg=self.colors['bg'])
         header.pack(fill=tk.X, padx=20, pady=(20, 10))
@@ -1944,6 +4843,9 @@ $results | ConvertTo-Json -Depth 3 -Compress
         self.cpu_label = tk.Label(cpu_frame, text="0%", font=self.small_font, fg=self.colors['primary'], bg=self.colors['bg'], width=6)
         self.cpu_label.pack(side=tk.RIGHT)
         
+        self.cpu_spark_canvas = tk.Canvas(popup, height=22, bg=self.colors['bg'], highlightthickness=0)
+        self.cpu_spark_canvas.pack(fill=tk.X, padx=20)
+        
         # RAM Section
         ram_frame = tk.Frame(popup, bg=self.colors['bg'])
         ram_frame.pack(fill=tk.X, padx=20, pady=5)
@@ -1956,6 +4858,9 @@ $results | ConvertTo-Json -Depth 3 -Compress
         self.ram_label = tk.Label(ram_frame, text="0%", font=self.small_font, fg=self.colors['primary'], bg=self.colors['bg'], width=6)
         self.ram_label.pack(side=tk.RIGHT)
         
+        self.ram_spark_canvas = tk.Canvas(popup, height=22, bg=self.colors['bg'], highlightthickness=0)
+        self.ram_spark_canvas.pack(fill=tk.X, padx=20)
+        
         # Disk Section
         disk_frame = tk.Frame(popup, bg=self.colors['bg'])
         disk_frame.pack(fill=tk.X, padx=20, pady=5)
@@ -1968,6 +4873,9 @@ $results | ConvertTo-Json -Depth 3 -Compress
         self.disk_label = tk.Label(disk_frame, text="0%", font=self.small_font, fg=self.colors['primary'], bg=self.colors['bg'], width=6)
         self.disk_label.pack(side=tk.RIGHT)
         
+        self.disk_spark_canvas = tk.Canvas(popup, height=22, bg=self.colors['bg'], highlightthickness=0)
+        self.disk_spark_canvas.pack(fill=tk.X, padx=20)
+        
         # Separator
         tk.Frame(popup, bg=self.colors['border'], height=1).pack(fill=tk.X, padx=20, pady=15)
         
@@ -1977,6 +4885,24 @@ $results | ConvertTo-Json -Depth 3 -Compress
         
         tk.Label(proc_header, text="TOP PROCESSES", font=self.tiny_font, fg=self.colors['text_dim'], bg=self.colors['bg']).pack(side=tk.LEFT)
         
+        # Click to cycle the ranking between CPU rate, resident memory and I/O rate
+        sort_btn = tk.Label(proc_header, text=f"SORT: {self.metrics.sort.upper()}", font=self.tiny_font, fg=self.colors['text_muted'], bg=self.colors['bg'], cursor="hand2")
+        sort_btn.pack(side=tk.RIGHT)
+        
+        def cycle_sort(e):
+            keys = ['cpu', 'rss', 'io']
+            index = keys.index(self.metrics.sort) if self.metrics.sort in keys else -1
+            self.metrics.sort = keys[(index + 1) % len(keys)]
+            sort_btn.configure(text=f"SORT: {self.metrics.sort.upper()}")
+            # Re-rank the last scan; a fresh sample would add a point to the history
+            records = list(self.processes.records.values())
+            if records:
+                self.draw_monitor_processes(self.metrics.top_processes(records))
+        
+        sort_btn.bind("<Button-1>", cycle_sort)
+        sort_btn.bind("<Enter>", lambda e: sort_btn.configure(fg=self.colors['primary']))
+        sort_btn.bind("<Leave>", lambda e: sort_btn.configure(fg=self.colors['text_muted']))
+        
         self.proc_frame = tk.Frame(popup, bg=self.colors['bg'])
         self.proc_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
@@ -2014,16 +4940,13 @@ $results | ConvertTo-Json -Depth 3 -Compress
         
         popup.protocol("WM_DELETE_WINDOW", lambda: self.stop_monitor(popup))
         
-        self.update_system_monitor()
+        # Keep sampling while the main window is hidden - the popup stays on screen
+        self.clock.add('monitor', 2000, self.update_system_monitor, keep_alive=True, run_now=True)
     
     def stop_monitor(self, popup):
         self.monitor_running = False
-        if hasattr(self, '_after_monitor') and self._after_monitor is not None:
-            try:
-                self.root.after_cancel(self._after_monitor)
-            except Exception:
-                pass
-            self._after_monitor = None
+        self.clock.remove('monitor')
+        self.monitor_token.cancel()
         popup.destroy()
         self.set_status("READY")
     
@@ -2040,60 +4963,61 @@ $results | ConvertTo-Json -Depth 3 -Compress
         fill_width = int((percent / 100) * width)
         if fill_width > 0:
             # Gradient effect with blocks
+            ramp = self.palette.ramp_for(color)
             block_width = 4
             for i in range(0, fill_width, block_width + 1):
                 intensity = 0.5 + (i / width) * 0.5
-                canvas.create_rectangle(i, 2, min(i + block_width, fill_width), height - 2, fill=color, outline="")
+                canvas.create_rectangle(i, 2, min(i + block_width, fill_width), height - 2, fill=ramp[int(intensity * 255)], outline="")
+    
+    def draw_sparkline(self, canvas, history, color):
+        """Area chart of the monitor history window, downsampled to about one point per 2px"""
+        width = canvas.winfo_width()
+        height = canvas.winfo_height()
+        if width < 4 or len(history) < 2:
+            return
+        
+        times, values = history.series()
+        xs, ys = lttb(times, values, max(3, width // 2))
+        window = self.monitor_history_minutes * 60
+        now = times[-1]
+        coords = []
+        for t, v in zip(xs, ys):
+            coords.append(max(0.0, width - (now - t) / window * width))
+            coords.append(height - 1 - min(100, max(0, v)) / 100 * (height - 2))
+        area = [coords[0], height] + coords + [coords[-2], height]
+        
+        # Two persistent items per chart, moved with coords() on every sample
+        line = canvas.find_withtag("spark_line")
+        if line:
+            canvas.coords("spark_area", *area)
+            canvas.coords(line[0], *coords)
+        else:
+            ramp = self.palette.ramp_for(color)
+            canvas.create_polygon(*area, fill=ramp[40], outline="", tags="spark_area")
+            canvas.create_line(*coords, fill=ramp[180], width=1, tags="spark_line")
     
     def update_system_monitor(self):
         if not self.monitor_running:
             return
         
+        token = self.monitor_token
+        
         def get_stats():
             try:
-                ps_script = '''
-$cpu = (Get-CimInstance Win32_Processor | Measure-Object -Property LoadPercentage -Average).Average
-$os = Get-CimInstance Win32_OperatingSystem
-$ramUsed = [math]::Round((($os.TotalVisibleMemorySize - $os.FreePhysicalMemory) / $os.TotalVisibleMemorySize) * 100, 1)
-$ramTotal = [math]::Round($os.TotalVisibleMemorySize / 1MB, 1)
-$ramUsedGB = [math]::Round(($os.TotalVisibleMemorySize - $os.FreePhysicalMemory) / 1MB, 1)
-
-$disk = Get-CimInstance Win32_LogicalDisk -Filter "DeviceID='C:'"
-$diskUsed = [math]::Round((($disk.Size - $disk.FreeSpace) / $disk.Size) * 100, 1)
-
-$procs = Get-Process | Sort-Object CPU -Descending | Select-Object -First 8 Id, ProcessName, @{N='CPU';E={[math]::Round($_.CPU,1)}}, @{N='Mem';E={[math]::Round($_.WorkingSet64/1MB,1)}}
-
-@{
-    "CPU" = $cpu
-    "RAM" = $ramUsed
-    "RAMUsed" = $ramUsedGB
-    "RAMTotal" = $ramTotal
-    "Disk" = $diskUsed
-    "Procs" = @($procs | ForEach-Object { @{ "PID" = $_.Id; "Name" = $_.ProcessName; "CPU" = $_.CPU; "Mem" = $_.Mem } })
-} | ConvertTo-Json -Depth 3 -Compress
-'''
-                result = subprocess.run(
-                    ["powershell", "-WindowStyle", "Hidden", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=10,
-                    creationflags=SUBPROCESS_FLAGS
-                )
-                if result.stdout:
-                    self.root.after(0, lambda: self.update_monitor_display(result.stdout))
+                data = self.metrics.sample(token)
+                if data and not token.cancelled:
+                    self.root.after(0, lambda: self.update_monitor_display(data))
             except:
                 pass
         
-        threading.Thread(target=get_stats, daemon=True).start()
-        
-        if self.monitor_running:
-            self._after_monitor = self.root.after(2000, self.update_system_monitor)
+        # At most one sample in flight - a slow one makes the next tick skip
+        self.pool.submit(get_stats, priority=WorkerPool.PERIODIC, key='monitor', token=token)
     
-    def update_monitor_display(self, json_output):
+    def update_monitor_display(self, data):
         if not self.monitor_running:
             return
         
         try:
-            data = json.loads(json_output)
-            
             cpu = data.get('CPU', 0) or 0
             ram = data.get('RAM', 0) or 0
             disk = data.get('Disk', 0) or 0
@@ -2105,79 +5029,61 @@ $procs = Get-Process | Sort-Object CPU -Descending | Select-Object -First 8 Id,
             self.draw_bar(self.ram_bar_canvas, ram, self.colors['secondary'])
             self.draw_bar(self.disk_bar_canvas, disk, self.colors['warning'])
             
+            # History keeps the spikes that fall between two bar updates
+            now = time.monotonic()
+            for key, value, color in (
+                ('cpu', cpu, self.colors['primary']),
+                ('ram', ram, self.colors['secondary']),
+                ('disk', disk, self.colors['warning']),
+            ):
+                history = self.metric_history[key]
+                history.append(value, now)
+                self.draw_sparkline(getattr(self, f"{key}_spark_canvas"), history, color)
+            
             # Update labels
             self.cpu_label.config(text=f"{cpu:.0f}%")
             self.ram_label.config(text=f"{ram:.0f}%")
             self.disk_label.config(text=f"{disk:.0f}%")
             
-            # Update processes
-            procs = data.get('Procs', [])
-            for i, (pid_lbl, name_lbl, cpu_lbl, mem_lbl) in enumerate(self.proc_rows):
-                if i < len(procs):
-                    p = procs[i]
-                    pid_lbl.config(text=str(p.get('PID', '')))
-                    name_lbl.config(text=p.get('Name', '')[:18])
-                    cpu_lbl.config(text=f"{p.get('CPU', 0):.1f}")
-                    mem_lbl.config(text=f"{p.get('Mem', 0):.0f}MB")
-                else:
-                    pid_lbl.config(text="")
-                    name_lbl.config(text="")
-                    cpu_lbl.config(text="")
-                    mem_lbl.config(text="")
+            self.draw_monitor_processes(data.get('Procs', []))
         except:
             pass
+    
+    def draw_monitor_processes(self, procs):
+        for i, (pid_lbl, name_lbl, cpu_lbl, mem_lbl) in enumerate(self.proc_rows):
+            if i < len(procs):
+                p = procs[i]
+                pid_lbl.config(text=str(p.get('PID', '')))
+                name_lbl.config(text=p.get('Name', '')[:18])
+                cpu_lbl.config(text=f"{p.get('CPU', 0):.1f}")
+                mem_lbl.config(text=f"{p.get('Mem', 0):.0f}MB")
+            else:
+                pid_lbl.config(text="")
+                name_lbl.config(text="")
+                cpu_lbl.config(text="")
+                mem_lbl.config(text="")
 
     # ─── PROCESS KILLER ────────────────────────────────────────────────────
     def show_process_killer(self):
         self.log("Scanning processes...", "info")
         self.set_status("SCANNING", is_warning=True)
         
-        def scan():
-            try:
-                ps_script = '''
-$procs = Get-Process | Where-Object { $_.MainWindowTitle -ne "" -or $_.CPU -gt 10 } | 
-    Sort-Object CPU -Descending | 
-    Select-Object -First 30 Id, ProcessName, @{N='CPU';E={[math]::Round($_.CPU,1)}}, @{N='Mem';E={[math]::Round($_.WorkingSet64/1MB,0)}}, MainWindowTitle
-
-$procs | ForEach-Object {
-    @{
-        "PID" = $_.Id
-        "Name" = $_.ProcessName
-        "CPU" = $_.CPU
-        "Mem" = $_.Mem
-        "Title" = if ($_.MainWindowTitle) { $_.MainWindowTitle.Substring(0, [Math]::Min(40, $_.MainWindowTitle.Length)) } else { "" }
-    }
-} | ConvertTo-Json -Compress
-'''
-                result = subprocess.run(
-                    ["powershell", "-WindowStyle", "Hidden", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=30,
-                    creationflags=SUBPROCESS_FLAGS
-                )
-                self.root.after(0, lambda: self.display_process_killer(result.stdout))
-            except Exception as e:
-                self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
-                self.root.after(0, lambda: self.set_status("ERROR", True))
+        def scan(token):
+            # Rank by current CPU%, not lifetime CPU seconds, so idle long-running apps sink.
+            # The popup draws only the rows in view, so every process can be listed
+            records = self.processes.snapshot()
+            return self.processes.top(len(records), 'cpu', records=records)
         
-        threading.Thread(target=scan, daemon=True).start()
+        self.scans.request('processes', scan, self.display_process_killer, self.scan_failed, ttl=5, token=self.new_scan_token())
     
-    def display_process_killer(self, json_output):
-        try:
-            procs = json.loads(json_output) if json_output.strip() else []
-            if not isinstance(procs, list):
-                procs = [procs]
-            
-            if not procs:
-                self.log_raw("No killable processes found", "warn")
-                self.set_status("NO PROCESSES", True)
-                return
-            
-            self.show_process_killer_popup(procs)
-            self.set_status("SELECT PROCESS")
-            
-        except json.JSONDecodeError:
-            self.log_raw("Could not parse process list", "error")
-            self.set_status("PARSE ERROR", True)
+    def display_process_killer(self, procs):
+        if not procs:
+            self.log_raw("No killable processes found", "warn")
+            self.set_status("NO PROCESSES", True)
+            return
+        
+        self.show_process_killer_popup(procs)
+        self.set_status("SELECT PROCESS")
     
     def show_process_killer_popup(self, processes):
         popup = tk.Toplevel(self.root)
@@ -2196,60 +5102,17 @@ $procs | ForEach-Object {
         list_frame = tk.Frame(popup, bg=self.colors['bg'])
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20)
         
-        canvas = tk.Canvas(list_frame, bg=self.colors['bg'], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=canvas.yview, style="Dark.Vertical.TScrollbar")
-        scrollable_frame = tk.Frame(canvas, bg=self.colors['bg'])
-        
-        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw", width=500)
-        canvas.configure(yscrollcommand=scrollbar.set)
+        def render(proc, index):
+            return [
+                (f"{proc.get('PID', 0)}", self.colors['text_muted']),
+                (proc.get('Name', 'Unknown')[:15], self.colors['text']),
+                (f"CPU:{proc.get('CPUPercent', 0):.0f}%", self.colors['warning']),
+                (f"MEM:{proc.get('Mem', 0):.0f}MB", self.colors['secondary'])
+            ]
         
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.bind_mousewheel(canvas)
-        
-        for proc in processes:
-            pid = proc.get('PID', 0)
-            name = proc.get('Name', 'Unknown')
-            cpu = proc.get('CPU', 0)
-            mem = proc.get('Mem', 0)
-            title = proc.get('Title', '')
-            
-            btn = tk.Frame(scrollable_frame, bg=self.colors['bg_elevated'], cursor="hand2")
-            btn.pack(fill=tk.X, pady=1)
-            
-            content = tk.Frame(btn, bg=self.colors['bg_elevated'])
-            content.pack(fill=tk.X, padx=10, pady=6)
-            
-            pid_lbl = tk.Label(content, text=f"{pid}", font=self.tiny_font, fg=self.colors['text_muted'], bg=self.colors['bg_elevated'], width=6, anchor='w')
-            pid_lbl.pack(side=tk.LEFT)
-            
-            name_lbl = tk.Label(content, text=name[:15], font=self.small_font, fg=self.colors['text'], bg=self.colors['bg_elevated'], width=15, anchor='w')
-            name_lbl.pack(side=tk.LEFT)
-            
-            cpu_lbl = tk.Label(content, text=f"CPU:{cpu:.0f}", font=self.tiny_font, fg=self.colors['warning'], bg=self.colors['bg_elevated'], width=8)
-            cpu_lbl.pack(side=tk.LEFT)
-            
-            mem_lbl = tk.Label(content, text=f"MEM:{mem}MB", font=self.tiny_font, fg=self.colors['secondary'], bg=self.colors['bg_elevated'], width=10)
-            mem_lbl.pack(side=tk.LEFT)
-            
-            widgets = [btn, content, pid_lbl, name_lbl, cpu_lbl, mem_lbl]
-            
-            def on_enter(e, w=widgets):
-                for widget in w:
-                    widget.configure(bg=self.colors['bg_hover'])
-            
-            def on_leave(e, w=widgets):
-                for widget in w:
-                    widget.configure(bg=self.colors['bg_elevated'])
-            
-            def on_click(e, p=proc, pop=popup):
-                self.kill_process(p, pop)
-            
-            for w in widgets:
-                w.bind("<Enter>", on_enter)
-                w.bind("<Leave>", on_leave)
-                w.bind("<Button-1>", on_click)
+        columns = [(12, self.tiny_font, 'w'), (64, self.small_font, 'w'), (250, self.tiny_font, 'w'), (330, self.tiny_font, 'w')]
+        rows = self.create_virtual_list(list_frame, columns, render, lambda p: self.kill_process(p, popup), row_height=30)
+        rows.set_items(processes)
         
         btn_frame = tk.Frame(popup, bg=self.colors['bg'])
         btn_frame.pack(fill=tk.X, padx=20, pady=15)
@@ -2266,29 +5129,39 @@ $procs | ForEach-Object {
         pid = proc.get('PID', 0)
         name = proc.get('Name', 'Unknown')
         
-        self.log(f"Killing: {name} (PID: {pid})", "warn")
+        self.log(f"Killing: {name} (PID: {pid})", "warn", "Process Killer")
         self.set_status("KILLING", is_warning=True)
         
         def do_kill():
             try:
-                result = subprocess.run(
-                    ["taskkill", "/F", "/PID", str(pid)],
-                    capture_output=True, text=True, timeout=10,
-                    creationflags=SUBPROCESS_FLAGS
-                )
+                result = run_process(["taskkill", "/F", "/PID", str(pid)], timeout=10, token=token)
                 if result.returncode == 0:
-                    self.root.after(0, lambda: self.log(f"Killed: {name}", "accent"))
+                    # The warm table would list the pid until its next rescan
+                    self.processes.forget(pid)
+                    self.scans.invalidate('processes')
+                    self.scans.invalidate('windows')
+                    self.root.after(0, lambda: self.log(f"Killed: {name}", "accent", "Process Killer"))
                     self.root.after(0, lambda: self.set_status("READY"))
                 else:
-                    self.root.after(0, lambda: self.log(f"Failed to kill: {name}", "error"))
+                    self.root.after(0, lambda: self.log(f"Failed to kill: {name}", "error", "Process Killer"))
                     self.root.after(0, lambda: self.set_status("FAILED", True))
             except Exception as e:
                 self.root.after(0, lambda: self.log(f"Error: {e}", "error"))
                 self.root.after(0, lambda: self.set_status("ERROR", True))
         
-        threading.Thread(target=do_kill, daemon=True).start()
+        token = CancelToken()
+        self.pool.submit(do_kill, token=token)
 
     # ─── SETTINGS ──────────────────────────────────────────────────────────
+    @staticmethod
+    def config_int(config, key, default, minimum=1, maximum=None):
+        """config[key] as an int clamped to minimum..maximum, or default if it is not a number"""
+        try:
+            value = max(minimum, int(config.get(key, default)))
+        except (TypeError, ValueError, OverflowError):
+            return default
+        return value if maximum is None else min(maximum, value)
+    
     def load_config(self):
         """Load settings from config file"""
         try:
@@ -2297,6 +5170,17 @@ $procs | ForEach-Object {
                     config = json.load(f)
                     self.current_hotkey = config.get('hotkey', 'ctrl+decimal')
                     self.current_color_name = config.get('color', 'Green')
+                    self.render_mode = config.get('render_mode', 'sprite')
+                    self.orb_quality = config.get('quality', 'auto')
+                    self.orb_fps = self.config_int(config, 'fps', 60)
+                    self.raster_thread = config.get('raster_thread', False)
+                    self.max_bursts = self.config_int(config, 'max_bursts', 6, maximum=64)
+                    self.task_log_dir = config.get('task_log_dir', '')
+                    self.console_lines = self.config_int(config, 'console_lines', 1000, maximum=100000)
+                    self.session_log_path = config.get('session_log', '')
+                    self.clipboard_capacity = self.config_int(config, 'clipboard_capacity', 20000)
+                    self.clipboard_persist = config.get('clipboard_persist', True) is not False
+                    self.clipboard_budget_mb = self.config_int(config, 'clipboard_budget_mb', 64)
                     if self.current_color_name in self.color_presets:
                         for key, value in self.color_presets[self.current_color_name].items():
                             self.colors[key] = value
@@ -2308,7 +5192,18 @@ $procs | ForEach-Object {
         try:
             config = {
                 'hotkey': self.current_hotkey,
-                'color': self.current_color_name
+                'color': self.current_color_name,
+                'render_mode': self.render_mode,
+                'quality': self.orb_quality,
+                'fps': self.orb_fps,
+                'raster_thread': self.raster_thread,
+                'max_bursts': self.max_bursts,
+                'task_log_dir': self.task_log_dir,
+                'console_lines': self.console_lines,
+                'session_log': self.session_log_path,
+                'clipboard_capacity': self.clipboard_capacity,
+                'clipboard_persist': self.clipboard_persist,
+                'clipboard_budget_mb': self.clipboard_budget_mb
             }
             with open(self.config_path, 'w') as f:
                 json.dump(config, f, indent=2)
@@ -2424,7 +5319,8 @@ $procs | ForEach-Object {
                 self.current_color_name = new_color
                 for key, value in self.color_presets[new_color].items():
                     self.colors[key] = value
-                self.log(f"Theme changed to {new_color} - restart for full effect", "info")
+                self.apply_palette()
+                self.log(f"Theme changed to {new_color} - restart to recolor all widgets", "info")
             
             self.save_config()
             popup.destroy()